@@ -0,0 +1,86 @@
+"""
+Compiled kernels for ACT-R base-level activation (optional numba).
+
+Access times for a batch of memories are passed in CSR layout:
+``flat_times`` holds every access timestamp, and row i spans
+``flat_times[offsets[i]:offsets[i + 1]]``.
+
+With numba installed the kernel is JIT-compiled and runs rows in parallel;
+without it, an equivalent NumPy implementation is used. Both return
+ln(Σ age^-d) per row, or -inf for rows with no accesses.
+
+    pip install numba
+"""
+
+import threading
+
+import numpy as np
+
+try:
+    import numba
+    _numba_available = True
+except ImportError:
+    _numba_available = False
+
+
+def _base_level_csr_numpy(now: float, flat_times: np.ndarray, offsets: np.ndarray,
+                          decay: float) -> np.ndarray:
+    n = len(offsets) - 1
+    rows = np.repeat(np.arange(n), np.diff(offsets))
+    ages = now - flat_times
+    ages[ages <= 0] = 0.001  # Avoid division by zero for very recent
+    totals = np.bincount(rows, weights=ages ** (-decay), minlength=n)
+
+    out = np.full(n, float("-inf"))
+    positive = totals > 0
+    out[positive] = np.log(totals[positive])
+    return out
+
+
+if _numba_available:
+    def _base_level_csr_loop(now, flat_times, offsets, decay):
+        n = offsets.shape[0] - 1
+        out = np.empty(n)
+        for i in numba.prange(n):
+            total = 0.0
+            for j in range(offsets[i], offsets[i + 1]):
+                age = now - flat_times[j]
+                if age <= 0:
+                    age = 0.001
+                total += age ** (-decay)
+            out[i] = np.log(total) if total > 0 else -np.inf
+        return out
+
+    # fastmath without the no-nans/no-infs flags: empty rows return -inf
+    _FASTMATH = {"nsz", "arcp", "contract", "afn", "reassoc"}
+    _base_level_csr_numba = numba.njit(
+        cache=True, parallel=True, fastmath=_FASTMATH)(_base_level_csr_loop)
+    # Launching a parallel region from a non-main thread leaves the TBB
+    # threading layer's workers blocking interpreter exit, so other threads
+    # (e.g. one Memory per worker thread) run the same loop serially. Not
+    # cached on disk: numba's cache index doesn't key on the parallel flag,
+    # so the two variants of one function would overwrite each other.
+    _base_level_csr_numba_serial = numba.njit(fastmath=_FASTMATH)(_base_level_csr_loop)
+
+
+def base_level_activation_csr(now: float, flat_times: np.ndarray, offsets: np.ndarray,
+                              decay: float = 0.5) -> np.ndarray:
+    """
+    Base-level activation B_i = ln(Σ_j (now - t_j)^(-d)) for each CSR row.
+
+    Args:
+        now: Current timestamp
+        flat_times: float64 array of all access timestamps
+        offsets: int64 array of length n+1 delimiting each row
+        decay: ACT-R decay parameter d
+
+    Returns:
+        float64 array of n activations (-inf for rows with no accesses)
+    """
+    flat_times = np.ascontiguousarray(flat_times, dtype=np.float64)
+    offsets = np.ascontiguousarray(offsets, dtype=np.int64)
+    if _numba_available:
+        kernel = (_base_level_csr_numba if threading.current_thread() is threading.main_thread()
+                  else _base_level_csr_numba_serial)
+        return kernel(float(now), flat_times, offsets, float(decay))
+    return _base_level_csr_numpy(float(now), flat_times.copy(), offsets, float(decay))
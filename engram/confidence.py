@@ -32,8 +32,11 @@ References:
 
 import math
 import time as _time
+
+import numpy as np
+
 from engram.core import MemoryEntry, MemoryStore
-from engram.forgetting import effective_strength
+from engram.forgetting import effective_strength, effective_strength_batch
 
 
 # Default content reliability by memory type
@@ -128,6 +131,41 @@ def confidence_score(entry: MemoryEntry, store=None,
     return 0.7 * rel + 0.3 * sal
 
 
+def confidence_score_batch(entries: list[MemoryEntry], now: float = None) -> np.ndarray:
+    """
+    Vectorized confidence_score(entry, store=None) over many entries.
+
+    Reliability is per-entry bookkeeping; salience (the sigmoid of
+    effective strength) is computed for all entries at once.
+    """
+    n = len(entries)
+    rel = np.fromiter((content_reliability(e) for e in entries), dtype=np.float64, count=n)
+    eff = effective_strength_batch(entries, now=now)
+    sal = np.clip(2.0 / (1.0 + np.exp(-2.0 * eff)) - 1.0, 0.0, 1.0)
+    return 0.7 * rel + 0.3 * sal
+
+
+def confidence_bound_sql(alias: str = "m") -> str:
+    """
+    SQL expression giving an upper bound on confidence_score(entry, store=None).
+
+    Reliability depends only on stored columns, so it is reproduced exactly.
+    Salience is tanh(strength × R) with R ≤ 1, hence at most
+    min(1, working_strength + core_strength). The bound is independent of
+    time, so ``bound >= min_confidence`` can pre-filter candidates in SQL
+    without ever dropping a memory that would pass the precise check.
+    """
+    cases = " ".join(
+        f"WHEN '{type_str}' THEN {value}" for type_str, value in DEFAULT_RELIABILITY.items()
+    )
+    base = f"(CASE {alias}.memory_type {cases} ELSE 0.7 END)"
+    base = f"(CASE WHEN COALESCE({alias}.contradicted_by, '') != '' THEN {base} * 0.3 ELSE {base} END)"
+    base = f"(CASE WHEN {alias}.pinned THEN MAX({base}, 0.95) ELSE {base} END)"
+    reliability = f"MIN(1.0, {base} + {alias}.importance * 0.1)"
+    salience = f"MIN(1.0, MAX(0.0, {alias}.working_strength + {alias}.core_strength))"
+    return f"(0.7 * {reliability} + 0.3 * {salience})"
+
+
 def confidence_detail(entry: MemoryEntry, store=None,
                       now: float = None) -> dict:
     """
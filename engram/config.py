@@ -61,6 +61,9 @@ class MemoryConfig:
     importance_weight: float = 0.5
     # Minimum activation for retrieval
     min_activation: float = -10.0
+    # Query words kept by recall(); FTS5 matching cost grows with every
+    # term, while words past the first few dozen add almost no signal
+    max_query_tokens: int = 64
 
     # === Confidence (metacognitive scoring) ===
     # Default content reliability by memory type
@@ -110,6 +113,9 @@ class MemoryConfig:
     # Link strength decay per consolidation cycle
     hebbian_decay: float = 0.95
 
+    # Presets build a new instance on every call. They are cheap (no
+    # validation) and must not be shared: AdaptiveTuner mutates its config.
+
     @classmethod
     def default(cls) -> "MemoryConfig":
         """Literature-based defaults (same as no-arg constructor)."""
@@ -105,15 +105,13 @@ def run_consolidation_cycle(store: MemoryStore, dt_days: float = 1.0,
     import random
 
     all_memories = store.all()
-
-    _update = getattr(store, 'update', None)
+    changed: list[MemoryEntry] = []
 
     # Step 1: Consolidate all L3 (working) memories
     working = [m for m in all_memories if m.layer == MemoryLayer.L3_WORKING]
     for entry in working:
         consolidate_single(entry, dt_days=dt_days, alpha=alpha, mu1=mu1, mu2=mu2)
-        if _update:
-            _update(entry)
+        changed.append(entry)
 
     # Step 2: Interleaved replay of L4 (archive) memories
     # This is critical — prevents losing old knowledge when learning new things
@@ -126,20 +124,36 @@ def run_consolidation_cycle(store: MemoryStore, dt_days: float = 1.0,
             entry.core_strength += replay_boost * (0.5 + entry.importance)
             entry.consolidation_count += 1
             entry.last_consolidated = time.time()
-            if _update:
-                _update(entry)
+            changed.append(entry)
 
     # Step 3: Also decay L2 (core) memories slightly
     core = [m for m in all_memories if m.layer == MemoryLayer.L2_CORE]
     for entry in core:
         apply_decay(entry, dt_days, mu1=0, mu2=mu2)  # No working decay for L2
-        if _update:
-            _update(entry)
+        changed.append(entry)
 
-    # Step 4: Layer promotion/demotion
-    _rebalance_layers(store, promote_threshold=promote_threshold,
-                      demote_threshold=demote_threshold,
-                      archive_threshold=archive_threshold)
+    # Step 4: Layer promotion/demotion (on the same in-memory entries)
+    moved = _assign_layers(all_memories, promote_threshold=promote_threshold,
+                           demote_threshold=demote_threshold,
+                           archive_threshold=archive_threshold)
+
+    # One write for the whole cycle. Each entry sits in one layer group
+    # above; moved entries may or may not already be among them.
+    seen = {id(e) for e in changed}
+    changed.extend(e for e in moved if id(e) not in seen)
+    _write_entries(store, changed)
+
+
+def _write_entries(store: MemoryStore, entries: list[MemoryEntry]):
+    """Persist entries, in one transaction when the store supports it."""
+    _update_many = getattr(store, 'update_many', None)
+    if _update_many:
+        _update_many(entries)
+        return
+    _update = getattr(store, 'update', None)
+    if _update:
+        for entry in entries:
+            _update(entry)
 
 
 def _rebalance_layers(store: MemoryStore,
@@ -153,9 +167,19 @@ def _rebalance_layers(store: MemoryStore,
     L2 → L4: total_strength < demote_threshold (fading from core)
     L3 → L4: working_strength < archive_threshold (expired from working)
     """
-    _update = getattr(store, 'update', None)
-
-    for entry in store.all():
+    moved = _assign_layers(store.all(), promote_threshold=promote_threshold,
+                           demote_threshold=demote_threshold,
+                           archive_threshold=archive_threshold)
+    _write_entries(store, moved)
+
+
+def _assign_layers(entries: list[MemoryEntry],
+                   promote_threshold: float = 0.25,
+                   demote_threshold: float = 0.05,
+                   archive_threshold: float = 0.15) -> list[MemoryEntry]:
+    """Apply the _rebalance_layers() rules in place; returns the entries that moved."""
+    moved = []
+    for entry in entries:
         total = entry.working_strength + entry.core_strength
         old_layer = entry.layer
 
@@ -170,12 +194,28 @@ def _rebalance_layers(store: MemoryStore,
             if total < demote_threshold and not entry.pinned:
                 entry.layer = MemoryLayer.L4_ARCHIVE
 
-        if _update and entry.layer != old_layer:
-            _update(entry)
+        if entry.layer != old_layer:
+            moved.append(entry)
+    return moved
 
 
 def get_consolidation_stats(store: MemoryStore) -> dict:
     """Summary stats for the memory system."""
+    _layer_stats = getattr(store, 'layer_stats', None)
+    if _layer_stats:
+        # Aggregated in SQL; no MemoryEntry is built
+        rows = _layer_stats()
+        empty = {"count": 0, "avg_working": 0.0, "avg_core": 0.0, "avg_importance": 0.0}
+        by_layer = {}
+        for layer in MemoryLayer:
+            row = rows.get(layer.value)
+            by_layer[layer.value] = {k: row[k] for k in empty} if row else dict(empty)
+        return {
+            "total_memories": sum(r["count"] for r in rows.values()),
+            "layers": by_layer,
+            "pinned": sum(r["pinned"] for r in rows.values()),
+        }
+
     all_mem = store.all()
     by_layer = {}
     for layer in MemoryLayer:
@@ -3,6 +3,7 @@ Core memory data structures.
 Each memory entry carries metadata for mathematical models.
 """
 
+import sys
 import time
 import math
 import json
@@ -49,7 +50,16 @@ DEFAULT_IMPORTANCE = {
 }
 
 
-@dataclass
+# Lookup tables for the stored enum values; a dict hit is much cheaper than
+# Enum.__call__ when rows are turned into entries in bulk.
+MEMORY_TYPE_BY_VALUE = {m.value: m for m in MemoryType}
+MEMORY_LAYER_BY_VALUE = {l.value: l for l in MemoryLayer}
+
+# __slots__ keeps entries compact and attribute access fast (Python 3.10+)
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_SLOTS)
 class MemoryEntry:
     """A single memory with full metadata for mathematical models."""
 
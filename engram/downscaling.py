@@ -49,6 +49,16 @@ def synaptic_downscale(store, factor: float = 0.95):
     """
     assert 0.0 < factor <= 1.0, f"Factor must be in (0, 1], got {factor}"
 
+    # SQLiteStore scales every row in one UPDATE
+    _scale = getattr(store, 'scale_strengths', None)
+    if _scale:
+        n_scaled, total_before = _scale(factor)
+        return {
+            "n_scaled": n_scaled,
+            "avg_before": total_before / max(n_scaled, 1),
+            "avg_after": total_before * factor / max(n_scaled, 1),
+        }
+
     memories = store.all()
     if not memories:
         return {"n_scaled": 0, "avg_before": 0.0, "avg_after": 0.0}
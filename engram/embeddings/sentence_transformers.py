@@ -42,6 +42,7 @@ class SentenceTransformerAdapter(BaseEmbeddingAdapter):
         model: str = "all-MiniLM-L6-v2",
         device: Optional[str] = None,
         normalize: bool = True,
+        batch_size: int = 32,
     ):
         """
         Initialize Sentence Transformers adapter.
@@ -50,6 +51,8 @@ class SentenceTransformerAdapter(BaseEmbeddingAdapter):
             model: Model name from HuggingFace or sentence-transformers
             device: Device to use ("cpu", "cuda", "mps"). None = auto-detect.
             normalize: Whether to L2-normalize embeddings (recommended for cosine sim)
+            batch_size: Texts per forward pass inside embed(); raise it for bulk
+                        encoding (CPU saturates around 64-256, GPU higher)
         """
         try:
             from sentence_transformers import SentenceTransformer
@@ -61,6 +64,7 @@ class SentenceTransformerAdapter(BaseEmbeddingAdapter):
         
         self.model_name = model
         self.normalize = normalize
+        self.batch_size = batch_size
         
         # Load model
         self._model = SentenceTransformer(model, device=device)
@@ -80,6 +84,8 @@ class SentenceTransformerAdapter(BaseEmbeddingAdapter):
         # SentenceTransformer handles batching internally
         embeddings = self._model.encode(
             texts,
+            batch_size=self.batch_size,
+            convert_to_numpy=True,
             normalize_embeddings=self.normalize,
             show_progress_bar=False,
         )
@@ -23,6 +23,9 @@ actively suppresses competing memories (similar content, different answers).
 import math
 import time
 from typing import Optional
+
+import numpy as np
+
 from engram.core import MemoryEntry, MemoryStore, MemoryType, DEFAULT_DECAY_RATES
 
 
@@ -91,6 +94,33 @@ def effective_strength(entry: MemoryEntry, now: Optional[float] = None) -> float
     return trace_strength * R
 
 
+def effective_strength_batch(entries: list[MemoryEntry],
+                             now: Optional[float] = None) -> np.ndarray:
+    """
+    Vectorized effective_strength() over many entries.
+
+    Same stability/retrievability formulas, evaluated as array math.
+    """
+    now = now or time.time()
+    n = len(entries)
+    last_access = np.fromiter(
+        (max(e.access_times) if e.access_times else e.created_at for e in entries),
+        dtype=np.float64, count=n)
+    n_accesses = np.fromiter((len(e.access_times) for e in entries), dtype=np.float64, count=n)
+    base_S = np.fromiter(
+        (1.0 / DEFAULT_DECAY_RATES.get(e.memory_type, 0.05) for e in entries),
+        dtype=np.float64, count=n)
+    importance = np.fromiter((e.importance for e in entries), dtype=np.float64, count=n)
+    consolidations = np.fromiter((e.consolidation_count for e in entries), dtype=np.float64, count=n)
+    trace = np.fromiter((e.working_strength + e.core_strength for e in entries),
+                        dtype=np.float64, count=n)
+
+    S = base_S * (1.0 + 0.5 * np.log1p(n_accesses)) * (0.5 + importance) * (1.0 + 0.2 * consolidations)
+    t_days = (now - last_access) / 86400
+    R = np.where(t_days <= 0, 1.0, np.exp(-np.maximum(t_days, 0.0) / S))
+    return trace * R
+
+
 def should_forget(entry: MemoryEntry, threshold: float = 0.01,
                   now: Optional[float] = None) -> bool:
     """
@@ -118,12 +148,20 @@ def prune_forgotten(store: MemoryStore, threshold: float = 0.01,
     """
     from engram.core import MemoryLayer
 
-    pruned = []
-    for entry in store.all():
-        if should_forget(entry, threshold=threshold, now=now):
-            if entry.layer != MemoryLayer.L4_ARCHIVE:
-                entry.layer = MemoryLayer.L4_ARCHIVE
-                pruned.append(entry)
+    # Same test as should_forget(), evaluated for all candidates at once
+    candidates = [e for e in store.all()
+                  if not e.pinned and e.layer != MemoryLayer.L4_ARCHIVE]
+    if not candidates:
+        return []
+    strengths = effective_strength_batch(candidates, now=now)
+    pruned = [e for e, s in zip(candidates, strengths) if s < threshold]
+    for entry in pruned:
+        entry.layer = MemoryLayer.L4_ARCHIVE
+
+    # Stores that hand out copies (SQLiteStore) persist in one statement
+    _set_layer = getattr(store, 'set_layer', None)
+    if _set_layer:
+        _set_layer([e.id for e in pruned], MemoryLayer.L4_ARCHIVE)
 
     return pruned
 
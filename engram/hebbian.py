@@ -15,13 +15,21 @@ import time
 from itertools import combinations
 from typing import Optional
 
+import numpy as np
+
 from engram.store import SQLiteStore
 
 
+def _links_changed(store: SQLiteStore):
+    """Invalidate the cached link snapshot after a write to formed links."""
+    store._hebbian_version = getattr(store, "_hebbian_version", 0) + 1
+
+
 def record_coactivation(
     store: SQLiteStore,
     memory_ids: list[str],
     threshold: int = 3,
+    times: int = 1,
 ) -> list[tuple[str, str]]:
     """
     Record co-activation for a set of memory IDs.
@@ -34,25 +42,25 @@ def record_coactivation(
         store: The SQLiteStore instance
         memory_ids: List of memory IDs that were co-activated
         threshold: Number of co-activations before link forms
+        times: Record this many co-activations at once (same result as
+               calling ``times`` times, e.g. for imported access history)
         
     Returns:
         List of (id1, id2) tuples for newly formed links
     """
+    if times < 1:
+        raise ValueError(f"times must be at least 1, got {times}")
     if len(memory_ids) < 2:
         return []
     
-    new_links = []
-    
-    for id1, id2 in combinations(memory_ids, 2):
-        # Ensure consistent ordering (smaller ID first)
-        if id1 > id2:
-            id1, id2 = id2, id1
-            
-        formed = maybe_create_link(store, id1, id2, threshold)
-        if formed:
-            new_links.append((id1, id2))
-    
-    return new_links
+    # Consistent ordering (smaller ID first); each distinct pair counts once
+    # per call, and repeated IDs never pair with themselves
+    pairs = dict.fromkeys(
+        (id1, id2) if id1 < id2 else (id2, id1)
+        for id1, id2 in combinations(memory_ids, 2)
+        if id1 != id2
+    )
+    return _coactivate_pairs(store, list(pairs), threshold, times)
 
 
 def maybe_create_link(
@@ -76,84 +84,126 @@ def maybe_create_link(
     Returns:
         True if a new link was formed on this call
     """
-    conn = store._conn
-    
     # Ensure consistent ordering
     if id1 > id2:
         id1, id2 = id2, id1
+    return bool(_coactivate_pairs(store, [(id1, id2)], threshold))
+
+
+# Pairs per lookup query (two bound parameters each)
+_PAIR_CHUNK = 256
+
+
+def _padded(items: list) -> list:
+    """Pad ``items`` to the next power of two by repeating the last one.
+
+    Variable-length IN lists compile to one statement per length; padding
+    keeps them to a handful of shapes that stay in the connection's
+    statement cache. Repeats don't change an IN (...) result.
+    """
+    size = 1 << (len(items) - 1).bit_length()
+    return items + items[-1:] * (size - len(items))
+
+
+def _coactivate_pairs(
+    store: SQLiteStore,
+    pairs: list[tuple[str, str]],
+    threshold: int,
+    times: int = 1,
+) -> list[tuple[str, str]]:
+    """
+    Apply ``times`` co-activations to each (id1, id2) pair (id1 < id2, distinct).
     
-    # Check if link already exists with strength > 0 (already formed)
-    existing = conn.execute(
-        "SELECT strength, coactivation_count FROM hebbian_links WHERE source_id=? AND target_id=?",
-        (id1, id2)
-    ).fetchone()
-    
-    if existing and existing[0] > 0:
-        # Link already exists - strengthen it! (Hebbian: "use it or lose it")
-        # This counteracts decay and keeps active associations strong
-        current_strength = existing[0]
-        # Boost by 10%, capped at 1.0
-        new_strength = min(1.0, current_strength + 0.1)
-        conn.execute(
+    The pair's tracking row lives at (id1, id2). Existing rows are read in
+    one query per chunk, then each kind of write is a single executemany:
+    - formed link (strength > 0): count + times and strength + 0.1 per
+      co-activation (capped at 1.0), both directions ("use it or lose it"
+      counteracts decay)
+    - pair reaching threshold: strength 1.0 plus the reverse link; any
+      co-activations past the threshold only add to the count
+    - otherwise: UPSERT the tracking row (insert, or count + times)
+    
+    A pair's first co-activation only creates its tracking row, so a new
+    pair needs at least two co-activations to form a link.
+    
+    Returns the pairs whose link formed on this call, in input order.
+    """
+    conn = store._conn
+    existing: dict[tuple[str, str], tuple[float, int]] = {}
+    for start in range(0, len(pairs), _PAIR_CHUNK):
+        chunk = _padded(pairs[start:start + _PAIR_CHUNK])
+        values = ",".join(["(?,?)"] * len(chunk))
+        rows = conn.execute(
+            f"""SELECT source_id, target_id, strength, coactivation_count
+                FROM hebbian_links WHERE (source_id, target_id) IN (VALUES {values})""",
+            [mid for pair in chunk for mid in pair],
+        ).fetchall()
+        for source_id, target_id, strength, count in rows:
+            existing[(source_id, target_id)] = (strength, count)
+    
+    now = time.time()
+    strengthen = []
+    form_forward = []
+    form_reverse = []
+    track = []
+    new_links = []
+    for id1, id2 in pairs:
+        row = existing.get((id1, id2))
+        if row is not None and row[0] > 0:
+            # Link already exists - strengthen it! Boost by 0.1, capped at 1.0
+            new_strength = min(1.0, row[0] + 0.1 * times)
+            strengthen.append((times, new_strength, id1, id2))
+            strengthen.append((times, new_strength, id2, id1))
+            continue
+        # The first co-activation of a new pair only starts tracking it
+        counted = row[1] + times if row is not None else times
+        if (row is not None or times > 1) and counted >= threshold:
+            # Threshold reached! Create bidirectional link
+            form_forward.append((id1, id2, counted, now))
+            form_reverse.append((id2, id1, counted, now))
+            new_links.append((id1, id2))
+        else:
+            # First co-activation or still in the tracking phase
+            track.append((id1, id2, times, now))
+    
+    if strengthen:
+        conn.executemany(
             """UPDATE hebbian_links 
-               SET coactivation_count = coactivation_count + 1,
+               SET coactivation_count = coactivation_count + ?,
                    strength = ?
                WHERE source_id=? AND target_id=?""",
-            (new_strength, id1, id2)
+            strengthen,
         )
-        # Also strengthen the reverse link
-        conn.execute(
-            """UPDATE hebbian_links 
-               SET coactivation_count = coactivation_count + 1,
-                   strength = ?
-               WHERE source_id=? AND target_id=?""",
-            (new_strength, id2, id1)
+    if form_forward:
+        conn.executemany(
+            """INSERT INTO hebbian_links 
+               (source_id, target_id, strength, coactivation_count, created_at)
+               VALUES (?, ?, 1.0, ?, ?)
+               ON CONFLICT(source_id, target_id)
+               DO UPDATE SET strength = 1.0,
+                             coactivation_count = excluded.coactivation_count""",
+            form_forward,
         )
-        conn.commit()
-        return False
-    
-    if existing:
-        # Record exists but strength=0 (tracking phase), increment count
-        new_count = existing[1] + 1
-        if new_count >= threshold:
-            # Threshold reached! Create bidirectional link
-            now = time.time()
-            conn.execute(
-                """UPDATE hebbian_links 
-                   SET strength = 1.0, coactivation_count = ? 
-                   WHERE source_id=? AND target_id=?""",
-                (new_count, id1, id2)
-            )
-            # Create reverse link
-            conn.execute(
-                """INSERT OR REPLACE INTO hebbian_links 
-                   (source_id, target_id, strength, coactivation_count, created_at)
-                   VALUES (?, ?, 1.0, ?, ?)""",
-                (id2, id1, new_count, now)
-            )
-            conn.commit()
-            return True
-        else:
-            conn.execute(
-                """UPDATE hebbian_links 
-                   SET coactivation_count = ? 
-                   WHERE source_id=? AND target_id=?""",
-                (new_count, id1, id2)
-            )
-            conn.commit()
-            return False
-    else:
-        # First co-activation, create tracking record with strength=0
-        # Use INSERT OR IGNORE to handle race conditions in concurrent access
-        now = time.time()
-        conn.execute(
-            """INSERT OR IGNORE INTO hebbian_links 
+        conn.executemany(
+            """INSERT OR REPLACE INTO hebbian_links 
+               (source_id, target_id, strength, coactivation_count, created_at)
+               VALUES (?, ?, 1.0, ?, ?)""",
+            form_reverse,
+        )
+    if track:
+        conn.executemany(
+            """INSERT INTO hebbian_links 
                (source_id, target_id, strength, coactivation_count, created_at)
-               VALUES (?, ?, 0.0, 1, ?)""",
-            (id1, id2, now)
+               VALUES (?, ?, 0.0, ?, ?)
+               ON CONFLICT(source_id, target_id)
+               DO UPDATE SET coactivation_count =
+                   coactivation_count + excluded.coactivation_count""",
+            track,
         )
-        conn.commit()
-        return False
+    conn.commit()
+    if strengthen or form_forward:
+        _links_changed(store)
+    return new_links
 
 
 def get_hebbian_neighbors(store: SQLiteStore, memory_id: str) -> list[str]:
@@ -178,6 +228,110 @@ def get_hebbian_neighbors(store: SQLiteStore, memory_id: str) -> list[str]:
     return [r[0] for r in rows]
 
 
+def get_hebbian_neighbors_batch(
+    store: SQLiteStore,
+    memory_ids: list[str],
+) -> dict[str, list[tuple[str, float]]]:
+    """
+    Get Hebbian neighbors and link strengths for many memories at once.
+    
+    Equivalent to calling get_hebbian_neighbors() for each ID and looking up
+    each link's strength, but issues a single query.
+    
+    Args:
+        store: The SQLiteStore instance
+        memory_ids: Memory IDs to find neighbors for
+        
+    Returns:
+        Dict mapping memory_id -> list of (neighbor_id, strength). IDs without
+        formed links are absent.
+    """
+    if not memory_ids:
+        return {}
+    ids = _padded(list(dict.fromkeys(memory_ids)))
+    placeholders = ",".join("?" * len(ids))
+    rows = store._conn.execute(
+        f"""SELECT source_id, target_id, strength FROM hebbian_links 
+            WHERE source_id IN ({placeholders}) AND strength > 0""",
+        ids,
+    ).fetchall()
+    neighbors: dict[str, list[tuple[str, float]]] = {}
+    for source_id, target_id, strength in rows:
+        neighbors.setdefault(source_id, []).append((target_id, strength))
+    return neighbors
+
+
+def _link_snapshot(store: SQLiteStore):
+    """
+    Formed links as a COO sparse matrix: (ids, index, src, tgt, strength).
+    
+    Cached on the store and rebuilt only after _links_changed() bumps its
+    version or another connection commits to the database (links formed or
+    decayed there), so repeated searches skip the hebbian_links scan.
+    """
+    version = getattr(store, "_hebbian_version", None)
+    external = getattr(store, "_external_version", None)
+    if version is not None and external is not None:
+        version = (version, external())
+    cached = getattr(store, "_hebbian_snapshot", None)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    
+    rows = store._conn.execute(
+        "SELECT source_id, target_id, strength FROM hebbian_links WHERE strength > 0"
+    ).fetchall()
+    ids: list[str] = []
+    index: dict[str, int] = {}
+    for source_id, target_id, _strength in rows:
+        for mid in (source_id, target_id):
+            if mid not in index:
+                index[mid] = len(ids)
+                ids.append(mid)
+    src = np.fromiter((index[r[0]] for r in rows), dtype=np.int64, count=len(rows))
+    tgt = np.fromiter((index[r[1]] for r in rows), dtype=np.int64, count=len(rows))
+    strength = np.fromiter((r[2] for r in rows), dtype=np.float64, count=len(rows))
+    
+    snapshot = (ids, index, src, tgt, strength)
+    if version is not None:
+        store._hebbian_snapshot = (version, snapshot)
+    return snapshot
+
+
+def hebbian_spreading(
+    store: SQLiteStore,
+    memory_ids: list[str],
+    weight: float = 0.5,
+) -> dict[str, float]:
+    """
+    Spreading activation from a set of active memories over Hebbian links.
+    
+    Each active memory passes weight * link_strength to every neighbor;
+    contributions from several active memories add up. Computed as one
+    sparse matrix-vector product over the cached link snapshot.
+    
+    Args:
+        store: The SQLiteStore instance
+        memory_ids: Currently active (directly matched) memory IDs
+        weight: Boost per unit of link strength
+        
+    Returns:
+        Dict mapping neighbor memory_id -> accumulated boost (only
+        memories linked to at least one active memory)
+    """
+    ids, index, src, tgt, strength = _link_snapshot(store)
+    if not ids:
+        return {}
+    
+    active = np.zeros(len(ids), dtype=np.float64)
+    for mid in memory_ids:
+        i = index.get(mid)
+        if i is not None:
+            active[i] = 1.0
+    
+    boosts = np.bincount(tgt, weights=weight * strength * active[src], minlength=len(ids))
+    return {ids[i]: float(boosts[i]) for i in np.flatnonzero(boosts)}
+
+
 def get_all_hebbian_links(store: SQLiteStore) -> list[tuple[str, str, float]]:
     """
     Get all formed Hebbian links (strength > 0).
@@ -208,19 +362,22 @@ def decay_hebbian_links(store: SQLiteStore, factor: float = 0.95) -> int:
     """
     conn = store._conn
     
-    # Decay all link strengths
-    conn.execute(
-        "UPDATE hebbian_links SET strength = strength * ? WHERE strength > 0",
+    # Prune links that this decay takes below 0.1 first, so they
+    # aren't rewritten by the UPDATE only to be deleted
+    pruned = conn.execute(
+        "DELETE FROM hebbian_links WHERE strength > 0 AND strength * ? < 0.1",
         (factor,)
-    )
+    ).rowcount
     
-    # Prune very weak links (below 0.1)
-    result = conn.execute(
-        "DELETE FROM hebbian_links WHERE strength > 0 AND strength < 0.1"
-    )
-    pruned = result.rowcount
+    # Decay the remaining link strengths
+    decayed = conn.execute(
+        "UPDATE hebbian_links SET strength = strength * ? WHERE strength > 0",
+        (factor,)
+    ).rowcount
     
     conn.commit()
+    if pruned or decayed:
+        _links_changed(store)
     return pruned
 
 
@@ -252,6 +409,7 @@ def strengthen_link(store: SQLiteStore, id1: str, id2: str, boost: float = 0.1)
         )
     
     conn.commit()
+    _links_changed(store)
     return conn.total_changes > 0
 
 
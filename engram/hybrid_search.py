@@ -12,8 +12,9 @@ Pipeline:
 The key insight: embedding finds candidates, ACT-R decides priority.
 """
 
-import re
+import heapq
 import time
+from collections import OrderedDict
 from dataclasses import dataclass
 from typing import Optional
 
@@ -51,25 +52,29 @@ def detect_temporal_alpha(query: str) -> float:
         return 0.9  # Semantic query, embedding dominant
 
 
+_STOP_WORDS = frozenset({
+    'the', 'a', 'an', 'to', 'of', 'in', 'on', 'at', 'for', 'with', 'is', 'was',
+    'are', 'were', 'be', 'been', 'what', 'where', 'when', 'who', 'does', 'do', 'did',
+    'go', 'going', 'went', 'has', 'have', 'had', 'this', 'that', 'these', 'those',
+})
+
+
 def sanitize_fts_query(query: str) -> str:
     """Sanitize query for FTS5 by keeping only alphanumeric characters and removing stop words."""
-    sanitized = re.sub(r'[^a-zA-Z0-9\s]', ' ', query)
-    sanitized = re.sub(r'\s+', ' ', sanitized).strip()
-    if not sanitized:
+    tokens = ascii_alnum_words(query)
+    if not tokens:
         return "memory"
     # Remove stop words for better FTS5 matching
-    stop_words = {'the', 'a', 'an', 'to', 'of', 'in', 'on', 'at', 'for', 'with', 'is', 'was', 
-                  'are', 'were', 'be', 'been', 'what', 'where', 'when', 'who', 'does', 'do', 'did',
-                  'go', 'going', 'went', 'has', 'have', 'had', 'this', 'that', 'these', 'those'}
-    words = [w for w in sanitized.lower().split() if w not in stop_words and len(w) > 2]
-    return ' '.join(words) if words else sanitized
+    words = [w for w in (t.lower() for t in tokens) if w not in _STOP_WORDS and len(w) > 2]
+    return ' '.join(words) if words else ' '.join(tokens)
 
 from engram.core import MemoryEntry, MemoryType, MemoryLayer
 from engram.store import SQLiteStore
 from engram.activation import retrieval_activation
 from engram.forgetting import effective_strength
 from engram.confidence import confidence_score, confidence_label
-from engram.hebbian import get_hebbian_neighbors
+from engram.hebbian import hebbian_spreading
+from engram.search import ascii_alnum_words, copy_results
 
 
 @dataclass
@@ -87,18 +92,47 @@ class HybridSearchEngine:
     Hybrid retrieval combining Vector + FTS5 + ACT-R.
     
     This is the recommended search engine when using embeddings.
+
+    Scored candidates are kept for ``result_ttl`` seconds per query and
+    filters, so a repeat (or the same query at another limit or
+    min_confidence, which only post-filter) skips the query embedding and
+    rescoring. Dropped whenever the store's memories, graph links or
+    Hebbian links change, like SearchEngine's caches. Recorded accesses
+    do not count as changes: within the TTL, activation (and each entry's
+    access_times) stays as of the cached search. Callers always get
+    copies, so mutating a result never alters the cache.
     """
 
-    def __init__(self, store: SQLiteStore, vector_store=None):
+    def __init__(self, store: SQLiteStore, vector_store=None,
+                 cache_size: int = 64, result_ttl: float = 1.0):
         """
         Initialize hybrid search.
         
         Args:
             store: SQLite store for memories
             vector_store: Optional VectorStore for embedding-based retrieval
+            cache_size: Number of scored queries to keep
+            result_ttl: Seconds a scored query stays valid (0 disables)
         """
         self.store = store
         self.vector_store = vector_store
+        self.cache_size = cache_size
+        self.result_ttl = result_ttl
+        self._cache_version = None
+        self._scored_cache: OrderedDict = OrderedDict()
+
+    def _cached_scored(self, key) -> Optional[list[HybridSearchResult]]:
+        version = (self.store._data_version, self.store._hebbian_version,
+                   self.store._external_version())
+        if version != self._cache_version:
+            self._cache_version = version
+            self._scored_cache.clear()
+            return None
+        cached = self._scored_cache.get(key)
+        if cached is None or time.monotonic() - cached[0] >= self.result_ttl:
+            return None
+        self._scored_cache.move_to_end(key)
+        return cached[1]
 
     def search(
         self,
@@ -130,6 +164,15 @@ class HybridSearchEngine:
             List of HybridSearchResult sorted by combined score
         """
         query = query.strip()
+        key = (
+            query, tuple(context_keywords or ()), tuple(types or ()),
+            tuple(layers or ()), time_range, graph_expand, vector_weight,
+        )
+        if self.result_ttl > 0:
+            scored = self._cached_scored(key)
+            if scored is not None:
+                return copy_results(self._rank_and_filter(scored, limit, min_confidence))
+
         candidates: dict[str, tuple[MemoryEntry, float, bool]] = {}  # id -> (entry, vector_score, fts_matched)
         
         # Detect query type and set alpha for score blending
@@ -138,10 +181,11 @@ class HybridSearchEngine:
         # 1. Vector search (semantic matching)
         if self.vector_store and query:
             vector_results = self.vector_store.search(query, limit=100, min_similarity=0.1)
-            for memory_id, similarity in vector_results:
-                entry = self.store.get(memory_id)
-                if entry:
-                    candidates[memory_id] = (entry, similarity, False)
+            entries = self.store.get_many([memory_id for memory_id, _ in vector_results])
+            self.store.record_access_batch([entry.id for entry in entries])
+            similarity_of = dict(vector_results)
+            for entry in entries:
+                candidates[entry.id] = (entry, similarity_of[entry.id], False)
         
         # 2. FTS5 search (lexical matching)
         if query:
@@ -192,9 +236,14 @@ class HybridSearchEngine:
             hebbian_boosts,
             vector_weight,
         )
-        
         # 7. Rank and filter
-        return self._rank_and_filter(scored, limit, min_confidence)
+        results = self._rank_and_filter(scored, limit, min_confidence)
+        if self.result_ttl > 0:
+            self._scored_cache[key] = (time.monotonic(), scored)
+            if len(self._scored_cache) > self.cache_size:
+                self._scored_cache.popitem(last=False)
+            return copy_results(results)
+        return results
 
     def _expand_via_graph(
         self, 
@@ -202,36 +251,15 @@ class HybridSearchEngine:
     ) -> tuple[list[tuple[MemoryEntry, float, bool]], dict[str, float]]:
         """Expand via Hebbian links and compute spreading activation boosts."""
         seen_ids = {e.id for e, _, _ in candidates}
-        new_candidates = []
-        hebbian_boosts: dict[str, float] = {}
+        hebbian_boosts = hebbian_spreading(self.store, [e.id for e, _, _ in candidates])
         
-        for entry, vec_score, fts_matched in candidates:
-            hebbian_neighbors = get_hebbian_neighbors(self.store, entry.id)
-            for neighbor_id in hebbian_neighbors:
-                strength = self._get_hebbian_strength(entry.id, neighbor_id)
-                boost = 0.5 * strength
-                hebbian_boosts[neighbor_id] = hebbian_boosts.get(neighbor_id, 0) + boost
-                
-                if neighbor_id not in seen_ids:
-                    neighbor_entry = self.store.get(neighbor_id)
-                    if neighbor_entry:
-                        seen_ids.add(neighbor_id)
-                        new_candidates.append((neighbor_entry, 0.0, False))
+        neighbor_ids = [nid for nid in hebbian_boosts if nid not in seen_ids]
+        neighbors = self.store.get_many(neighbor_ids)
+        self.store.record_access_batch([entry.id for entry in neighbors])
+        new_candidates = [(entry, 0.0, False) for entry in neighbors]
         
         return candidates + new_candidates, hebbian_boosts
 
-    def _get_hebbian_strength(self, source_id: str, target_id: str) -> float:
-        """Get Hebbian link strength between two memories."""
-        try:
-            row = self.store._conn.execute(
-                """SELECT strength FROM hebbian_links 
-                   WHERE (source_id=? AND target_id=?) OR (source_id=? AND target_id=?)""",
-                (source_id, target_id, target_id, source_id)
-            ).fetchone()
-            return row[0] if row else 0.0
-        except Exception:
-            return 0.0
-
     def _score_candidates(
         self,
         candidates: list[tuple[MemoryEntry, float, bool]],
@@ -303,5 +331,4 @@ class HybridSearchEngine:
         if min_confidence > 0:
             scored = [r for r in scored if r.confidence >= min_confidence]
         
-        scored.sort(key=lambda r: r.score, reverse=True)
-        return scored[:limit]
+        return heapq.nlargest(limit, scored, key=lambda r: r.score)
@@ -35,6 +35,7 @@ Usage:
 import sys
 import os
 import time
+from contextlib import contextmanager
 
 
 from typing import Optional, Union, TYPE_CHECKING
@@ -49,7 +50,9 @@ from engram.activation import retrieve_top_k
 from engram.search import SearchEngine
 from engram.hybrid_search import HybridSearchEngine
 from engram.consolidation import run_consolidation_cycle, get_consolidation_stats
-from engram.forgetting import effective_strength, should_forget, prune_forgotten
+from engram.forgetting import (
+    effective_strength, effective_strength_batch, should_forget, prune_forgotten,
+)
 from engram.confidence import confidence_score, confidence_label
 from engram.reward import detect_feedback, apply_reward
 from engram.downscaling import synaptic_downscale
@@ -83,6 +86,7 @@ class Memory:
         config: MemoryConfig = None,
         embedding = None,
         adaptive_tuning: bool = False,
+        read_only: bool = False,
     ):
         """
         Initialize Engram memory system.
@@ -90,6 +94,8 @@ class Memory:
         Args:
             path: Path to SQLite database file. Created if it doesn't exist.
                   Use ":memory:" for in-memory (non-persistent) operation.
+                  "file:" paths are opened as SQLite URIs (e.g.
+                  "file:agent?mode=memory&cache=shared").
             config: MemoryConfig with tunable parameters. None = literature defaults.
             embedding: Optional embedding adapter for semantic search.
                       Can be an EmbeddingAdapter instance or a string shortcut:
@@ -97,10 +103,14 @@ class Memory:
                       - "ollama" -> OllamaAdapter (requires local Ollama)
                       - None -> FTS5-only mode (no embeddings)
             adaptive_tuning: Enable automatic parameter tuning based on performance.
+            read_only: Open for recall only, e.g. one instance per reader
+                thread. recall() then records no accesses or co-activations;
+                add() and other writes raise sqlite3.OperationalError.
         """
         self.path = path
         self.config = config or MemoryConfig.default()
-        self._store = SQLiteStore(path)
+        self.read_only = read_only
+        self._store = SQLiteStore(path, read_only=read_only)
         self._tracker = BaselineTracker(window_size=self.config.anomaly_window_size)
         self._created_at = time.time()
         
@@ -112,6 +122,7 @@ class Memory:
         # Initialize embedding support
         self._embedding_adapter = None
         self._vector_store = None
+        self._search_engine = None  # built on first recall; keeps its caches
         
         if embedding is not None:
             self._init_embedding(embedding)
@@ -207,6 +218,79 @@ class Memory:
 
         return entry.id
 
+    def add_many(self, items: list[dict]) -> list[str]:
+        """
+        Store several memories at once. Returns their IDs in input order.
+
+        Equivalent to calling add() for each item, but memories, their
+        initial accesses and entity links are written in one transaction
+        (and embedded in one adapter call).
+
+        Args:
+            items: Dicts of add() keyword arguments: ``content`` (required),
+                   ``type``, ``importance``, ``source``, ``tags``,
+                   ``entities``, ``contradicts``, ``created_at``
+
+        Returns:
+            List of memory ID strings
+        """
+        specs = []
+        contents = []
+        for item in items:
+            content = item["content"]
+            tags = item.get("tags")
+            if tags:
+                content = f"{content} [tags: {', '.join(tags)}]"
+            contents.append(content)
+            specs.append({
+                "content": content,
+                "memory_type": _TYPE_MAP.get(item.get("type", "factual"), MemoryType.FACTUAL),
+                "importance": item.get("importance"),
+                "source_file": item.get("source", ""),
+                "created_at": item.get("created_at"),
+                "entities": item.get("entities"),
+            })
+        entries = self._store.add_batch(specs)
+
+        # Contradiction links need both rows; same path as add()
+        for item, entry in zip(items, entries):
+            contradicts = item.get("contradicts")
+            if contradicts:
+                old_entry = self._store.get(contradicts)
+                if old_entry:
+                    entry.contradicts = contradicts
+                    self._store.update(entry)
+                    old_entry.contradicted_by = entry.id
+                    self._store.update(old_entry)
+
+        for _ in entries:
+            self._tracker.update("encoding_rate", 1.0)
+
+        ids = [entry.id for entry in entries]
+        if self._vector_store is not None and ids:
+            self._vector_store.add_batch(ids, contents)
+        return ids
+
+    @contextmanager
+    def bulk(self):
+        """
+        Group many add()/update calls into one transaction.
+
+            with mem.bulk():
+                for text in corpus:
+                    mem.add(text)
+
+        Everything is committed when the block exits, or rolled back if it
+        raises.
+        """
+        try:
+            with self._store.bulk():
+                yield self
+        except BaseException:
+            if self._vector_store is not None:
+                self._vector_store.invalidate()  # cache may hold rolled-back rows
+            raise
+
     def recall(self, query: str, limit: int = 5,
                context: list[str] = None,
                types: list[str] = None,
@@ -234,11 +318,18 @@ class Memory:
             List of dicts: {id, content, type, confidence, confidence_label,
                            strength, age_days, layer, importance}
         """
+        words = query.split()
+        if len(words) > self.config.max_query_tokens:
+            query = " ".join(words[:self.config.max_query_tokens])
+
         # Use hybrid search if embeddings are available, else FTS5-only
-        if self._vector_store is not None:
-            engine = HybridSearchEngine(self._store, self._vector_store)
-        else:
-            engine = SearchEngine(self._store)
+        engine = self._search_engine
+        if engine is None:
+            if self._vector_store is not None:
+                engine = HybridSearchEngine(self._store, self._vector_store)
+            else:
+                engine = SearchEngine(self._store)
+            self._search_engine = engine
         
         search_results = engine.search(
             query=query,
@@ -270,18 +361,19 @@ class Memory:
         # Track retrieval for anomaly detection
         self._tracker.update("retrieval_count", len(output))
 
-        # ACT-R: Record access for all retrieved memories (boosts future retrieval)
-        for r in search_results:
-            self._store.record_access(r.entry.id)
-
-        # Hebbian learning: record co-activation for recalled memories
-        if self.config.hebbian_enabled and len(output) >= 2:
-            memory_ids = [r["id"] for r in output]
-            record_coactivation(
-                self._store,
-                memory_ids,
-                threshold=self.config.hebbian_threshold,
-            )
+        # Read-only instances only observe: accesses and co-activations are writes
+        if not self.read_only:
+            # ACT-R: Record access for all retrieved memories (boosts future retrieval)
+            self._store.record_access_batch([r.entry.id for r in search_results])
+
+            # Hebbian learning: record co-activation for recalled memories
+            if self.config.hebbian_enabled and len(output) >= 2:
+                memory_ids = [r["id"] for r in output]
+                record_coactivation(
+                    self._store,
+                    memory_ids,
+                    threshold=self.config.hebbian_threshold,
+                )
         
         # Adaptive tuning: record recall metrics
         if self._adaptive_tuner is not None:
@@ -356,7 +448,7 @@ class Memory:
             # Topic continuous → return working memory items
             return session_wm.get_active_memories(self)
 
-    def consolidate(self, days: float = 1.0):
+    def consolidate(self, days: float = 1.0, days_step: float = None):
         """
         Run a consolidation cycle ("sleep replay").
 
@@ -373,12 +465,39 @@ class Memory:
 
         Also runs synaptic downscaling to prevent unbounded strength growth.
 
+        Trace decay over the step is closed-form (e^(-μ·days)), so one call
+        with days=N is a single cycle. Replay, downscaling and Hebbian decay
+        happen once per cycle; pass days_step to get them per day instead.
+
         Args:
             days: Simulated time step in days (1.0 = one day of consolidation)
+            days_step: Split ``days`` into cycles of this many days, all
+                committed as one transaction (None = a single cycle)
         """
+        if days_step is not None and days_step <= 0:
+            raise ValueError(f"days_step must be positive, got {days_step}")
+        steps = [days]
+        if days_step is not None and days_step < days:
+            n_full = int(days // days_step)
+            steps = [days_step] * n_full
+            if days - n_full * days_step > 1e-9:
+                steps.append(days - n_full * days_step)
+
         # Track count before consolidation
-        n_memories_before = len(self._store.all())
-        
+        n_memories_before = len(self._store)
+
+        with self.bulk():
+            for dt_days in steps:
+                self._consolidation_cycle(dt_days)
+
+        # Adaptive tuning: record consolidation metrics
+        if self._adaptive_tuner is not None:
+            n_memories_after = len(self._store)
+            n_forgotten = max(0, n_memories_before - n_memories_after)
+            self._adaptive_tuner.record_consolidation(n_forgotten)
+
+    def _consolidation_cycle(self, days: float):
+        """One consolidation cycle, downscaling pass and Hebbian decay."""
         run_consolidation_cycle(
             self._store, dt_days=days,
             interleave_ratio=self.config.interleave_ratio,
@@ -394,12 +513,6 @@ class Memory:
         # Decay Hebbian links during consolidation
         if self.config.hebbian_enabled:
             decay_hebbian_links(self._store, factor=self.config.hebbian_decay)
-        
-        # Adaptive tuning: record consolidation metrics
-        if self._adaptive_tuner is not None:
-            n_memories_after = len(self._store.all())
-            n_forgotten = max(0, n_memories_before - n_memories_after)
-            self._adaptive_tuner.record_consolidation(n_forgotten)
 
     def forget(self, memory_id: str = None, threshold: float = None):
         """
@@ -420,6 +533,9 @@ class Memory:
         if threshold is None:
             threshold = self.config.forget_threshold
         if memory_id is not None:
+            if self._vector_store is not None:
+                # Embedding row references the memory; drop it first
+                self._vector_store.delete(memory_id)
             self._store.delete(memory_id)
         else:
             prune_forgotten(self._store, threshold=threshold)
@@ -486,14 +602,18 @@ class Memory:
         all_mem = self._store.all()
         now = time.time()
 
+        # One pass to group, one vectorized strength evaluation per type
+        groups: dict[MemoryType, list] = {}
+        for m in all_mem:
+            groups.setdefault(m.memory_type, []).append(m)
         by_type = {}
         for mt in MemoryType:
-            entries = [m for m in all_mem if m.memory_type == mt]
+            entries = groups.get(mt)
             if entries:
                 by_type[mt.value] = {
                     "count": len(entries),
                     "avg_strength": round(
-                        sum(effective_strength(m, now) for m in entries) / len(entries), 3
+                        float(effective_strength_batch(entries, now).mean()), 3
                     ),
                     "avg_importance": round(
                         sum(m.importance for m in entries) / len(entries), 2
@@ -562,6 +682,10 @@ class Memory:
             entry.pinned = False
             self._store.update(entry)
 
+    def touch(self, memory_id: str):
+        """Record an access (ACT-R recency/frequency) without running a recall."""
+        self._store.record_access(memory_id)
+
     def hebbian_links(self, memory_id: str = None) -> list[tuple[str, str, float]]:
         """
         Get Hebbian links for a specific memory or all links.
@@ -592,16 +716,26 @@ class Memory:
         else:
             return get_all_hebbian_links(self._store)
 
+    def maintenance(self):
+        """
+        Periodic database upkeep for long-running agents.
+
+        Merges the full-text index, refreshes query-planner statistics and
+        truncates the write-ahead log. Safe to call at any time, e.g. after
+        consolidate(); close() already refreshes planner statistics.
+        """
+        self._store.maintenance()
+
     def close(self):
         """Close the underlying database connection."""
         self._store.close()
 
     def __repr__(self) -> str:
-        n = len(self._store.all())
+        n = len(self._store)
         return f"Memory(path='{self.path}', entries={n})"
 
     def __len__(self) -> int:
-        return len(self._store.all())
+        return len(self._store)
 
 
 if __name__ == "__main__":
@@ -9,17 +9,21 @@ Pipeline:
 5. Return top-k with scores
 """
 
+import copy
+import heapq
 import time
-from dataclasses import dataclass
+from collections import OrderedDict
+from dataclasses import dataclass, replace
 from typing import Optional
-import re
 
 from engram.core import MemoryEntry, MemoryType, MemoryLayer
 from engram.store import SQLiteStore
-from engram.activation import retrieval_activation
+import numpy as np
+
+from engram.activation import retrieval_activation_batch
 from engram.forgetting import effective_strength
-from engram.confidence import confidence_score, confidence_label
-from engram.hebbian import get_hebbian_neighbors
+from engram.confidence import confidence_score_batch, confidence_label
+from engram.hebbian import hebbian_spreading
 
 
 @dataclass
@@ -32,6 +36,36 @@ class SearchResult:
 
 
 
+def copy_results(results: list) -> list:
+    """Copies of search results and their entries, for handing out cached ones.
+
+    Callers may mutate what they get back; the cached objects must not change.
+    """
+    copies = []
+    for r in results:
+        entry = copy.copy(r.entry)
+        entry.access_times = list(entry.access_times)
+        copies.append(replace(r, entry=entry))
+    return copies
+
+
+class _AsciiAlnumTable(dict):
+    """str.translate table: ASCII letters/digits pass through, everything else -> space."""
+
+    def __missing__(self, codepoint: int) -> str:
+        ch = chr(codepoint)
+        self[codepoint] = mapped = ch if ch.isascii() and ch.isalnum() else " "
+        return mapped
+
+
+_ASCII_ALNUM = _AsciiAlnumTable()
+
+
+def ascii_alnum_words(query: str) -> list[str]:
+    """Split query into ASCII alphanumeric words, dropping FTS5 operators and punctuation."""
+    return query.translate(_ASCII_ALNUM).split()
+
+
 def sanitize_fts_query(query: str) -> str:
     """Sanitize query for FTS5 using proper tokenization."""
     try:
@@ -40,18 +74,49 @@ def sanitize_fts_query(query: str) -> str:
         return tokenize_for_fts(query)
     except ImportError:
         # Fallback: remove special FTS5 operators
-        sanitized = re.sub(r'[^a-zA-Z0-9\s]', ' ', query)
-        sanitized = re.sub(r'\s+', ' ', sanitized).strip()
+        sanitized = " ".join(ascii_alnum_words(query))
         return sanitized if sanitized else "memory"
 
 
 
 
 class SearchEngine:
-    """Hybrid retrieval combining FTS5 + ACT-R + structured filtering."""
+    """Hybrid retrieval combining FTS5 + ACT-R + structured filtering.
+
+    Two caches cut repeated work for repeated queries:
+    - FTS5 candidate ids per (query, filters), LRU of ``cache_size``
+    - full results per search arguments, kept for ``result_ttl`` seconds
+
+    Both are dropped whenever the store's memories, graph links or Hebbian
+    links change, through this store or any other connection to the same
+    database. Recorded accesses do not count as changes: within the
+    TTL, activation (and each entry's access_times) stays as of the cached
+    search. Cached results are handed out as copies, so callers may mutate
+    what they get back.
+    """
 
-    def __init__(self, store: SQLiteStore):
+    def __init__(self, store: SQLiteStore, cache_size: int = 128, result_ttl: float = 1.0):
         self.store = store
+        self.cache_size = cache_size
+        self.result_ttl = result_ttl
+        self._cache_version = None
+        self._candidate_cache: OrderedDict = OrderedDict()
+        self._result_cache: OrderedDict = OrderedDict()
+
+    def _check_cache_version(self):
+        version = (self.store._data_version, self.store._hebbian_version,
+                   self.store._external_version())
+        if version != self._cache_version:
+            self._cache_version = version
+            self._candidate_cache.clear()
+            self._result_cache.clear()
+
+    @staticmethod
+    def _cache_put(cache: OrderedDict, key, value, maxsize: int):
+        cache[key] = value
+        cache.move_to_end(key)
+        if len(cache) > maxsize:
+            cache.popitem(last=False)
 
     def search(
         self,
@@ -65,27 +130,33 @@ class SearchEngine:
         graph_expand: bool = True,
     ) -> list[SearchResult]:
         """Main search method."""
-        candidates = self._get_candidates(query, types, layers, time_range)
+        self._check_cache_version()
+        key = (
+            query, limit, tuple(context_keywords or ()), tuple(types or ()),
+            tuple(layers or ()), min_confidence, time_range, graph_expand,
+        )
+        if self.result_ttl > 0:
+            cached = self._result_cache.get(key)
+            if cached is not None and time.monotonic() - cached[0] < self.result_ttl:
+                return copy_results(cached[1])
+
+        candidates, relevance_by_id = self._get_candidates(query, types, layers, time_range, min_confidence)
         hebbian_boosts: dict[str, float] = {}
 
         # Graph expansion: find entities in candidates, pull in related memories
         # Also computes Hebbian spreading activation boosts
+        # (filters are applied in the SQL that fetches the new candidates)
         if graph_expand and candidates:
-            candidates, hebbian_boosts = self._expand_via_graph(candidates)
-
-            # Re-apply filters on expanded set
-            if types:
-                type_set = {t for t in types}
-                candidates = [c for c in candidates if c.memory_type.value in type_set]
-            if layers:
-                layer_set = {l for l in layers}
-                candidates = [c for c in candidates if c.layer.value in layer_set]
-            if time_range:
-                t_min, t_max = time_range
-                candidates = [c for c in candidates if t_min <= c.created_at <= t_max]
-
-        scored = self._score_candidates(candidates, context_keywords, has_query=bool(query.strip()), hebbian_boosts=hebbian_boosts)
-        return self._rank_and_filter(scored, limit, min_confidence)
+            candidates, hebbian_boosts = self._expand_via_graph(
+                candidates, types, layers, time_range, min_confidence)
+
+        scored = self._score_candidates(candidates, context_keywords, relevance_by_id=relevance_by_id, hebbian_boosts=hebbian_boosts)
+        results = self._rank_and_filter(scored, limit, min_confidence)
+
+        if self.result_ttl > 0:
+            self._cache_put(self._result_cache, key, (time.monotonic(), results), self.cache_size)
+            return copy_results(results)
+        return results
 
     def _get_candidates(
         self,
@@ -93,38 +164,61 @@ class SearchEngine:
         types: Optional[list[str]],
         layers: Optional[list[str]],
         time_range: Optional[tuple[float, float]],
-    ) -> list[MemoryEntry]:
-        """Get candidates via FTS5 or full scan, then apply SQL-level filters."""
+        min_confidence: float = 0.0,
+    ) -> tuple[list[MemoryEntry], dict[str, float]]:
+        """Get candidates via FTS5 or full scan, with filters applied in SQL.
+
+        min_confidence is pre-applied as an upper bound (see
+        confidence_bound_sql); _rank_and_filter still checks it exactly.
+
+        Returns:
+            Tuple of (candidates, relevance_by_id)
+            relevance_by_id maps FTS matches to bm25 relative to the best
+            match (best = 1.0); scanned candidates have no entry.
+        """
         query = query.strip()
+        relevance_by_id: dict[str, float] = {}
 
         if query:
             # Sanitize query to avoid FTS5 syntax errors
             sanitized_query = sanitize_fts_query(query)
-            candidates = self.store.search_fts(sanitized_query, limit=100)
+            key = (sanitized_query, tuple(types or ()), tuple(layers or ()), time_range, min_confidence)
+            ranks = self._candidate_cache.get(key)
+            if ranks is not None:
+                self._candidate_cache.move_to_end(key)
+                candidates = self.store.get_many([mid for mid, _ in ranks])
+            else:
+                matches = self.store.search_fts_scored(
+                    sanitized_query, limit=100,
+                    types=types, layers=layers, time_range=time_range,
+                    min_confidence=min_confidence,
+                )
+                candidates = [entry for entry, _ in matches]
+                ranks = [(entry.id, bm25) for entry, bm25 in matches]
+                self._cache_put(self._candidate_cache, key, ranks, self.cache_size)
+            # bm25 is negative, more negative = better match
+            best = min((bm25 for _, bm25 in ranks), default=0.0)
+            for mid, bm25 in ranks:
+                relevance_by_id[mid] = bm25 / best if best < 0 else 1.0
             # Fall back to full scan if FTS returns nothing
             if not candidates:
-                candidates = self.store.all()
+                candidates = self.store.scan(types, layers, time_range, min_confidence)
         else:
-            candidates = self.store.all()
-
-        # Apply filters
-        if types:
-            type_set = {t for t in types}
-            candidates = [c for c in candidates if c.memory_type.value in type_set]
-
-        if layers:
-            layer_set = {l for l in layers}
-            candidates = [c for c in candidates if c.layer.value in layer_set]
-
-        if time_range:
-            t_min, t_max = time_range
-            candidates = [c for c in candidates if t_min <= c.created_at <= t_max]
+            candidates = self.store.scan(types, layers, time_range, min_confidence)
 
-        return candidates
+        return candidates, relevance_by_id
 
-    def _expand_via_graph(self, candidates: list[MemoryEntry]) -> tuple[list[MemoryEntry], dict[str, float]]:
+    def _expand_via_graph(
+        self,
+        candidates: list[MemoryEntry],
+        types: Optional[list[str]] = None,
+        layers: Optional[list[str]] = None,
+        time_range: Optional[tuple[float, float]] = None,
+        min_confidence: float = 0.0,
+    ) -> tuple[list[MemoryEntry], dict[str, float]]:
         """Expand candidate set by finding memories that share entities with current candidates,
         and also include Hebbian-linked memories (co-activation associations).
+        Only memories passing the search filters are added.
         
         Returns:
             Tuple of (expanded_candidates, hebbian_boosts)
@@ -132,120 +226,99 @@ class SearchEngine:
         """
         seen_ids = {c.id for c in candidates}
         new_candidates = []
-        hebbian_boosts: dict[str, float] = {}
 
-        # 1. Entity-based expansion
-        all_entities = set()
-        for c in candidates:
-            for entity, _rel in self.store.get_entities(c.id):
-                all_entities.add(entity)
-
-        # For each entity, find related entities (1 hop) and their memories
-        expanded_entities = set(all_entities)
-        for entity in all_entities:
-            related = self.store.get_related_entities(entity, hops=1)
-            expanded_entities.update(related)
-
-        # Fetch memories for all entities
-        for entity in expanded_entities:
-            for entry in self.store.search_by_entity(entity):
-                if entry.id not in seen_ids:
-                    seen_ids.add(entry.id)
-                    new_candidates.append(entry)
+        # 1. Entity-based expansion: memories sharing entities (1 hop) with candidates
+        for entry in self.store.expand_memories_via_entities(
+            [c.id for c in candidates], hops=1,
+            types=types, layers=layers, time_range=time_range, min_confidence=min_confidence,
+        ):
+            seen_ids.add(entry.id)
+            new_candidates.append(entry)
 
         # 2. Hebbian expansion: include memories linked via co-activation
-        # AND compute spreading activation boosts
-        for c in candidates:
-            hebbian_neighbors = get_hebbian_neighbors(self.store, c.id)
-            for neighbor_id in hebbian_neighbors:
-                # Get link strength for weighted boost
-                strength = self._get_hebbian_strength(c.id, neighbor_id)
-                boost = 0.5 * strength  # Scale boost by link strength
-                
-                # Accumulate boosts (memory can be neighbor of multiple candidates)
-                hebbian_boosts[neighbor_id] = hebbian_boosts.get(neighbor_id, 0) + boost
-                
-                if neighbor_id not in seen_ids:
-                    entry = self.store.get(neighbor_id)
-                    if entry:
-                        seen_ids.add(neighbor_id)
-                        new_candidates.append(entry)
+        # AND compute spreading activation boosts (0.5 × link strength,
+        # accumulated when a memory neighbors multiple candidates)
+        hebbian_boosts = hebbian_spreading(self.store, [c.id for c in candidates])
+        neighbor_ids = [nid for nid in hebbian_boosts if nid not in seen_ids]
+        self.store.record_access_batch(neighbor_ids)
+        new_candidates.extend(self.store.get_many(
+            neighbor_ids,
+            types=types, layers=layers, time_range=time_range, min_confidence=min_confidence,
+        ))
 
         return candidates + new_candidates, hebbian_boosts
-    
-    def _get_hebbian_strength(self, source_id: str, target_id: str) -> float:
-        """Get the Hebbian link strength between two memories."""
-        try:
-            row = self.store._conn.execute(
-                """SELECT strength FROM hebbian_links 
-                   WHERE (source_id=? AND target_id=?) OR (source_id=? AND target_id=?)""",
-                (source_id, target_id, target_id, source_id)
-            ).fetchone()
-            return row[0] if row else 0.0
-        except Exception:
-            return 0.0
 
     def _score_candidates(
         self,
         candidates: list[MemoryEntry],
         context_keywords: Optional[list[str]],
-        has_query: bool = False,
+        relevance_by_id: Optional[dict[str, float]] = None,
         hebbian_boosts: Optional[dict[str, float]] = None,
     ) -> list[SearchResult]:
         """Score each candidate using ACT-R activation + confidence + Hebbian spreading."""
         now = time.time()
         results = []
+        relevance_by_id = relevance_by_id or {}
         hebbian_boosts = hebbian_boosts or {}
+        if not candidates:
+            return results
 
+        # Ensure access_times are populated
         for entry in candidates:
-            # Ensure access_times are populated
             if not entry.access_times:
                 entry.access_times = self.store.get_access_times(entry.id)
 
-            # ACT-R activation (base-level + spreading + importance)
-            act_score = retrieval_activation(
-                entry,
-                context_keywords=context_keywords,
-                now=now,
-            )
-
+        n = len(candidates)
+
+        # ACT-R activation (base-level + spreading + importance), one pass
+        act_scores = retrieval_activation_batch(
+            candidates,
+            context_keywords=context_keywords,
+            now=now,
+        )
+
+        # FTS relevance bonus: bm25 of each direct match, scaled so the best
+        # match is 1.0. Graph-expanded and scanned candidates get 0.
+        relevance = np.fromiter(
+            (relevance_by_id.get(e.id, 0.0) for e in candidates), dtype=np.float64, count=n)
+
+        # Hebbian spreading activation boost
+        # Memories linked to directly-matched candidates get a boost
+        # This implements "neurons that fire together, wire together" for retrieval
+        # Cap at 3.0 to prevent overwhelming pinned/importance boosts
+        hebbian = np.minimum(3.0, np.fromiter(
+            (hebbian_boosts.get(e.id, 0.0) for e in candidates), dtype=np.float64, count=n))
+
+        # Pinned memory boost: pinned memories should rank higher
+        # This ensures critical memories aren't buried by Hebbian noise
+        # Use a significant boost (5.0) to overcome Hebbian accumulation
+        pinned = np.fromiter((e.pinned for e in candidates), dtype=bool, count=n)
+
+        # High importance boost: give extra weight to very important memories
+        # importance is already in ACT-R score, but we add extra for >= 0.8
+        importance = np.fromiter((e.importance for e in candidates), dtype=np.float64, count=n)
+
+        # Final combined score: ACT-R activation + relevance + Hebbian + pinned + importance
+        scores = act_scores + (0.5 * relevance) + hebbian + 5.0 * pinned + 0.5 * (importance >= 0.8)
+
+        # Confidence from forgetting model
+        confidences = confidence_score_batch(candidates, now=now)
+
+        for entry, act_score, score, rel, conf in zip(
+            candidates, act_scores.tolist(), scores.tolist(), relevance.tolist(), confidences.tolist()
+        ):
             # Skip unretrievable memories
             if act_score == float("-inf"):
                 continue
 
-            # Confidence from forgetting model
-            conf = confidence_score(entry, store=None, now=now)
             label = confidence_label(conf)
 
-            # FTS relevance bonus: if we came from FTS, candidates are already
-            # relevance-ordered. Use position as a simple relevance proxy.
-            # (SQLite FTS5 rank is internal; we approximate with order.)
-            relevance = 1.0 if has_query else 0.0
-
-            # Hebbian spreading activation boost
-            # Memories linked to directly-matched candidates get a boost
-            # This implements "neurons that fire together, wire together" for retrieval
-            # Cap at 3.0 to prevent overwhelming pinned/importance boosts
-            hebbian_boost = min(3.0, hebbian_boosts.get(entry.id, 0.0))
-
-            # Pinned memory boost: pinned memories should rank higher
-            # This ensures critical memories aren't buried by Hebbian noise
-            # Use a significant boost (5.0) to overcome Hebbian accumulation
-            pinned_boost = 5.0 if entry.pinned else 0.0
-
-            # High importance boost: give extra weight to very important memories
-            # importance is already in ACT-R score, but we add extra for >= 0.8
-            importance_extra = 0.5 if entry.importance >= 0.8 else 0.0
-
-            # Final combined score: ACT-R activation + relevance + Hebbian + pinned + importance
-            score = act_score + (0.5 * relevance) + hebbian_boost + pinned_boost + importance_extra
-
             results.append(SearchResult(
                 entry=entry,
                 score=score,
                 confidence=conf,
                 confidence_label=label,
-                relevance=relevance,
+                relevance=rel,
             ))
 
         return results
@@ -256,17 +329,18 @@ class SearchEngine:
         limit: int,
         min_confidence: float,
     ) -> list[SearchResult]:
-        """Sort by score, apply min_confidence filter, return top-k.
+        """Apply min_confidence filter, return top-k by score.
         
         Pinned memories are sorted first (like sticky posts), then by score.
+        Uses a bounded heap (O(N log k)); ties keep candidate order, same as
+        a stable sort.
         """
         if min_confidence > 0:
             scored = [r for r in scored if r.confidence >= min_confidence]
 
         # Sort: pinned first, then by score
         # This ensures pinned memories always appear at the top
-        scored.sort(key=lambda r: (r.entry.pinned, r.score), reverse=True)
-        return scored[:limit]
+        return heapq.nlargest(limit, scored, key=lambda r: (r.entry.pinned, r.score))
 
 
 if __name__ == "__main__":
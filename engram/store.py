@@ -3,17 +3,27 @@ SQLite-backed memory store for Engram.
 Replaces the in-memory dict-based MemoryStore with persistent storage.
 """
 
+import json
 import sqlite3
-import shutil
 import time
 import uuid
+from contextlib import contextmanager
+from itertools import repeat
 from typing import Optional
 
 # TODO: import from engram.core once package is finalized
 import sys, os
-from engram.core import MemoryEntry, MemoryType, MemoryLayer, DEFAULT_IMPORTANCE
+from engram.core import (
+    MemoryEntry, MemoryType, MemoryLayer, DEFAULT_IMPORTANCE,
+    MEMORY_TYPE_BY_VALUE, MEMORY_LAYER_BY_VALUE,
+)
+from engram.confidence import confidence_bound_sql
 
 
+# memory_type / layer are stored as their enum string values, not integer
+# codes: the on-disk format is shared with engram-ts (engram-ts/src/store.ts),
+# and rows decode through MEMORY_TYPE_BY_VALUE / MEMORY_LAYER_BY_VALUE dict
+# lookups while filters hit idx_memories_type_layer_created.
 _SCHEMA = """
 CREATE TABLE IF NOT EXISTS memories (
     id TEXT PRIMARY KEY,
@@ -54,19 +64,46 @@ CREATE TABLE IF NOT EXISTS hebbian_links (
     PRIMARY KEY (source_id, target_id)
 );
 
-CREATE INDEX IF NOT EXISTS idx_access_log_mid ON access_log(memory_id);
+-- Covering index for the per-row access-times subquery in _ENTRY_COLUMNS,
+-- which every all()/get()/search (and so every consolidation pass) runs:
+-- times are read from the index without touching access_log itself. It
+-- also serves the ON DELETE CASCADE lookups, replacing the plain
+-- memory_id index (engram-ts may still create that one; it is harmless).
+CREATE INDEX IF NOT EXISTS idx_access_log_mid_at ON access_log(memory_id, accessed_at);
+DROP INDEX IF EXISTS idx_access_log_mid;
 CREATE INDEX IF NOT EXISTS idx_graph_links_mid ON graph_links(memory_id);
 CREATE INDEX IF NOT EXISTS idx_graph_links_nid ON graph_links(node_id);
-CREATE INDEX IF NOT EXISTS idx_hebbian_source ON hebbian_links(source_id);
+-- hebbian_links lookups by source_id (and the source_id cascade) use the
+-- PRIMARY KEY (source_id, target_id) index; a separate source_id index only
+-- cost an extra b-tree write per co-activation.
+DROP INDEX IF EXISTS idx_hebbian_source;
 CREATE INDEX IF NOT EXISTS idx_hebbian_target ON hebbian_links(target_id);
+-- Candidate filters (type/layer/time); the compound index also serves
+-- memory_type-only lookups through its leading column.
+CREATE INDEX IF NOT EXISTS idx_memories_type_layer_created ON memories(memory_type, layer, created_at);
+CREATE INDEX IF NOT EXISTS idx_memories_layer ON memories(layer);
+CREATE INDEX IF NOT EXISTS idx_memories_created ON memories(created_at);
 """
 
-_FTS_SCHEMA = """
+# porter stems English words ("running" matches "run"); it wraps unicode61,
+# which casefolds in C. remove_diacritics 2 also folds letters carrying
+# several diacritics (Vietnamese "Nguyễn" matches "nguyen"); the default 1
+# leaves those untouched. CJK text is pre-segmented into the tokens column.
+_FTS_TOKENIZE = "porter unicode61 remove_diacritics 2"
+
+_FTS_SCHEMA = f"""
 CREATE VIRTUAL TABLE IF NOT EXISTS memories_fts USING fts5(
-    content, summary, tokens, content=memories, content_rowid=rowid
+    content, summary, tokens, content=memories, content_rowid=rowid,
+    tokenize='{_FTS_TOKENIZE}'
 );
+-- Per-term document counts, read when pruning common CJK query tokens
+CREATE VIRTUAL TABLE IF NOT EXISTS memories_fts_vocab USING fts5vocab(memories_fts, 'row');
 """
 
+# CJK queries become "t1" OR "t2" OR ...; keep that tree small.
+_MAX_MATCH_TOKENS = 8
+_COMMON_TOKEN_RATIO = 0.5
+
 _FTS_TRIGGERS = """
 CREATE TRIGGER IF NOT EXISTS memories_ai AFTER INSERT ON memories BEGIN
     INSERT INTO memories_fts(rowid, content, summary, tokens)
@@ -78,7 +115,10 @@ CREATE TRIGGER IF NOT EXISTS memories_ad AFTER DELETE ON memories BEGIN
     VALUES ('delete', old.rowid, old.content, old.summary, old.tokens);
 END;
 
-CREATE TRIGGER IF NOT EXISTS memories_au AFTER UPDATE ON memories BEGIN
+CREATE TRIGGER IF NOT EXISTS memories_au AFTER UPDATE ON memories
+WHEN old.content IS NOT new.content OR old.summary IS NOT new.summary
+     OR old.tokens IS NOT new.tokens
+BEGIN
     INSERT INTO memories_fts(memories_fts, rowid, content, summary, tokens)
     VALUES ('delete', old.rowid, old.content, old.summary, old.tokens);
     INSERT INTO memories_fts(rowid, content, summary, tokens)
@@ -87,42 +127,307 @@ END;
 """
 
 
-def _row_to_entry(row: sqlite3.Row, access_times: list[float] | None = None) -> MemoryEntry:
+# Columns of the memories table (whitelist for scan_fields)
+_MEMORY_COLUMNS = frozenset({
+    "id", "content", "summary", "tokens", "memory_type", "layer", "created_at",
+    "working_strength", "core_strength", "importance", "pinned",
+    "consolidation_count", "last_consolidated", "source_file",
+    "contradicts", "contradicted_by",
+})
+
+# Access times are aggregated into each memory row so a single statement
+# returns everything needed to build a MemoryEntry (no per-row access_log
+# lookups). printf('%!.17g') keeps the REAL -> text round-trip lossless.
+# The column order is fixed: _row_to_entry unpacks rows positionally.
+_ENTRY_COLUMNS = """m.id, m.content, m.summary, m.memory_type, m.layer, m.created_at,
+       m.working_strength, m.core_strength, m.importance, m.pinned,
+       m.consolidation_count, m.last_consolidated, m.source_file,
+       m.contradicts, m.contradicted_by,
+       (SELECT group_concat(printf('%!.17g', a.accessed_at))
+        FROM access_log a WHERE a.memory_id = m.id) AS access_times"""
+_SELECT_ENTRIES = f"""SELECT {_ENTRY_COLUMNS}
+FROM memories m"""
+
+
+_INSERT_MEMORY = """INSERT INTO memories (id, content, summary, tokens, memory_type, layer,
+   created_at, working_strength, core_strength, importance, pinned, consolidation_count,
+   last_consolidated, source_file, contradicts, contradicted_by)
+   VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)"""
+
+_INSERT_ACCESS = "INSERT INTO access_log (memory_id, accessed_at) VALUES (?,?)"
+_INSERT_GRAPH_LINK = "INSERT INTO graph_links (memory_id, node_id, relation) VALUES (?,?,?)"
+_SET_LAYER = "UPDATE memories SET layer=? WHERE id=?"
+
+_UPDATE_MEMORY = """UPDATE memories SET content=?, summary=?, memory_type=?, layer=?,
+   working_strength=?, core_strength=?, importance=?, pinned=?,
+   consolidation_count=?, last_consolidated=?, source_file=?,
+   contradicts=?, contradicted_by=?
+   WHERE id=?"""
+
+
+def _update_params(entry: MemoryEntry) -> tuple:
+    return (entry.content, entry.summary, entry.memory_type.value, entry.layer.value,
+            entry.working_strength, entry.core_strength, entry.importance,
+            int(entry.pinned), entry.consolidation_count, entry.last_consolidated,
+            entry.source_file, entry.contradicts, entry.contradicted_by, entry.id)
+
+_CONFIDENCE_BOUND = confidence_bound_sql("m")
+
+# Unfiltered search_fts_scored(), the common recall() shape. Kept as one
+# constant string so every call reuses the same compiled statement from the
+# connection's cache without rebuilding the SQL text.
+_FTS_SEARCH = f"""WITH fts_matches AS (
+        SELECT rowid, rank AS score FROM memories_fts
+        WHERE memories_fts MATCH ? ORDER BY rank LIMIT ?)
+    SELECT {_ENTRY_COLUMNS}, f.score FROM memories m
+    JOIN fts_matches f ON m.rowid = f.rowid
+    ORDER BY f.score"""
+
+# Stored in PRAGMA user_version once the schema and migrations have run, so
+# reopening an up-to-date file (every Memory(path), e.g. one per worker
+# thread) skips the DDL script and its write lock. Bump it whenever
+# _SCHEMA, _FTS_SCHEMA, _FTS_TRIGGERS or a migration changes.
+_SCHEMA_VERSION = 2
+
+# Prepared statements stay compiled in sqlite3's per-connection LRU cache.
+# Filtered searches and entity lookups produce one SQL shape per IN-list
+# length, so the stdlib default (128) lets those one-off shapes evict
+# the hot per-call statements (access log, get, update, Hebbian upserts).
+_STATEMENT_CACHE_SIZE = 512
+
+# Id lists of unbounded length (get_many, graph expansion) are bound as
+# one JSON array and read back through json_each(), so a query never nears
+# SQLITE_MAX_VARIABLE_NUMBER (32766 by default) and keeps a single shape
+# in the statement cache whatever the number of ids.
+_ID_LIST = "(SELECT value FROM json_each(?))"
+
+# Applied on every connection open:
+# - page_size (8 KB): only takes effect on a new, empty database (it must
+#   precede the switch to WAL); fewer page hops for FTS5 and embedding BLOBs
+# - busy_timeout (30 s): wait on a locked database instead of failing
+#   immediately; journal_mode persists in the file but this does not, so
+#   every connection (one per Memory/thread) sets it
+# - cache_size (64 MB): keep FTS5 segments and hot b-tree pages resident
+# - temp_store=MEMORY: sorter/temp b-trees for ORDER BY and CTEs stay in RAM
+_PRAGMAS = (
+    "PRAGMA page_size=8192",
+    "PRAGMA busy_timeout=30000",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA foreign_keys=ON",
+)
+
+# File-backed databases only (no-ops or meaningless in memory):
+# - WAL + synchronous=NORMAL: readers run alongside the single writer, and
+#   fsync happens only at checkpoints, still crash-safe
+# - mmap_size (256 MB): read pages via mmap instead of read() + memcpy
+_FILE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA wal_autocheckpoint=1000",
+    "PRAGMA mmap_size=268435456",
+)
+
+
+def _is_memory_path(db_path) -> bool:
+    """":memory:", "" (private temp db) or a "file:...?mode=memory" URI."""
+    if not isinstance(db_path, str):
+        return False
+    return db_path in (":memory:", "") or (
+        db_path.startswith("file:") and "mode=memory" in db_path)
+
+
+def _filter_clause(types: Optional[list[str]] = None,
+                   layers: Optional[list[str]] = None,
+                   time_range: Optional[tuple[float, float]] = None,
+                   min_confidence: float = 0.0) -> tuple[str, list]:
+    """Build a parameterized ``AND ...`` clause for type/layer/time filters.
+
+    Values are de-duplicated and sorted so the number of distinct SQL shapes
+    stays small and the statement cache keeps hitting. ``min_confidence``
+    filters on an upper bound of the confidence score, so it only removes
+    memories that could never reach the threshold.
+    """
+    clauses, params = [], []
+    if types:
+        type_values = sorted(set(types))
+        clauses.append(f"m.memory_type IN ({','.join('?' * len(type_values))})")
+        params.extend(type_values)
+    if layers:
+        layer_values = sorted(set(layers))
+        clauses.append(f"m.layer IN ({','.join('?' * len(layer_values))})")
+        params.extend(layer_values)
+    if time_range:
+        clauses.append("m.created_at BETWEEN ? AND ?")
+        params.extend(time_range)
+    if min_confidence > 0:
+        clauses.append(f"{_CONFIDENCE_BOUND} >= ?")
+        params.append(min_confidence - 1e-9)  # float slack: never drop a borderline pass
+    return "".join(f" AND {c}" for c in clauses), params
+
+
+def _parse_access_times(csv: Optional[str]) -> list[float]:
+    if not csv:
+        return []
+    return sorted(float(x) for x in csv.split(","))
+
+
+def _row_to_entry(row: tuple) -> MemoryEntry:
+    (memory_id, content, summary, memory_type, layer, created_at,
+     working_strength, core_strength, importance, pinned,
+     consolidation_count, last_consolidated, source_file,
+     contradicts, contradicted_by, access_times) = row
     return MemoryEntry(
-        id=row["id"],
-        content=row["content"],
-        summary=row["summary"] or "",
-        memory_type=MemoryType(row["memory_type"]),
-        layer=MemoryLayer(row["layer"]),
-        created_at=row["created_at"],
-        access_times=access_times if access_times is not None else [],
-        working_strength=row["working_strength"],
-        core_strength=row["core_strength"],
-        importance=row["importance"],
-        pinned=bool(row["pinned"]),
-        consolidation_count=row["consolidation_count"],
-        last_consolidated=row["last_consolidated"],
-        source_file=row["source_file"] or "",
-        contradicts=row["contradicts"] or "",
-        contradicted_by=row["contradicted_by"] or "",
+        id=memory_id,
+        content=content,
+        summary=summary or "",
+        memory_type=MEMORY_TYPE_BY_VALUE[memory_type],
+        layer=MEMORY_LAYER_BY_VALUE[layer],
+        created_at=created_at,
+        access_times=_parse_access_times(access_times),
+        working_strength=working_strength,
+        core_strength=core_strength,
+        importance=importance,
+        pinned=bool(pinned),
+        consolidation_count=consolidation_count,
+        last_consolidated=last_consolidated,
+        source_file=source_file or "",
+        contradicts=contradicts or "",
+        contradicted_by=contradicted_by or "",
     )
 
 
+class _Connection(sqlite3.Connection):
+    """sqlite3 connection whose commit() is deferred inside SQLiteStore.bulk().
+
+    The store, VectorStore and engram.hebbian all commit on this one
+    connection, so holding commits here covers every writer.
+    """
+    bulk_depth = 0
+
+    def commit(self):
+        if not self.bulk_depth:
+            super().commit()
+
+
 class SQLiteStore:
     """Persistent SQLite-backed memory store with FTS5 search."""
 
-    def __init__(self, db_path: str = ":memory:"):
+    def __init__(self, db_path: str = ":memory:", read_only: bool = False):
+        """
+        Args:
+            db_path: Database file, ":memory:", or a "file:" URI
+            read_only: Refuse every write on this connection (PRAGMA
+                query_only). The schema is still created or migrated on
+                open if the file needs it.
+        """
         self.db_path = db_path
-        self._conn = sqlite3.connect(db_path)
+        self.read_only = read_only
+        # Bumped whenever formed Hebbian links may have changed; lets
+        # engram.hebbian cache its link snapshot between writes.
+        self._hebbian_version = 0
+        # Bumped on every write to memories or graph links; search caches
+        # key on it (and on _external_version() for other connections'
+        # commits) so they never serve entries from before a mutation.
+        self._data_version = 0
+        # "file:..." paths are URIs, e.g. "file:agent?mode=memory&cache=shared"
+        # for an in-memory database shared by every connection in the process
+        uri = isinstance(db_path, str) and db_path.startswith("file:")
+        # Implicit transactions open with BEGIN IMMEDIATE: a writer takes the
+        # write lock up front (waiting out busy_timeout behind other writers)
+        # instead of discovering contention midway through a bulk() block
+        self._conn = sqlite3.connect(db_path, uri=uri, cached_statements=_STATEMENT_CACHE_SIZE,
+                                     isolation_level="IMMEDIATE", factory=_Connection)
         self._conn.row_factory = sqlite3.Row
-        self._conn.execute("PRAGMA journal_mode=WAL")
-        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._apply_pragmas()
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] != _SCHEMA_VERSION:
+            self._create_schema()
+        if read_only:
+            self._conn.execute("PRAGMA query_only=1")
+
+    def _create_schema(self):
+        """Create tables, run migrations and stamp the file with _SCHEMA_VERSION."""
         self._conn.executescript(_SCHEMA)
         self._migrate_contradiction_columns()
+        self._migrate_fts_tokenizer()
         self._conn.executescript(_FTS_SCHEMA)
+        self._migrate_fts_update_trigger()
         self._conn.executescript(_FTS_TRIGGERS)
+        self._conn.execute(f"PRAGMA user_version={_SCHEMA_VERSION}")
         self._conn.commit()
 
+    @contextmanager
+    def bulk(self):
+        """Run many writes as one transaction: commit at the end, roll back on error.
+
+        Writes inside the block skip their own commits. Blocks may nest;
+        only the outermost one commits.
+        """
+        conn = self._conn
+        conn.bulk_depth += 1
+        try:
+            yield self
+        except BaseException:
+            conn.bulk_depth -= 1
+            if not conn.bulk_depth:
+                conn.rollback()
+                # Cached reads may have seen the rolled-back rows
+                self._data_version += 1
+                self._hebbian_version += 1
+            raise
+        conn.bulk_depth -= 1
+        if not conn.bulk_depth:
+            conn.commit()
+
+    def _external_version(self) -> int:
+        """PRAGMA data_version: changes whenever another connection commits to this database."""
+        return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def _apply_pragmas(self):
+        """Per-connection settings; see _PRAGMAS and _FILE_PRAGMAS."""
+        for pragma in _PRAGMAS:
+            self._conn.execute(pragma)
+        if not _is_memory_path(self.db_path):
+            for pragma in _FILE_PRAGMAS:
+                self._conn.execute(pragma)
+
+    def _fetch_entries(self, sql: str, params=()) -> list[MemoryEntry]:
+        """Run an _SELECT_ENTRIES query on a plain-tuple cursor.
+
+        Skips sqlite3.Row so _row_to_entry can unpack columns by position.
+        """
+        cursor = self._conn.cursor()
+        cursor.row_factory = None
+        return [_row_to_entry(r) for r in cursor.execute(sql, params)]
+
+    def _migrate_fts_tokenizer(self):
+        """Drop an FTS index built with another tokenizer (migration for older DBs).
+
+        The caller recreates it with _FTS_TOKENIZE; the index is then
+        rebuilt from the memories table.
+        """
+        row = self._conn.execute(
+            "SELECT sql FROM sqlite_master WHERE type='table' AND name='memories_fts'"
+        ).fetchone()
+        if row is None or _FTS_TOKENIZE in row[0]:
+            return
+        self._conn.execute("DROP TABLE IF EXISTS memories_fts_vocab")
+        self._conn.execute("DROP TABLE memories_fts")
+        self._conn.executescript(_FTS_SCHEMA)
+        self._conn.execute("INSERT INTO memories_fts(memories_fts) VALUES ('rebuild')")
+
+    def _migrate_fts_update_trigger(self):
+        """Replace the old unconditional FTS update trigger (migration for older DBs).
+
+        Strength/layer updates (consolidation, rewards, downscaling) leave
+        the text alone and should not re-index it.
+        """
+        row = self._conn.execute(
+            "SELECT sql FROM sqlite_master WHERE type='trigger' AND name='memories_au'"
+        ).fetchone()
+        if row is not None and "WHEN" not in row[0]:
+            self._conn.execute("DROP TRIGGER memories_au")
+
     def _migrate_contradiction_columns(self):
         """Add contradiction columns if they don't exist (migration for older DBs)."""
         cursor = self._conn.execute("PRAGMA table_info(memories)")
@@ -132,9 +437,10 @@ class SQLiteStore:
         if "contradicted_by" not in columns:
             self._conn.execute("ALTER TABLE memories ADD COLUMN contradicted_by TEXT DEFAULT ''")
 
-    def add(self, content: str, memory_type: MemoryType = MemoryType.FACTUAL,
-            importance: Optional[float] = None, source_file: str = "",
-            created_at: Optional[float] = None) -> MemoryEntry:
+    def _new_entry(self, content: str, memory_type: MemoryType = MemoryType.FACTUAL,
+                   importance: Optional[float] = None, source_file: str = "",
+                   created_at: Optional[float] = None) -> tuple[MemoryEntry, tuple]:
+        """Build a fresh entry and its memories-table INSERT parameters."""
         entry = MemoryEntry(
             content=content,
             memory_type=memory_type,
@@ -151,53 +457,162 @@ class SQLiteStore:
         from engram.engram_tokenizers import contains_cjk, tokenize_for_fts
         tokens = tokenize_for_fts(content) if contains_cjk(content) else ""
         
-        self._conn.execute(
-            """INSERT INTO memories (id, content, summary, tokens, memory_type, layer, created_at,
-               working_strength, core_strength, importance, pinned, consolidation_count,
-               last_consolidated, source_file, contradicts, contradicted_by)
-               VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)""",
-            (entry.id, entry.content, entry.summary, tokens, entry.memory_type.value,
-             entry.layer.value, entry.created_at, entry.working_strength,
-             entry.core_strength, entry.importance, int(entry.pinned),
-             entry.consolidation_count, entry.last_consolidated, entry.source_file,
-             entry.contradicts, entry.contradicted_by),
-        )
+        row = (entry.id, entry.content, entry.summary, tokens, entry.memory_type.value,
+               entry.layer.value, entry.created_at, entry.working_strength,
+               entry.core_strength, entry.importance, int(entry.pinned),
+               entry.consolidation_count, entry.last_consolidated, entry.source_file,
+               entry.contradicts, entry.contradicted_by)
+        entry.access_times = [entry.created_at]
+        return entry, row
+
+    def add(self, content: str, memory_type: MemoryType = MemoryType.FACTUAL,
+            importance: Optional[float] = None, source_file: str = "",
+            created_at: Optional[float] = None) -> MemoryEntry:
+        entry, row = self._new_entry(content, memory_type, importance, source_file, created_at)
+        self._conn.execute(_INSERT_MEMORY, row)
         # Record initial access
         self._conn.execute(
-            "INSERT INTO access_log (memory_id, accessed_at) VALUES (?,?)",
+            _INSERT_ACCESS,
             (entry.id, entry.created_at),
         )
         self._conn.commit()
-        entry.access_times = [entry.created_at]
+        self._data_version += 1
         return entry
 
+    def add_batch(self, items: list[dict]) -> list[MemoryEntry]:
+        """Insert many memories (and their entity links) in one transaction.
+
+        Each item holds add()'s keyword arguments (``content`` required,
+        plus ``memory_type``, ``importance``, ``source_file``,
+        ``created_at``) and optionally ``entities``: a list of entity names
+        or (entity, relation) pairs. Returns the entries in input order.
+        """
+        entries, rows, links = [], [], []
+        for item in items:
+            item = dict(item)
+            entities = item.pop("entities", None) or ()
+            entry, row = self._new_entry(**item)
+            entries.append(entry)
+            rows.append(row)
+            for ent in entities:
+                if isinstance(ent, (list, tuple)):
+                    links.append((entry.id, ent[0], ent[1] if len(ent) > 1 else ""))
+                else:
+                    links.append((entry.id, ent, ""))
+        if not entries:
+            return []
+
+        self._conn.executemany(_INSERT_MEMORY, rows)
+        self._conn.executemany(
+            _INSERT_ACCESS,
+            [(e.id, e.created_at) for e in entries],
+        )
+        if links:
+            self._conn.executemany(
+                _INSERT_GRAPH_LINK,
+                links,
+            )
+        self._conn.commit()
+        self._data_version += 1
+        return entries
+
     def get(self, memory_id: str) -> Optional[MemoryEntry]:
-        row = self._conn.execute("SELECT * FROM memories WHERE id=?", (memory_id,)).fetchone()
-        if row is None:
+        exists = self._conn.execute("SELECT 1 FROM memories WHERE id=?", (memory_id,)).fetchone()
+        if exists is None:
             return None
         self.record_access(memory_id)
-        access_times = self.get_access_times(memory_id)
-        return _row_to_entry(row, access_times)
+        return self._fetch_entries(f"{_SELECT_ENTRIES} WHERE m.id=?", (memory_id,))[0]
+
+    def get_many(self, memory_ids: list[str],
+                 types: Optional[list[str]] = None,
+                 layers: Optional[list[str]] = None,
+                 time_range: Optional[tuple[float, float]] = None,
+                 min_confidence: float = 0.0) -> list[MemoryEntry]:
+        """Fetch entries by id in the given order, without recording access.
+
+        Ids that don't exist or don't match the filters are skipped.
+        """
+        if not memory_ids:
+            return []
+        filters, params = _filter_clause(types, layers, time_range, min_confidence)
+        entries = self._fetch_entries(
+            f"{_SELECT_ENTRIES} WHERE m.id IN {_ID_LIST}{filters}",
+            [json.dumps(memory_ids), *params],
+        )
+        by_id = {e.id: e for e in entries}
+        return [by_id[mid] for mid in memory_ids if mid in by_id]
 
     def all(self) -> list[MemoryEntry]:
-        rows = self._conn.execute("SELECT * FROM memories").fetchall()
-        return [_row_to_entry(r, self.get_access_times(r["id"])) for r in rows]
+        return self._fetch_entries(_SELECT_ENTRIES)
 
     def update(self, entry: MemoryEntry):
-        self._conn.execute(
-            """UPDATE memories SET content=?, summary=?, memory_type=?, layer=?,
-               working_strength=?, core_strength=?, importance=?, pinned=?,
-               consolidation_count=?, last_consolidated=?, source_file=?,
-               contradicts=?, contradicted_by=?
-               WHERE id=?""",
-            (entry.content, entry.summary, entry.memory_type.value, entry.layer.value,
-             entry.working_strength, entry.core_strength, entry.importance,
-             int(entry.pinned), entry.consolidation_count, entry.last_consolidated,
-             entry.source_file, entry.contradicts, entry.contradicted_by, entry.id),
-        )
+        self._conn.execute(_UPDATE_MEMORY, _update_params(entry))
         self._conn.commit()
+        self._data_version += 1
 
-    def search_fts(self, query: str, limit: int = 20) -> list[MemoryEntry]:
+    def update_many(self, entries: list[MemoryEntry]):
+        """update() for many entries in one transaction."""
+        if not entries:
+            return
+        self._conn.executemany(_UPDATE_MEMORY, [_update_params(e) for e in entries])
+        self._conn.commit()
+        self._data_version += 1
+
+    def scale_strengths(self, factor: float) -> tuple[int, float]:
+        """Multiply working and core strength of unpinned memories by factor.
+
+        One UPDATE. Returns (rows scaled, their total strength before).
+        """
+        total_before = self.total_strength()
+        cursor = self._conn.execute(
+            """UPDATE memories SET working_strength = working_strength * ?,
+                   core_strength = core_strength * ?
+               WHERE pinned = 0""",
+            (factor, factor),
+        )
+        self._conn.commit()
+        self._data_version += 1
+        return cursor.rowcount, total_before
+
+    def search_fts(self, query: str, limit: int = 20,
+                   types: Optional[list[str]] = None,
+                   layers: Optional[list[str]] = None,
+                   time_range: Optional[tuple[float, float]] = None,
+                   min_confidence: float = 0.0) -> list[MemoryEntry]:
+        return [entry for entry, _ in self.search_fts_scored(
+            query, limit, types, layers, time_range, min_confidence)]
+
+    def _prune_match_tokens(self, tokens: list[str]) -> list[str]:
+        """Bound the OR-query built from CJK tokens.
+
+        Duplicates are removed; single-character tokens found in more than
+        _COMMON_TOKEN_RATIO of all memories (e.g. 的, 是) are dropped when
+        other tokens remain, since they hit most postings lists while adding
+        little; and at most _MAX_MATCH_TOKENS are kept, longest first.
+        """
+        tokens = list(dict.fromkeys(tokens))
+        singles = [t for t in tokens if len(t) == 1]
+        if singles and len(singles) < len(tokens):
+            total = self._conn.execute("SELECT COUNT(*) FROM memories").fetchone()[0]
+            placeholders = ",".join("?" * len(singles))
+            common = {
+                term for term, doc in self._conn.execute(
+                    f"SELECT term, doc FROM memories_fts_vocab WHERE term IN ({placeholders})",
+                    singles,
+                )
+                if doc > total * _COMMON_TOKEN_RATIO
+            }
+            tokens = [t for t in tokens if t not in common]
+        if len(tokens) > _MAX_MATCH_TOKENS:
+            tokens = sorted(tokens, key=len, reverse=True)[:_MAX_MATCH_TOKENS]
+        return tokens
+
+    def search_fts_scored(self, query: str, limit: int = 20,
+                          types: Optional[list[str]] = None,
+                          layers: Optional[list[str]] = None,
+                          time_range: Optional[tuple[float, float]] = None,
+                          min_confidence: float = 0.0) -> list[tuple[MemoryEntry, float]]:
+        """Like search_fts, but pairs each entry with its FTS5 bm25 rank (lower is better)."""
         from engram.engram_tokenizers import contains_cjk, tokenize_for_fts
         
         # Tokenize CJK queries for better matching
@@ -205,34 +620,70 @@ class SQLiteStore:
             tokens = tokenize_for_fts(query).split()
             # Filter out empty tokens and single-char punctuation
             tokens = [t for t in tokens if len(t) > 0 and not (len(t) == 1 and not t.isalnum())]
+            tokens = self._prune_match_tokens(tokens)
             if tokens:
                 # Use OR to match ANY token (more intuitive for semantic search)
                 # Escape special FTS5 chars and quote tokens
-                safe_tokens = [f'"{t}"' for t in tokens]
+                safe_tokens = ['"{}"'.format(t.replace('"', '""')) for t in tokens]
                 query = " OR ".join(safe_tokens)
             else:
                 query = query  # fallback to original
         
-        rows = self._conn.execute(
-            """SELECT m.* FROM memories m
-               JOIN memories_fts f ON m.rowid = f.rowid
-               WHERE memories_fts MATCH ?
-               ORDER BY rank LIMIT ?""",
-            (query, limit),
-        ).fetchall()
-        return [_row_to_entry(r, self.get_access_times(r["id"])) for r in rows]
+        # MATCH runs alone against the FTS table in a CTE so the planner always
+        # uses the full-text index (and its rank ordering); the base table is
+        # joined afterwards. Unfiltered searches cap the match set inside the
+        # CTE, filtered ones apply the limit after filtering.
+        filters, params = _filter_clause(types, layers, time_range, min_confidence)
+        if filters:
+            sql = f"""WITH fts_matches AS (
+                    SELECT rowid, rank AS score FROM memories_fts
+                    WHERE memories_fts MATCH ?)
+                SELECT {_ENTRY_COLUMNS}, f.score FROM memories m
+                JOIN fts_matches f ON m.rowid = f.rowid
+                WHERE 1=1{filters}
+                ORDER BY f.score LIMIT ?"""
+            args = (query, *params, limit)
+        else:
+            sql = _FTS_SEARCH
+            args = (query, limit)
+        cursor = self._conn.cursor()
+        cursor.row_factory = None
+        return [(_row_to_entry(r[:-1]), r[-1]) for r in cursor.execute(sql, args)]
+
+    def scan(self, types: Optional[list[str]] = None,
+             layers: Optional[list[str]] = None,
+             time_range: Optional[tuple[float, float]] = None,
+             min_confidence: float = 0.0) -> list[MemoryEntry]:
+        """All memories matching the given type/layer/time/confidence filters."""
+        filters, params = _filter_clause(types, layers, time_range, min_confidence)
+        return self._fetch_entries(f"{_SELECT_ENTRIES} WHERE 1=1{filters}", params)
+
+    def scan_fields(self, fields: tuple[str, ...],
+                    types: Optional[list[str]] = None,
+                    layers: Optional[list[str]] = None,
+                    time_range: Optional[tuple[float, float]] = None) -> list[tuple]:
+        """Raw column tuples for matching memories, skipping MemoryEntry construction.
+
+        For scoring/statistics passes that only need a few columns, e.g.
+        scan_fields(("id", "importance", "pinned")).
+        """
+        unknown = set(fields) - _MEMORY_COLUMNS
+        if unknown:
+            raise ValueError(f"Unknown memory fields: {sorted(unknown)}")
+        filters, params = _filter_clause(types, layers, time_range)
+        columns = ", ".join(f"m.{f}" for f in fields)
+        cursor = self._conn.execute(f"SELECT {columns} FROM memories m WHERE 1=1{filters}", params)
+        return [tuple(r) for r in cursor.fetchall()]
 
     def search_by_type(self, memory_type: MemoryType) -> list[MemoryEntry]:
-        rows = self._conn.execute(
-            "SELECT * FROM memories WHERE memory_type=?", (memory_type.value,)
-        ).fetchall()
-        return [_row_to_entry(r, self.get_access_times(r["id"])) for r in rows]
+        return self._fetch_entries(
+            f"{_SELECT_ENTRIES} WHERE m.memory_type=?", (memory_type.value,)
+        )
 
     def search_by_layer(self, layer: MemoryLayer) -> list[MemoryEntry]:
-        rows = self._conn.execute(
-            "SELECT * FROM memories WHERE layer=?", (layer.value,)
-        ).fetchall()
-        return [_row_to_entry(r, self.get_access_times(r["id"])) for r in rows]
+        return self._fetch_entries(
+            f"{_SELECT_ENTRIES} WHERE m.layer=?", (layer.value,)
+        )
 
     def get_access_times(self, memory_id: str) -> list[float]:
         rows = self._conn.execute(
@@ -242,25 +693,70 @@ class SQLiteStore:
         return [r["accessed_at"] for r in rows]
 
     def record_access(self, memory_id: str):
+        if self.read_only:
+            return  # accesses are writes; read-only stores only observe
         self._conn.execute(
-            "INSERT INTO access_log (memory_id, accessed_at) VALUES (?,?)",
+            _INSERT_ACCESS,
             (memory_id, time.time()),
         )
         self._conn.commit()
 
-    def delete(self, memory_id: str):
-        self._conn.execute("DELETE FROM memories WHERE id=?", (memory_id,))
+    def record_access_batch(self, memory_ids: list[str]):
+        """Record one access for each id in a single transaction (no-op when read-only).
+
+        Search engines call this for every memory a search reaches through
+        get_many() (vector candidates, graph and Hebbian neighbors), so
+        reaching a memory counts as an access, as a store.get() per id does.
+        """
+        if not memory_ids or self.read_only:
+            return
+        now = time.time()
+        self._conn.executemany(
+            _INSERT_ACCESS,
+            zip(memory_ids, repeat(now)),
+        )
+        self._conn.commit()
+
+    def set_layer(self, memory_ids: list[str], layer: MemoryLayer):
+        """Move memories to ``layer`` in one transaction."""
+        if not memory_ids:
+            return
+        self._conn.executemany(_SET_LAYER, zip(repeat(layer.value), memory_ids))
         self._conn.commit()
+        self._data_version += 1
+
+    def delete(self, memory_id: str) -> bool:
+        """Delete a memory; returns False (and changes nothing) for an unknown id."""
+        cursor = self._conn.execute("DELETE FROM memories WHERE id=?", (memory_id,))
+        self._conn.commit()
+        if not cursor.rowcount:
+            return False
+        self._data_version += 1
+        self._hebbian_version += 1  # links cascade with the memory
+        return True
 
     def export(self, path: str):
-        """Copy database to path. For in-memory DBs, use backup API."""
-        if self.db_path == ":memory:":
-            dst = sqlite3.connect(path)
+        """Copy database to path with the SQLite backup API.
+
+        Works for every kind of store (files, ":memory:", "file:" URIs and
+        shared in-memory databases) and includes WAL content that has not
+        been checkpointed yet.
+        """
+        dst = sqlite3.connect(path)
+        try:
             self._conn.backup(dst)
+        finally:
             dst.close()
-        else:
-            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
-            shutil.copy2(self.db_path, path)
+
+    def copy(self) -> "SQLiteStore":
+        """In-memory copy of this store, made with the SQLite backup API.
+
+        Lets an expensive state (e.g. many consolidation cycles) be built
+        once and handed out as independent copies.
+        """
+        clone = SQLiteStore()
+        self._conn.backup(clone._conn)
+        return clone
 
     def stats(self) -> dict:
         total = self._conn.execute("SELECT COUNT(*) FROM memories").fetchone()[0]
@@ -278,30 +774,79 @@ class SQLiteStore:
             "total_accesses": access_count,
         }
 
+    def layer_stats(self) -> dict[str, dict]:
+        """Per-layer count, strength/importance averages and pinned count, in SQL.
+
+        Layers with no memories are omitted.
+        """
+        rows = self._conn.execute(
+            """SELECT layer, COUNT(*), AVG(working_strength), AVG(core_strength),
+                      AVG(importance), SUM(pinned)
+               FROM memories GROUP BY layer"""
+        ).fetchall()
+        return {
+            layer: {"count": count, "avg_working": avg_working, "avg_core": avg_core,
+                    "avg_importance": avg_importance, "pinned": pinned}
+            for layer, count, avg_working, avg_core, avg_importance, pinned in rows
+        }
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM memories").fetchone()[0]
+
+    def total_strength(self, exclude_pinned: bool = True) -> float:
+        """Sum of working + core strength, aggregated in SQL."""
+        sql = "SELECT COALESCE(SUM(working_strength + core_strength), 0) FROM memories"
+        if exclude_pinned:
+            sql += " WHERE pinned = 0"
+        return self._conn.execute(sql).fetchone()[0]
+
     # ── Graph link methods ──────────────────────────────────────
 
     def add_graph_link(self, memory_id: str, entity: str, relation: str = ""):
         """Link a memory to an entity node."""
         self._conn.execute(
-            "INSERT INTO graph_links (memory_id, node_id, relation) VALUES (?,?,?)",
+            _INSERT_GRAPH_LINK,
             (memory_id, entity, relation),
         )
         self._conn.commit()
+        self._data_version += 1
 
     def remove_graph_links(self, memory_id: str):
         """Remove all graph links for a memory."""
         self._conn.execute("DELETE FROM graph_links WHERE memory_id=?", (memory_id,))
         self._conn.commit()
+        self._data_version += 1
 
     def search_by_entity(self, entity: str) -> list[MemoryEntry]:
         """Find all memories linked to an entity."""
-        rows = self._conn.execute(
-            """SELECT m.* FROM memories m
+        return self._fetch_entries(
+            f"""{_SELECT_ENTRIES}
                JOIN graph_links g ON m.id = g.memory_id
                WHERE g.node_id = ?""",
             (entity,),
-        ).fetchall()
-        return [_row_to_entry(r, self.get_access_times(r["id"])) for r in rows]
+        )
+
+    def search_by_entities(self, entities: list[str]) -> dict[str, list[MemoryEntry]]:
+        """search_by_entity() for several entities in one query.
+
+        Every requested entity gets a key, with [] when nothing links to it.
+        """
+        by_entity: dict[str, list[MemoryEntry]] = {e: [] for e in entities}
+        if not by_entity:
+            return by_entity
+        placeholders = ",".join("?" * len(by_entity))
+        cursor = self._conn.cursor()
+        cursor.row_factory = None
+        rows = cursor.execute(
+            f"""SELECT g.node_id, {_ENTRY_COLUMNS}
+               FROM memories m
+               JOIN graph_links g ON m.id = g.memory_id
+               WHERE g.node_id IN ({placeholders})""",
+            list(by_entity),
+        )
+        for row in rows:
+            by_entity[row[0]].append(_row_to_entry(row[1:]))
+        return by_entity
 
     def get_entities(self, memory_id: str) -> list[tuple[str, str]]:
         """Get all (entity, relation) pairs for a memory."""
@@ -346,7 +891,59 @@ class SQLiteStore:
         visited.discard(entity)
         return list(visited)
 
+    def expand_memories_via_entities(self, memory_ids: list[str], hops: int = 1,
+                                     types: Optional[list[str]] = None,
+                                     layers: Optional[list[str]] = None,
+                                     time_range: Optional[tuple[float, float]] = None,
+                                     min_confidence: float = 0.0) -> list[MemoryEntry]:
+        """Memories reachable from the given memories through the entity graph.
+
+        Takes the entities linked to ``memory_ids``, expands them by ``hops``
+        (entities sharing a memory are one hop apart, as in
+        get_related_entities), and returns every memory linked to the
+        expanded entity set that passes the filters, excluding
+        ``memory_ids`` themselves. One query.
+        """
+        if not memory_ids:
+            return []
+        ids = json.dumps(list(dict.fromkeys(memory_ids)))
+        filters, params = _filter_clause(types, layers, time_range, min_confidence)
+        return self._fetch_entries(
+            f"""WITH RECURSIVE expanded(node_id, depth) AS (
+                    SELECT node_id, 0 FROM graph_links WHERE memory_id IN {_ID_LIST}
+                    UNION
+                    SELECT g2.node_id, e.depth + 1 FROM expanded e
+                    JOIN graph_links g1 ON g1.node_id = e.node_id
+                    JOIN graph_links g2 ON g2.memory_id = g1.memory_id
+                    WHERE e.depth < ?
+                )
+                {_SELECT_ENTRIES}
+                WHERE m.id IN (
+                    SELECT memory_id FROM graph_links
+                    WHERE node_id IN (SELECT node_id FROM expanded)
+                ) AND m.id NOT IN {_ID_LIST}{filters}""",
+            (ids, hops, ids, *params),
+        )
+
+    def maintenance(self):
+        """Compact the FTS index, refresh planner stats and truncate the WAL.
+
+        Merges the FTS5 b-tree segments left by many small inserts into
+        one, then runs PRAGMA optimize. For file databases the WAL is
+        checkpointed and truncated so it doesn't keep its high-water size.
+        """
+        self._conn.execute("INSERT INTO memories_fts(memories_fts) VALUES ('optimize')")
+        self._conn.commit()
+        self._conn.execute("PRAGMA optimize")
+        if not _is_memory_path(self.db_path):
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
     def close(self):
+        try:
+            # Refresh planner stats for tables this connection queried heavily
+            self._conn.execute("PRAGMA optimize")
+        except sqlite3.Error:
+            pass  # already closed
         self._conn.close()
 
 
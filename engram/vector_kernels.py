@@ -0,0 +1,99 @@
+"""
+Compiled kernel for single-pair cosine similarity (optional numba).
+
+VectorStore.search scores whole matrices with NumPy/SimSIMD; this covers
+the scalar ``cosine_similarity()`` API. With numba installed the loop is
+JIT-compiled (dot product and both norms in one pass); without it, the
+pure-Python loop is used.
+
+Embedding-sized vectors get a kernel compiled for their exact length, so
+LLVM sees a constant trip count and can fully unroll/vectorize the loop.
+
+    pip install numba
+"""
+
+import functools
+import math
+
+import numpy as np
+
+try:
+    import numba
+    _numba_available = True
+except ImportError:
+    _numba_available = False
+
+
+def _cosine_python(a, b) -> float:
+    dot_product = sum(x * y for x, y in zip(a, b))
+    norm_a = math.sqrt(sum(x * x for x in a))
+    norm_b = math.sqrt(sum(x * x for x in b))
+
+    if norm_a == 0 or norm_b == 0:
+        return 0.0
+
+    return dot_product / (norm_a * norm_b)
+
+
+if _numba_available:
+    @numba.njit(cache=True, fastmath=True)
+    def _cosine_numba(a, b):
+        dot = 0.0
+        norm_a = 0.0
+        norm_b = 0.0
+        for i in range(a.shape[0]):
+            dot += a[i] * b[i]
+            norm_a += a[i] * a[i]
+            norm_b += b[i] * b[i]
+        if norm_a == 0.0 or norm_b == 0.0:
+            return 0.0
+        return dot / math.sqrt(norm_a * norm_b)
+
+
+# Lengths that get a fixed-size kernel (typical embedding dimensions);
+# each distinct length costs one compilation, so short vectors use the
+# generic kernel
+_SPECIALIZE_MIN_DIM = 64
+_SPECIALIZE_MAX_DIM = 4096
+
+
+@functools.lru_cache(maxsize=8)
+def cosine_kernel(dim: int):
+    """Numba cosine kernel with the vector length fixed at compile time."""
+    if not _numba_available:
+        return None
+
+    @numba.njit(fastmath=True)
+    def _cosine_fixed(a, b):
+        dot = 0.0
+        norm_a = 0.0
+        norm_b = 0.0
+        for i in range(dim):  # dim is a compile-time constant here
+            dot += a[i] * b[i]
+            norm_a += a[i] * a[i]
+            norm_b += b[i] * b[i]
+        if norm_a == 0.0 or norm_b == 0.0:
+            return 0.0
+        return dot / math.sqrt(norm_a * norm_b)
+
+    return _cosine_fixed
+
+
+def cosine(a, b) -> float:
+    """
+    Cosine similarity of two equal-length vectors.
+
+    Args:
+        a: Sequence or array of floats
+        b: Sequence or array of floats, same length as a
+
+    Returns:
+        Similarity in [-1, 1] (0.0 if either vector is all zeros)
+    """
+    if _numba_available:
+        a = np.ascontiguousarray(a, dtype=np.float64)
+        b = np.ascontiguousarray(b, dtype=np.float64)
+        if _SPECIALIZE_MIN_DIM <= a.shape[0] <= _SPECIALIZE_MAX_DIM:
+            return float(cosine_kernel(a.shape[0])(a, b))
+        return float(_cosine_numba(a, b))
+    return _cosine_python(a, b)
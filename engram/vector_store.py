@@ -1,51 +1,196 @@
 """
 Simple vector store for embedding-based retrieval.
 
-Uses SQLite for storage and Python for cosine similarity.
-For production, consider sqlite-vec, pgvector, or dedicated vector DBs.
+Uses SQLite for storage (raw little-endian float32 BLOBs) and NumPy for
+cosine similarity.
+
+If the sqlite-vec extension is installed, vectors are mirrored into a vec0
+virtual table and k-nearest-neighbour search runs inside SQLite instead.
+Otherwise the matrix scan uses SimSIMD's cosine kernel when available, or
+runs on a GPU with ``VectorStore(device="cuda")`` (requires PyTorch):
+
+    pip install sqlite-vec   # or: pip install simsimd / torch
+
+For larger deployments, consider pgvector or dedicated vector DBs.
 """
 
 import json
-import math
+import os
 import sqlite3
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Literal, Optional
+
+import numpy as np
 
 from engram.embeddings.base import EmbeddingAdapter
+from engram.vector_kernels import cosine
+
+try:
+    import sqlite_vec
+    _sqlite_vec_available = True
+except ImportError:
+    _sqlite_vec_available = False
+
+try:
+    import simsimd
+    _simsimd_available = True
+except ImportError:
+    _simsimd_available = False
+
+try:
+    import torch
+    _torch_available = True
+except ImportError:
+    _torch_available = False
+
+# On-disk vector format: raw little-endian float32
+_EMBEDDING_DTYPE = np.dtype("<f4")
+
+# Below this many stored vectors the exact in-process scan is used even when
+# sqlite-vec is available (it is cached and faster at small N)
+BRUTE_FORCE_THRESHOLD = 10_000
+
+# Matrices with at least this many rows are scored in parallel row segments;
+# NumPy/BLAS and SimSIMD release the GIL, so the segments run concurrently
+PARALLEL_MIN_ROWS = 50_000
+_SEGMENT_WORKERS = max(1, (os.cpu_count() or 2) // 2)
+_segment_pool: Optional[ThreadPoolExecutor] = None
+
+# Rows per fetchmany() when loading the matrix
+_LOAD_CHUNK_ROWS = 4096
+
+# Element types for memory_embeddings.dtype (quantized storage)
+_QUANT_DTYPES = {"f32": np.dtype("<f4"), "f16": np.dtype("<f2"), "i8": np.dtype("i1")}
+
+
+def encode_embedding(embedding) -> bytes:
+    """Serialize a vector to the BLOB stored in memory_embeddings."""
+    return np.ascontiguousarray(embedding, dtype=_EMBEDDING_DTYPE).tobytes()
+
+
+def quantize_embedding(embedding, quantize: str = "f32") -> tuple[np.ndarray, float]:
+    """
+    Convert a float vector to the storage element type.
+    
+    i8 uses a symmetric per-vector scale (max |v| / 127); the returned
+    scale multiplies the int8 values back to floats. f32/f16 use scale 1.
+    """
+    values, scales = quantize_embeddings(np.asarray(embedding, dtype=np.float32)[None, :], quantize)
+    return values[0], float(scales[0])
+
+
+def quantize_embeddings(matrix, quantize: str = "f32") -> tuple[np.ndarray, np.ndarray]:
+    """Row-wise quantize_embedding() over a (k, D) matrix; returns (values, scales)."""
+    matrix = np.asarray(matrix, dtype=np.float32)
+    if quantize == "i8":
+        if matrix.shape[1]:
+            peaks = np.abs(matrix).max(axis=1).astype(np.float64)
+        else:
+            peaks = np.zeros(matrix.shape[0])
+        scales = np.where(peaks > 0, peaks / 127.0, 1.0)
+        return np.round(matrix / scales[:, None]).astype(np.int8), scales
+    return matrix.astype(_QUANT_DTYPES[quantize]), np.ones(matrix.shape[0])
+
+
+def normalize_embedding(embedding) -> np.ndarray:
+    """L2-normalize a vector to float32 (zero vectors are returned unchanged)."""
+    vec = np.array(embedding, dtype=np.float32)
+    norm = np.linalg.norm(vec)
+    if norm > 0:
+        vec /= norm
+    return vec
+
+
+def decode_embedding(value, dtype: str = "f32", scale: float = 1.0) -> np.ndarray:
+    """Deserialize a stored vector to float32 (legacy rows are JSON text)."""
+    if isinstance(value, str):
+        return np.asarray(json.loads(value), dtype=_EMBEDDING_DTYPE)
+    vec = np.frombuffer(value, dtype=_QUANT_DTYPES[dtype])
+    if dtype == "f32":
+        return vec  # zero-copy
+    return vec.astype(np.float32) * np.float32(scale)
 
 
 def cosine_similarity(a: list[float], b: list[float]) -> float:
     """Compute cosine similarity between two vectors."""
     if len(a) != len(b):
         return 0.0
-    
-    dot_product = sum(x * y for x, y in zip(a, b))
-    norm_a = math.sqrt(sum(x * x for x in a))
-    norm_b = math.sqrt(sum(x * x for x in b))
-    
-    if norm_a == 0 or norm_b == 0:
-        return 0.0
-    
-    return dot_product / (norm_a * norm_b)
+    return cosine(a, b)
+
+
+def _segment_similarities(matrix: np.ndarray, query: np.ndarray) -> np.ndarray:
+    """Cosine of a unit query (already in the matrix's element type) per row."""
+    if _simsimd_available:
+        # cdist returns cosine distance; zero rows come back as 1.0 (sim 0)
+        dist = simsimd.cdist(query[None, :], matrix, metric="cos")
+        return 1.0 - np.asarray(dist, dtype=np.float32).ravel()
+    # Unit vectors on both sides: the dot product is the cosine. A per-row
+    # early exit on the Cauchy-Schwarz bound (stop once the remaining
+    # suffix cannot reach min_similarity) was measured at ~6x slower than
+    # this single sgemv at 100k x 384: rows only fail the bound after most
+    # of their elements are read, and the branch defeats vectorization.
+    return matrix @ query
 
 
 class VectorStore:
     """
     Simple vector store backed by SQLite.
     
-    Stores embeddings as JSON and computes similarity in Python.
+    Stores embeddings as float32 BLOBs and computes similarity with NumPy.
     Not optimized for large scale, but works well for <100k memories.
+    
+    All vectors must have the adapter's ``dimension`` (when it reports one);
+    mismatched vectors are rejected on insert. Vectors are L2-normalized
+    before storage, so cosine similarity is a plain dot product.
+    
+    ``quantize="f16"`` or ``"i8"`` stores 2 or 1 bytes per element instead of
+    4. With SimSIMD installed the scan also runs on the quantized matrix;
+    otherwise rows are widened to float32 once when the matrix is loaded.
     """
     
-    def __init__(self, conn: sqlite3.Connection, adapter: EmbeddingAdapter):
+    def __init__(self, conn: sqlite3.Connection, adapter: EmbeddingAdapter,
+                 quantize: Literal["f32", "f16", "i8"] = "f32",
+                 brute_force_threshold: int = BRUTE_FORCE_THRESHOLD,
+                 device: Optional[str] = None):
         """
         Initialize vector store.
         
         Args:
-            conn: SQLite connection (shared with MemoryStore)
+            conn: SQLite connection (shared with MemoryStore); its PRAGMAs
+                are left as the owner configured them
             adapter: Embedding adapter to use
+            quantize: Storage element type for new embeddings
+            brute_force_threshold: Use sqlite-vec (when loaded) only once
+                this many embeddings are stored
+            device: PyTorch device ("cuda", "cuda:1", ...) to run the scan on;
+                None keeps it on the CPU
         """
+        if quantize not in _QUANT_DTYPES:
+            raise ValueError(f"quantize must be one of {sorted(_QUANT_DTYPES)}, got {quantize!r}")
         self.conn = conn
         self.adapter = adapter
+        if device is not None and not _torch_available:
+            raise ImportError(
+                "VectorStore(device=...) requires PyTorch. Install with: pip install torch"
+            )
+        self.quantize = quantize
+        self.brute_force_threshold = brute_force_threshold
+        self.device = device
+        # Device copy of _matrix, rebuilt on the next search after any change
+        self._device_matrix = None
+        # In-memory mirror of memory_embeddings: unit vectors (float32, or the
+        # quantized type for SimSIMD) in a growable buffer whose first
+        # len(_ids) rows are live. Loaded on the first search, then kept in
+        # step by add/add_batch/delete; _dirty forces a reload from SQLite.
+        self._buffer: Optional[np.ndarray] = None
+        self._ids: list[str] = []
+        self._row_of: dict[str, int] = {}
+        self._dirty = True
+        # PRAGMA data_version as of the last load; commits from other
+        # connections change it, and the next search reloads
+        self._loaded_version: Optional[int] = None
+        # True once the sqlite-vec vec_memory table is loaded and in sync
+        self._use_vec = False
         self._init_tables()
     
     def _init_tables(self):
@@ -53,11 +198,209 @@ class VectorStore:
         self.conn.execute("""
             CREATE TABLE IF NOT EXISTS memory_embeddings (
                 memory_id TEXT PRIMARY KEY,
-                embedding TEXT NOT NULL,
+                embedding BLOB NOT NULL,
+                dtype TEXT NOT NULL DEFAULT 'f32',
+                scale REAL NOT NULL DEFAULT 1.0,
                 FOREIGN KEY (memory_id) REFERENCES memories(id)
             )
         """)
+        # Tables created before quantized storage existed
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(memory_embeddings)")}
+        if "dtype" not in columns:
+            self.conn.execute(
+                "ALTER TABLE memory_embeddings ADD COLUMN dtype TEXT NOT NULL DEFAULT 'f32'"
+            )
+        if "scale" not in columns:
+            self.conn.execute(
+                "ALTER TABLE memory_embeddings ADD COLUMN scale REAL NOT NULL DEFAULT 1.0"
+            )
         self.conn.commit()
+        # vec0 holds float32 only; quantized stores keep the in-process scan
+        if self.quantize == "f32":
+            self._init_vec_table()
+    
+    def _init_vec_table(self):
+        """Load sqlite-vec and mirror embeddings into a vec0 table, if possible."""
+        dimension = getattr(self.adapter, "dimension", 0) or 0
+        if not _sqlite_vec_available or not dimension:
+            return
+        try:
+            self.conn.enable_load_extension(True)
+            sqlite_vec.load(self.conn)
+            self.conn.enable_load_extension(False)
+            self.conn.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS vec_memory USING vec0("
+                f"memory_id TEXT PRIMARY KEY, embedding float[{int(dimension)}])"
+            )
+            # Backfill rows written without the extension (legacy JSON rows
+            # are picked up after migrate_json_embeddings())
+            self.conn.execute("""
+                INSERT INTO vec_memory (memory_id, embedding)
+                SELECT memory_id, embedding FROM memory_embeddings
+                WHERE typeof(embedding) = 'blob' AND dtype = 'f32' AND length(embedding) = ?
+                  AND memory_id NOT IN (SELECT memory_id FROM vec_memory)
+            """, (4 * int(dimension),))
+            self.conn.commit()
+        except (AttributeError, sqlite3.Error):
+            # Python built without extension loading, or incompatible SQLite
+            return
+        self._use_vec = True
+    
+    def _vec_upsert(self, rows: list[tuple[str, bytes]]):
+        """Mirror (memory_id, blob) rows into vec_memory (vec0 has no REPLACE)."""
+        self.conn.executemany(
+            "DELETE FROM vec_memory WHERE memory_id = ?", [(mid,) for mid, _ in rows]
+        )
+        self.conn.executemany(
+            "INSERT INTO vec_memory (memory_id, embedding) VALUES (?, ?)", rows
+        )
+    
+    def invalidate(self):
+        """Drop the cached embedding matrix; the next search reloads it."""
+        self._buffer = None
+        self._ids = []
+        self._row_of = {}
+        self._dirty = True
+        self._device_matrix = None
+    
+    def _data_version(self) -> int:
+        """PRAGMA data_version: changes whenever another connection commits to the database."""
+        return self.conn.execute("PRAGMA data_version").fetchone()[0]
+    
+    @property
+    def _matrix(self) -> Optional[np.ndarray]:
+        """Live (N, D) view of the cached buffer."""
+        if self._buffer is None:
+            return None
+        return self._buffer[:len(self._ids)]
+    
+    def _scan_rows(self, units: np.ndarray) -> np.ndarray:
+        """Convert float32 unit rows to the element type the scan runs on."""
+        if self.quantize == "f32" or not _simsimd_available:
+            return units
+        # Per-row i8 scales cancel in cosine
+        return quantize_embeddings(units, self.quantize)[0]
+    
+    def _cache_upsert(self, memory_ids: list[str], units: np.ndarray):
+        """Overwrite or append rows in the loaded matrix (amortized doubling)."""
+        if self._dirty or self._buffer is None or units.shape[1] != self._buffer.shape[1]:
+            return  # next search reloads everything anyway
+        self._device_matrix = None
+        rows = self._scan_rows(units)
+        for memory_id, row in zip(memory_ids, rows):
+            i = self._row_of.get(memory_id)
+            if i is None:
+                i = len(self._ids)
+                if i == self._buffer.shape[0]:
+                    grown = np.zeros((max(16, 2 * i), self._buffer.shape[1]), dtype=self._buffer.dtype)
+                    grown[:i] = self._buffer
+                    self._buffer = grown
+                self._ids.append(memory_id)
+                self._row_of[memory_id] = i
+            self._buffer[i] = row
+    
+    def _cache_remove(self, memory_id: str):
+        """Drop one row from the loaded matrix by moving the last row into its slot."""
+        i = self._row_of.pop(memory_id, None)
+        if i is None or self._dirty:
+            return
+        self._device_matrix = None
+        last = len(self._ids) - 1
+        if i != last:
+            moved = self._ids[last]
+            self._buffer[i] = self._buffer[last]
+            self._ids[i] = moved
+            self._row_of[moved] = i
+        self._ids.pop()
+    
+    def _load_matrix(self, dimension: int):
+        """Load every stored vector into the cached matrix."""
+        # Taken before reading, so a commit that lands mid-load forces another
+        self._loaded_version = self._data_version()
+        count = self.conn.execute("SELECT COUNT(*) FROM memory_embeddings").fetchone()[0]
+        # Rows of another dimension stay zero and score 0, as
+        # cosine_similarity() does for mismatched lengths
+        matrix = np.zeros((count, dimension), dtype=np.float32)
+        ids: list[str] = []
+        
+        # Stream rows straight into the preallocated matrix rather than
+        # materializing every (id, blob) tuple with fetchall()
+        cursor = self.conn.execute(
+            "SELECT memory_id, embedding, dtype, scale FROM memory_embeddings"
+        )
+        row_bytes = 4 * dimension
+        while True:
+            chunk = cursor.fetchmany(_LOAD_CHUNK_ROWS)
+            if not chunk:
+                break
+            for memory_id, value, dtype, scale in chunk:
+                i = len(ids)
+                if i == matrix.shape[0]:  # rows added since the COUNT
+                    grown = np.zeros((max(16, 2 * i), dimension), dtype=np.float32)
+                    grown[:i] = matrix
+                    matrix = grown
+                if dtype == "f32" and isinstance(value, bytes) and len(value) == row_bytes:
+                    matrix[i] = np.frombuffer(value, dtype=_EMBEDDING_DTYPE)
+                else:
+                    vec = decode_embedding(value, dtype, scale)
+                    if vec.size == dimension:
+                        matrix[i] = vec
+                ids.append(memory_id)
+        matrix = matrix[:len(ids)]
+        
+        # Rows written before normalization was introduced (and dequantized
+        # rows) are rescaled here, once per load rather than once per query
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        np.divide(matrix, norms, out=matrix, where=norms > 0)
+        self._buffer = self._scan_rows(matrix)
+        self._ids = ids
+        self._row_of = {memory_id: i for i, memory_id in enumerate(self._ids)}
+        self._dirty = False
+        self._device_matrix = None
+    
+    def _encode_rows(self, memory_ids: list[str], embeddings) -> tuple[list[tuple], np.ndarray]:
+        """
+        Validate dimensions, normalize and quantize embeddings.
+        
+        Returns:
+            (memory_embeddings rows, (k, D) float32 unit vectors)
+        """
+        expected = getattr(self.adapter, "dimension", 0) or 0
+        sizes = {len(embedding) for embedding in embeddings}
+        if expected and sizes - {expected}:
+            raise ValueError(
+                f"Embedding has dimension {min(sizes - {expected})}, adapter declares {expected}"
+            )
+        if len(sizes) != 1:
+            # Mixed sizes (adapter without a fixed dimension): row by row, not cacheable
+            rows = []
+            for memory_id, embedding in zip(memory_ids, embeddings):
+                values, scale = quantize_embedding(normalize_embedding(embedding), self.quantize)
+                rows.append((memory_id, values.tobytes(), self.quantize, scale))
+            return rows, np.empty((0, 0), dtype=np.float32)
+        
+        # One contiguous (k, D) array: normalize, quantize and serialize in bulk
+        units = np.array(embeddings, dtype=np.float32)
+        norms = np.linalg.norm(units, axis=1, keepdims=True)
+        np.divide(units, norms, out=units, where=norms > 0)
+        values, scales = quantize_embeddings(units, self.quantize)
+        blob = values.tobytes()
+        step = values.itemsize * values.shape[1]
+        rows = [
+            (memory_id, blob[i * step:(i + 1) * step], self.quantize, scale)
+            for i, (memory_id, scale) in enumerate(zip(memory_ids, scales.tolist()))
+        ]
+        return rows, units
+    
+    def _write_rows(self, rows: list[tuple[str, bytes, str, float]]):
+        """Upsert encoded rows (and their vec0 mirror) without committing."""
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO memory_embeddings (memory_id, embedding, dtype, scale) "
+            "VALUES (?, ?, ?, ?)",
+            rows
+        )
+        if self._use_vec:
+            self._vec_upsert([(memory_id, blob) for memory_id, blob, _, _ in rows])
     
     def add(self, memory_id: str, text: str):
         """
@@ -68,32 +411,58 @@ class VectorStore:
             text: Text to embed
         """
         embedding = self.adapter.embed([text])[0]
-        self.conn.execute(
-            "INSERT OR REPLACE INTO memory_embeddings (memory_id, embedding) VALUES (?, ?)",
-            (memory_id, json.dumps(embedding))
-        )
+        rows, units = self._encode_rows([memory_id], [embedding])
+        self._write_rows(rows)
         self.conn.commit()
+        self._cache_upsert([memory_id], units)
     
-    def add_batch(self, items: list[tuple[str, str]]):
+    def add_batch(self, memory_ids: list, texts: Optional[list[str]] = None,
+                  commit: bool = True):
         """
         Add embeddings for multiple memories.
         
         Args:
-            items: List of (memory_id, text) tuples
+            memory_ids: IDs of the memories, parallel to ``texts``.
+                For compatibility, a single list of (memory_id, text)
+                tuples is also accepted when ``texts`` is omitted.
+            texts: Texts to embed
+            commit: Commit after writing. Pass False to group several
+                batches into one transaction; the caller then commits
+                (or rolls back and calls invalidate()).
         """
-        if not items:
+        if texts is None:
+            items = memory_ids
+            memory_ids = [item[0] for item in items]
+            texts = [item[1] for item in items]
+        if len(memory_ids) != len(texts):
+            raise ValueError("memory_ids and texts must have the same length")
+        if not memory_ids:
             return
         
-        memory_ids = [item[0] for item in items]
-        texts = [item[1] for item in items]
+        self.add_embeddings(memory_ids, self.adapter.embed(texts), commit=commit)
+    
+    def add_embeddings(self, memory_ids: list[str], embeddings, commit: bool = True):
+        """
+        Store precomputed embeddings (e.g. produced on another thread).
         
-        embeddings = self.adapter.embed(texts)
+        Args:
+            memory_ids: IDs of the memories
+            embeddings: One vector per ID, as returned by ``adapter.embed``
+            commit: Commit after writing (see add_batch)
+        """
+        if len(memory_ids) != len(embeddings):
+            raise ValueError("memory_ids and embeddings must have the same length")
+        if not len(memory_ids):
+            return
         
-        self.conn.executemany(
-            "INSERT OR REPLACE INTO memory_embeddings (memory_id, embedding) VALUES (?, ?)",
-            [(mid, json.dumps(emb)) for mid, emb in zip(memory_ids, embeddings)]
-        )
-        self.conn.commit()
+        rows, units = self._encode_rows(memory_ids, embeddings)
+        self._write_rows(rows)
+        if commit:
+            self.conn.commit()
+        if units.shape[0] == len(memory_ids):
+            self._cache_upsert(memory_ids, units)
+        else:
+            self.invalidate()
     
     def search(
         self,
@@ -112,24 +481,104 @@ class VectorStore:
         Returns:
             List of (memory_id, similarity_score) tuples, sorted by similarity
         """
-        query_embedding = self.adapter.embed_query(query)
+        query_vec = normalize_embedding(self.adapter.embed_query(query))
+        if limit <= 0:
+            return []
+        if not self._dirty and self._data_version() != self._loaded_version:
+            self.invalidate()  # embeddings written through another connection
+        if self._use_vec and self._stored_count() >= self.brute_force_threshold:
+            return self._search_vec(query_vec, limit, min_similarity)
+        
+        if self._dirty or self._buffer.shape[1] != query_vec.size:
+            self._load_matrix(query_vec.size)
+        n = len(self._ids)
+        if n == 0:
+            return []
+        if self.device is not None:
+            return self._search_device(query_vec, limit, min_similarity)
+        
+        sims = self._similarities(query_vec)
+        
+        # Threshold first, then top-k without a full sort: O(N + k log k)
+        if min_similarity > -1.0:
+            candidates = np.flatnonzero(sims >= min_similarity)
+        else:
+            candidates = np.arange(n)
+        if len(candidates) > limit:
+            candidates = candidates[np.argpartition(-sims[candidates], limit - 1)[:limit]]
+        top = candidates[np.argsort(-sims[candidates], kind="stable")]
         
-        # Get all embeddings (not efficient for large scale, but simple)
+        return [(self._ids[i], similarity) for i, similarity in zip(top.tolist(), sims[top].tolist())]
+    
+    def _search_device(self, query_vec: np.ndarray, limit: int,
+                       min_similarity: float) -> list[tuple[str, float]]:
+        """Matrix-vector product and top-k on the configured PyTorch device."""
+        if self._device_matrix is None:
+            matrix = self._matrix
+            if matrix.dtype == np.int8:
+                # int8 scan rows carry per-row scales; renormalize for a plain dot
+                matrix = matrix.astype(np.float32)
+                norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+                np.divide(matrix, norms, out=matrix, where=norms > 0)
+            device_matrix = torch.from_numpy(np.ascontiguousarray(matrix, dtype=np.float32))
+            device_matrix = device_matrix.to(self.device)
+            # Half precision doubles effective bandwidth on Ampere and newer
+            if device_matrix.is_cuda and torch.cuda.get_device_capability(device_matrix.device)[0] >= 8:
+                device_matrix = device_matrix.half()
+            self._device_matrix = device_matrix
+        
+        query = torch.from_numpy(query_vec).to(self._device_matrix.device,
+                                               dtype=self._device_matrix.dtype)
+        sims = self._device_matrix @ query
+        values, indices = sims.topk(min(limit, sims.shape[0]))
+        return [
+            (self._ids[i], float(similarity))
+            for similarity, i in zip(values.float().cpu().tolist(), indices.cpu().tolist())
+            if similarity >= min_similarity
+        ]
+    
+    def _stored_count(self) -> int:
+        """Row count, from the loaded matrix when possible."""
+        if not self._dirty:
+            return len(self._ids)
+        return self.count()
+    
+    def _similarities(self, query_vec: np.ndarray) -> np.ndarray:
+        """Cosine of the unit query against every cached row."""
+        matrix = self._matrix
+        query = query_vec
+        if _simsimd_available:
+            if matrix.dtype == np.int8:
+                query, _ = quantize_embedding(query_vec, "i8")
+            elif matrix.dtype == np.float16:
+                query = query_vec.astype(np.float16)
+        
+        if matrix.shape[0] < PARALLEL_MIN_ROWS or _SEGMENT_WORKERS < 2:
+            return _segment_similarities(matrix, query)
+        
+        global _segment_pool
+        if _segment_pool is None:
+            _segment_pool = ThreadPoolExecutor(max_workers=_SEGMENT_WORKERS,
+                                               thread_name_prefix="engram-vector")
+        segments = np.array_split(matrix, _SEGMENT_WORKERS)  # contiguous row views
+        partials = _segment_pool.map(lambda segment: _segment_similarities(segment, query),
+                                     segments)
+        return np.concatenate(list(partials))
+    
+    def _search_vec(self, query_vec: np.ndarray, limit: int,
+                    min_similarity: float) -> list[tuple[str, float]]:
+        """KNN inside SQLite via vec0; L2 distance on unit vectors maps to cosine."""
         rows = self.conn.execute(
-            "SELECT memory_id, embedding FROM memory_embeddings"
+            "SELECT memory_id, distance FROM vec_memory "
+            "WHERE embedding MATCH ? AND k = ? ORDER BY distance",
+            (encode_embedding(query_vec), limit)
         ).fetchall()
-        
         results = []
-        for memory_id, embedding_json in rows:
-            embedding = json.loads(embedding_json)
-            similarity = cosine_similarity(query_embedding, embedding)
+        for memory_id, distance in rows:
+            similarity = 1.0 - distance * distance / 2.0
             if similarity >= min_similarity:
                 results.append((memory_id, similarity))
-        
-        # Sort by similarity descending
-        results.sort(key=lambda x: x[1], reverse=True)
-        
-        return results[:limit]
+        return results
     
     def delete(self, memory_id: str):
         """Delete embedding for a memory."""
@@ -137,7 +586,10 @@ class VectorStore:
             "DELETE FROM memory_embeddings WHERE memory_id = ?",
             (memory_id,)
         )
+        if self._use_vec:
+            self.conn.execute("DELETE FROM vec_memory WHERE memory_id = ?", (memory_id,))
         self.conn.commit()
+        self._cache_remove(memory_id)
     
     def has_embedding(self, memory_id: str) -> bool:
         """Check if a memory has an embedding."""
@@ -147,6 +599,37 @@ class VectorStore:
         ).fetchone()
         return row is not None
     
+    def embedded_ids(self) -> set[str]:
+        """IDs of all memories that have an embedding (one query)."""
+        return {row[0] for row in self.conn.execute("SELECT memory_id FROM memory_embeddings")}
+    
+    def migrate_json_embeddings(self) -> int:
+        """
+        Rewrite legacy JSON-text embeddings as normalized BLOBs in this
+        store's storage type.
+        
+        Returns:
+            Number of rows converted
+        """
+        rows = self.conn.execute(
+            "SELECT memory_id, embedding FROM memory_embeddings WHERE typeof(embedding) = 'text'"
+        ).fetchall()
+        converted = []
+        for memory_id, value in rows:
+            values, scale = quantize_embedding(normalize_embedding(json.loads(value)), self.quantize)
+            converted.append((values.tobytes(), self.quantize, scale, memory_id))
+        self.conn.executemany(
+            "UPDATE memory_embeddings SET embedding = ?, dtype = ?, scale = ? WHERE memory_id = ?",
+            converted
+        )
+        if self._use_vec:
+            size = 4 * self.adapter.dimension
+            self._vec_upsert([(memory_id, blob) for blob, _, _, memory_id in converted
+                              if len(blob) == size])
+        self.conn.commit()
+        self.invalidate()
+        return len(rows)
+    
     def count(self) -> int:
         """Count total embeddings stored."""
         row = self.conn.execute(
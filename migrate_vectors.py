@@ -3,12 +3,14 @@
 One-time migration: Generate embeddings for existing memories.
 
 Usage:
-    python3 migrate_vectors.py [--db-path PATH]
+    python3 migrate_vectors.py [--db-path PATH] [--encode-batch N] [--report-every N]
 """
 
 import argparse
+import queue
 import sys
 import os
+import threading
 from pathlib import Path
 
 # Add engram to path
@@ -18,18 +20,47 @@ from engram.memory import Memory
 from engram.embeddings import SentenceTransformerAdapter
 
 
-def migrate(db_path: str):
-    """Generate vectors for all memories without embeddings."""
+def _embed_in_background(adapter, ids: list[str], texts: list[str], batch_size: int,
+                         out: queue.Queue):
+    """
+    Producer: embed consecutive batches and hand them to the writer.
+    
+    Only the adapter runs on this thread; all SQLite writes stay on the
+    caller's thread, which owns the connection. Puts (ids, embeddings)
+    tuples, then None when done (or the exception that stopped it).
+    """
+    try:
+        for i in range(0, len(ids), batch_size):
+            out.put((ids[i:i+batch_size], adapter.embed(texts[i:i+batch_size])))
+        out.put(None)
+    except BaseException as exc:  # re-raised on the writer thread
+        out.put(exc)
+
+
+def migrate(db_path: str, encode_batch: int = 256, report_every: int = 50):
+    """
+    Generate vectors for all memories without embeddings.
+    
+    Args:
+        db_path: Path to the engram database
+        encode_batch: Texts per adapter.embed() call (throughput)
+        report_every: Rows written between progress lines (display only)
+    """
     print(f"🔧 Migrating database: {db_path}")
     
     # Initialize with embedding
     model_name = "paraphrase-multilingual-MiniLM-L12-v2"
     print(f"📦 Loading Sentence Transformers model ({model_name})...")
-    embedding = SentenceTransformerAdapter(model_name)
+    embedding = SentenceTransformerAdapter(model_name, batch_size=encode_batch)
     
     print("🧠 Initializing Memory with embedding support...")
     mem = Memory(db_path, embedding=embedding)
     
+    # Convert embeddings written by older versions (JSON text) to float32 BLOBs
+    converted = mem._vector_store.migrate_json_embeddings()
+    if converted:
+        print(f"🔁 Converted {converted} JSON embeddings to float32 BLOBs")
+    
     # Get all memories
     all_memories = mem._store.all()
     total = len(all_memories)
@@ -48,12 +79,15 @@ def migrate(db_path: str):
     
     # Find memories without embeddings
     print(f"\n🔍 Finding memories without embeddings...")
-    to_process = []
+    existing = mem._vector_store.embedded_ids()
+    ids: list[str] = []
+    texts: list[str] = []
     for entry in all_memories:
-        if not mem._vector_store.has_embedding(entry.id):
-            to_process.append((entry.id, entry.content))
+        if entry.id not in existing:
+            ids.append(entry.id)
+            texts.append(entry.content)
     
-    print(f"   Found {len(to_process)} memories to process")
+    print(f"   Found {len(ids)} memories to process")
     
     # Batch-generate vectors
     print(f"\n🚀 Generating vectors...")
@@ -61,22 +95,43 @@ def migrate(db_path: str):
     import time
     start = time.time()
     
-    # Process in batches of 50 for progress reporting
-    batch_size = 50
-    for i in range(0, len(to_process), batch_size):
-        batch = to_process[i:i+batch_size]
-        mem._vector_store.add_batch(batch)
-        
-        elapsed = time.time() - start
-        processed = min(i + batch_size, len(to_process))
-        rate = processed / elapsed if elapsed > 0 else 0
-        remaining = (len(to_process) - processed) / rate if rate > 0 else 0
-        print(f"  Progress: {processed}/{len(to_process)} ({rate:.1f} mem/sec, ~{remaining:.0f}s remaining)")
+    # Encode in large batches for throughput, report progress every
+    # report_every rows, and commit once at the end so the whole migration
+    # pays for a single WAL sync. The next batch is embedded on a worker
+    # thread while this one is written.
+    batches: queue.Queue = queue.Queue(maxsize=2)
+    producer = threading.Thread(
+        target=_embed_in_background,
+        args=(embedding, ids, texts, encode_batch, batches),
+        daemon=True,
+    )
+    producer.start()
+    processed = 0
+    while True:
+        item = batches.get()
+        if item is None:
+            break
+        if isinstance(item, BaseException):
+            raise item
+        batch_ids, batch_embeddings = item
+        # Write each encoded batch in report_every-sized slices
+        for j in range(0, len(batch_ids), report_every):
+            chunk_ids = batch_ids[j:j+report_every]
+            mem._vector_store.add_embeddings(
+                chunk_ids, batch_embeddings[j:j+report_every], commit=False
+            )
+            processed += len(chunk_ids)
+            
+            elapsed = time.time() - start
+            rate = processed / elapsed if elapsed > 0 else 0
+            remaining = (len(ids) - processed) / rate if rate > 0 else 0
+            print(f"  Progress: {processed}/{len(ids)} ({rate:.1f} mem/sec, ~{remaining:.0f}s remaining)")
+    mem._vector_store.conn.commit()
     
     elapsed = time.time() - start
     print(f"\n✅ Migration complete!")
-    print(f"   Updated: {len(to_process)} memories")
-    print(f"   Time: {elapsed:.2f}s ({len(to_process)/elapsed:.1f} mem/sec)")
+    print(f"   Updated: {len(ids)} memories")
+    print(f"   Time: {elapsed:.2f}s ({len(ids)/elapsed:.1f} mem/sec)")
     
     # Verify
     final_vector_count = mem._vector_store.count()
@@ -90,6 +145,18 @@ if __name__ == "__main__":
         default=os.environ.get("ENGRAM_DB_PATH", "/Users/potato/clawd/engram-memory.db"),
         help="Path to engram database",
     )
+    parser.add_argument(
+        "--encode-batch",
+        type=int,
+        default=256,
+        help="Texts per embedding call (default 256; GPUs benefit from 512-1024)",
+    )
+    parser.add_argument(
+        "--report-every",
+        type=int,
+        default=50,
+        help="Rows written between progress lines (default 50)",
+    )
     args = parser.parse_args()
     
-    migrate(args.db_path)
+    migrate(args.db_path, encode_batch=args.encode_batch, report_every=args.report_every)
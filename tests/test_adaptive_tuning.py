@@ -129,6 +129,16 @@ class TestAdaptiveTuner:
         # Lower threshold = more permissive = more negative
         assert config.min_activation < original_threshold
     
+    def test_adapt_does_not_leak_into_presets(self):
+        """Presets hand out fresh instances, so tuning one never changes the next."""
+        config = MemoryConfig.chatbot()
+        tuner = AdaptiveTuner(config, adaptation_rate=0.1, min_samples=10, adaptation_interval=0.0)
+        for _ in range(10):
+            tuner.record_recall([])
+        assert "min_activation" in tuner.adapt()
+        assert MemoryConfig.chatbot() is not config
+        assert MemoryConfig.chatbot().min_activation != config.min_activation
+    
     def test_adapt_high_forget_rate(self):
         """High forget rate should slow decay."""
         config = MemoryConfig.default()
@@ -128,10 +128,16 @@ class TestInputValidation:
         """Query longer than typical."""
         mem = Memory(":memory:")
         mem.add("Short memory", type="factual")
+        mem.add("Notes on the search engine", type="factual")
         
         long_query = "search " * 10000
+        start = time.perf_counter()
         results = mem.recall(long_query, limit=5)
+        elapsed = time.perf_counter() - start
         assert isinstance(results, list)
+        # Capped at config.max_query_tokens words; still matches
+        assert results and "search" in results[0]["content"]
+        assert elapsed < 1.0
 
     def test_importance_bounds(self):
         """Importance values at and beyond bounds."""
@@ -170,9 +176,10 @@ class TestScaleTesting:
         """Basic scale: 1000 memories."""
         mem = Memory(":memory:")
         
-        # Add 1000 memories
-        for i in range(1000):
-            mem.add(f"Memory number {i} with some content", type="factual")
+        # Add 1000 memories in one transaction
+        with mem.bulk():
+            for i in range(1000):
+                mem.add(f"Memory number {i} with some content", type="factual")
         
         stats = mem.stats()
         assert stats["total_memories"] == 1000
@@ -193,11 +200,13 @@ class TestScaleTesting:
         try:
             mem = Memory(db_path)
             
-            # Add 10000 memories in batches
-            for batch in range(100):
-                for i in range(100):
-                    idx = batch * 100 + i
-                    mem.add(f"Memory {idx}: batch {batch} item {i}", type="factual")
+            # Content built up front: this measures the store, not str.format
+            contents = [f"Memory {idx}: batch {idx // 100} item {idx % 100}"
+                        for idx in range(10000)]
+            # One transaction (and one commit) for all 10000 inserts
+            with mem.bulk():
+                for content in contents:
+                    mem.add(content, type="factual")
             
             stats = mem.stats()
             assert stats["total_memories"] == 10000
@@ -259,7 +268,7 @@ class TestConcurrency:
             
             # Concurrent reads
             def read_memories():
-                m = Memory(db_path)
+                m = Memory(db_path, read_only=True)
                 results = []
                 for _ in range(10):
                     r = m.recall("memory", limit=5)
@@ -297,19 +306,39 @@ class TestConcurrency:
         finally:
             os.unlink(db_path)
 
-    @pytest.mark.skip(reason="SQLite has known concurrency limitations - database locking expected")
+    def test_concurrent_bulk_writes(self):
+        """Threads writing whole transactions queue on the write lock."""
+        with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as f:
+            db_path = f.name
+
+        try:
+            def write_batch(thread_id):
+                m = Memory(db_path)
+                with m.bulk():
+                    for i in range(50):
+                        m.add(f"Thread {thread_id} bulk memory {i}", type="factual")
+                    # Reads inside the transaction see its own writes
+                    assert len(m) >= 50
+                m.close()
+                return 50
+
+            with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+                futures = [executor.submit(write_batch, i) for i in range(8)]
+                total = sum(f.result() for f in concurrent.futures.as_completed(futures))
+
+            mem = Memory(db_path)
+            assert total == len(mem) == 400
+            mem.close()
+        finally:
+            os.unlink(db_path)
+
     def test_read_write_interleaved(self):
         """
         Reads and writes happening simultaneously.
         
-        NOTE: This test documents a known SQLite limitation.
-        SQLite uses file-level locking, so concurrent writes from
-        different connections can cause "database is locked" errors.
-        
-        For production use with high concurrency, consider:
-        1. Using a single Memory instance per process
-        2. Connection pooling with WAL mode
-        3. Switching to a concurrent-safe backend (Postgres, etc.)
+        File databases run in WAL mode, so readers don't block the writer,
+        and busy_timeout makes a connection wait for the write lock instead
+        of raising "database is locked".
         """
         with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as f:
             db_path = f.name
@@ -352,8 +381,6 @@ class TestConcurrency:
             for t in threads:
                 t.join()
             
-            # With SQLite, some lock contention is expected
-            # This is documented behavior, not a bug
             assert len(errors) == 0, f"Errors: {errors}"
         finally:
             os.unlink(db_path)
@@ -502,13 +529,15 @@ class TestHebbianEdgeCases:
         mid1 = mem.add("A", type="factual")
         mid2 = mem.add("B", type="factual")
         
-        # Co-activate 100 times
-        for _ in range(100):
-            record_coactivation(mem._store, [mid1, mid2], threshold=3)
+        # Co-activate 100 times in one call
+        new_links = record_coactivation(mem._store, [mid1, mid2], threshold=3, times=100)
+        assert len(new_links) == 1
         
         # Link should exist with high strength
         links = get_all_hebbian_links(mem._store)
         # Should have bidirectional link, strength capped at 1.0
+        assert len(links) == 2
+        assert all(strength == 1.0 for _, _, strength in links)
 
 
 class TestRecovery:
@@ -543,6 +572,63 @@ class TestRecovery:
         finally:
             os.unlink(db_path)
 
+    def test_maintenance_runs(self):
+        """maintenance() keeps search working and truncates the WAL."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = os.path.join(tmpdir, "maint.db")
+            mem = Memory(db_path)
+            for i in range(50):
+                mem.add(f"Maintenance fact number {i}", type="factual")
+            mem.maintenance()
+
+            assert os.path.getsize(db_path + "-wal") == 0
+            assert len(mem.recall("maintenance fact", limit=5)) == 5
+            mem.close()
+
+        # In-memory databases have no WAL; still fine
+        mem = Memory(":memory:")
+        mem.add("Test", type="factual")
+        mem.maintenance()
+        assert len(mem) == 1
+
+    def test_read_only_memory(self):
+        """read_only=True recalls without writing and refuses writes."""
+        import sqlite3
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = os.path.join(tmpdir, "ro.db")
+            mem = Memory(db_path)
+            mid1 = mem.add("Read only fact one", type="factual")
+            mid2 = mem.add("Read only fact two", type="factual")
+            mid3 = mem.add("Unrelated note about gardening", type="factual")
+            # Formed links pull neighbours into recall via graph expansion
+            record_coactivation(mem._store, [mid1, mid3], threshold=2, times=2)
+            mem.close()
+
+            ro = Memory(db_path, read_only=True)
+            before = ro._store.stats()["total_accesses"]
+            links = get_all_hebbian_links(ro._store)
+            assert len(links) == 2
+            results = ro.recall("read only fact")
+            assert {r["id"] for r in results} == {mid1, mid2, mid3}
+            assert ro._store.stats()["total_accesses"] == before
+            assert get_all_hebbian_links(ro._store) == links
+            with pytest.raises(sqlite3.OperationalError):
+                ro.add("Should fail", type="factual")
+            assert len(ro) == 3
+
+            # Embedding path: vector candidates and Hebbian neighbours
+            from engram.hybrid_search import HybridSearchEngine
+
+            class StubVectors:
+                def search(self, query, limit=10, min_similarity=0.0):
+                    return [(mid2, 0.9), (mid1, 0.8)]
+
+            engine = HybridSearchEngine(ro._store, StubVectors(), result_ttl=0)
+            hybrid = engine.search("fact", limit=10)
+            assert {r.entry.id for r in hybrid} == {mid1, mid2, mid3}
+            assert ro._store.stats()["total_accesses"] == before
+            ro.close()
+
     def test_readonly_mode(self):
         """Opening in read-only filesystem situation."""
         # This is hard to test portably, skip for now
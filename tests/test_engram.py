@@ -19,7 +19,8 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 from engram.core import MemoryEntry, MemoryStore, MemoryType, MemoryLayer, DEFAULT_DECAY_RATES
 from engram.store import SQLiteStore
 from engram.activation import (
-    base_level_activation, spreading_activation, retrieval_activation, retrieve_top_k
+    base_level_activation, spreading_activation, retrieval_activation, retrieve_top_k,
+    retrieval_activation_batch,
 )
 from engram.consolidation import (
     consolidate_single, run_consolidation_cycle, apply_decay,
@@ -45,6 +46,8 @@ SqlMemoryLayer = mc.MemoryLayer
 PASSED = 0
 FAILED = 0
 ERRORS = []
+# ENGRAM_TEST_QUIET=1: print only failures and the summary
+QUIET = os.environ.get("ENGRAM_TEST_QUIET") == "1"
 
 
 def run_test(name, fn):
@@ -52,7 +55,8 @@ def run_test(name, fn):
     try:
         fn()
         PASSED += 1
-        print(f"  ✅ {name}")
+        if not QUIET:
+            print(f"  ✅ {name}")
     except Exception as e:
         FAILED += 1
         ERRORS.append((name, e))
@@ -74,6 +78,70 @@ def test_sqlite_add_and_get():
     assert fetched.importance == 0.5
     store.close()
 
+def test_sqlite_add_batch():
+    store = SQLiteStore()
+    entries = store.add_batch([
+        {"content": "alice works at acme", "entities": [("alice", "person"), "acme"]},
+        {"content": "bob likes tea", "memory_type": SqlMemoryType.OPINION,
+         "importance": 0.9, "created_at": 1000.0},
+    ])
+    assert [e.content for e in entries] == ["alice works at acme", "bob likes tea"]
+    bob = store.get(entries[1].id)
+    assert bob.memory_type == SqlMemoryType.OPINION and bob.importance == 0.9
+    assert bob.created_at == 1000.0 and bob.access_times[0] == 1000.0
+    assert store.get_entities(entries[0].id) == [("alice", "person"), ("acme", "")]
+    assert store.search_fts("tea")[0].id == entries[1].id
+    assert store.add_batch([]) == []
+
+def test_sqlite_uri_shared_memory():
+    uri = "file:engram_uri_test?mode=memory&cache=shared"
+    first = SQLiteStore(uri)
+    m = first.add("shared in-memory database")
+    second = SQLiteStore(uri)
+    assert second.get(m.id).content == "shared in-memory database"
+    assert not os.path.exists("file:engram_uri_test?mode=memory&cache=shared")
+    second.close()
+    first.close()
+
+def test_sqlite_export_uri():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        export_path = os.path.join(tmpdir, "export.db")
+        # Shared in-memory URI: no file to copy
+        store = SQLiteStore("file:engram_export_test?mode=memory&cache=shared")
+        m = store.add("exported from a shared in-memory database")
+        store.export(export_path)
+        store.close()
+        exported = SQLiteStore(export_path)
+        assert exported.get(m.id).content == "exported from a shared in-memory database"
+        exported.close()
+        # File URI: db_path is not a filesystem path
+        src_path = os.path.join(tmpdir, "src.db")
+        store = SQLiteStore(f"file:{src_path}?mode=rwc")
+        m = store.add("exported from a file URI")
+        store.export(export_path)  # overwrites the earlier export
+        store.close()
+        exported = SQLiteStore(export_path)
+        assert [e.content for e in exported.all()] == ["exported from a file URI"]
+        exported.close()
+
+def test_sqlite_update_many():
+    store = SQLiteStore()
+    a = store.add("the quick brown fox")
+    b = store.add("a lazy dog sleeps")
+    a.working_strength, b.layer = 0.5, SqlMemoryLayer.L2_CORE
+    store.update_many([a, b])
+    assert store.get(a.id).working_strength == 0.5
+    assert store.get(b.id).layer == SqlMemoryLayer.L2_CORE
+    # Strength-only updates skip the FTS reindex; text still searchable
+    trigger = store._conn.execute(
+        "SELECT sql FROM sqlite_master WHERE name='memories_au'").fetchone()[0]
+    assert "WHEN" in trigger
+    assert store.search_fts("fox")[0].id == a.id
+    b.content = "a lazy cat sleeps"
+    store.update_many([b])
+    assert store.search_fts("cat")[0].id == b.id and not store.search_fts("dog")
+    store.close()
+
 def test_sqlite_get_nonexistent():
     store = SQLiteStore()
     assert store.get("nonexistent") is None
@@ -93,6 +161,12 @@ def test_sqlite_access_logging():
     store.record_access(m.id)
     times = store.get_access_times(m.id)
     assert len(times) == 3
+    # batch record (one transaction)
+    m2 = store.add("other memory", SqlMemoryType.FACTUAL)
+    store.record_access_batch([m.id, m2.id])
+    assert len(store.get_access_times(m.id)) == 4
+    assert len(store.get_access_times(m2.id)) == 2
+    store.record_access_batch([])
     store.close()
 
 def test_sqlite_fts_finds_relevant():
@@ -112,6 +186,59 @@ def test_sqlite_fts_no_irrelevant():
     assert len(results) == 0
     store.close()
 
+def test_sqlite_fts_porter_stemming():
+    store = SQLiteStore()
+    m = store.add("potato was running the deployments", SqlMemoryType.EPISODIC)
+    assert [e.id for e in store.search_fts("run deployment")] == [m.id]
+    store.close()
+
+def test_sqlite_fts_unicode():
+    store = SQLiteStore()
+    hello = store.add("Hello 世界", SqlMemoryType.FACTUAL)
+    name = store.add("Lunch with Nguyễn at the Ấn Độ café", SqlMemoryType.EPISODIC)
+    assert [e.id for e in store.search_fts("世界")] == [hello.id]
+    # Multi-diacritic letters fold too (remove_diacritics 2)
+    assert [e.id for e in store.search_fts("nguyen cafe")] == [name.id]
+    store.close()
+
+def test_sqlite_fts_tokenizer_migration():
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    try:
+        store = SQLiteStore(path)
+        m = store.add("potato was running the deployments", SqlMemoryType.EPISODIC)
+        # Simulate a database indexed with the old default tokenizer
+        store._conn.executescript("""
+            DROP TABLE memories_fts_vocab;
+            DROP TABLE memories_fts;
+            CREATE VIRTUAL TABLE memories_fts USING fts5(
+                content, summary, tokens, content=memories, content_rowid=rowid);
+            INSERT INTO memories_fts(memories_fts) VALUES ('rebuild');
+            PRAGMA user_version=0;
+        """)
+        assert store.search_fts("run") == []
+        store.close()
+        store = SQLiteStore(path)
+        assert [e.id for e in store.search_fts("run")] == [m.id]
+        store.close()
+    finally:
+        os.unlink(path)
+
+def test_sqlite_fts_cjk_token_pruning():
+    store = SQLiteStore()
+    store.add("我的代码", SqlMemoryType.FACTUAL)
+    store.add("你的猫", SqlMemoryType.FACTUAL)
+    store.add("他的书", SqlMemoryType.FACTUAL)
+    # "的" is in every memory: dropped while a more specific token remains
+    assert store._prune_match_tokens(["的", "代码", "的"]) == ["代码"]
+    assert store._prune_match_tokens(["的"]) == ["的"]
+    many = [f"t{i}" for i in range(12)] + ["longest"]
+    pruned = store._prune_match_tokens(many)
+    assert len(pruned) == 8 and "longest" in pruned
+    results = store.search_fts("代码的")
+    assert [m.content for m in results] == ["我的代码"]
+    store.close()
+
 def test_sqlite_filter_by_type():
     store = SQLiteStore()
     store.add("fact one", SqlMemoryType.FACTUAL)
@@ -135,6 +262,86 @@ def test_sqlite_filter_by_layer():
     assert len(core) == 1
     store.close()
 
+def test_sqlite_scan_filters():
+    store = SQLiteStore()
+    old = store.add("old python fact", SqlMemoryType.FACTUAL, created_at=1000.0)
+    store.add("new python fact", SqlMemoryType.FACTUAL)
+    store.add("python episode", SqlMemoryType.EPISODIC)
+    assert len(store.scan(types=["factual"])) == 2
+    assert len(store.scan(types=["factual", "episodic"], layers=["working"])) == 3
+    assert [m.id for m in store.scan(time_range=(0.0, 2000.0))] == [old.id]
+    assert len(store.search_fts("python", types=["episodic"])) == 1
+    assert len(store.search_fts("python", layers=["core"])) == 0
+    store.close()
+
+def test_sqlite_scan_fields():
+    store = SQLiteStore()
+    m1 = store.add("fact", SqlMemoryType.FACTUAL, importance=0.2)
+    store.add("step", SqlMemoryType.PROCEDURAL, importance=0.7)
+    rows = store.scan_fields(("id", "importance"), types=["factual"])
+    assert rows == [(m1.id, 0.2)]
+    try:
+        store.scan_fields(("id; DROP TABLE memories",))
+        assert False, "expected ValueError"
+    except ValueError:
+        pass
+    store.close()
+
+def test_sqlite_expand_via_entities():
+    store = SQLiteStore()
+    a = store.add("SaltyHall uses Supabase", SqlMemoryType.FACTUAL)
+    b = store.add("Supabase runs on Postgres", SqlMemoryType.FACTUAL)
+    c = store.add("Postgres has MVCC", SqlMemoryType.FACTUAL)
+    d = store.add("unrelated", SqlMemoryType.FACTUAL)
+    store.add_graph_link(a.id, "SaltyHall")
+    store.add_graph_link(a.id, "Supabase")
+    store.add_graph_link(b.id, "Supabase")
+    store.add_graph_link(b.id, "Postgres")
+    store.add_graph_link(c.id, "Postgres")
+    store.add_graph_link(d.id, "Cats")
+    one_hop = {m.id for m in store.expand_memories_via_entities([a.id], hops=1)}
+    assert one_hop == {b.id, c.id}
+    zero_hop = {m.id for m in store.expand_memories_via_entities([a.id], hops=0)}
+    assert zero_hop == {b.id}
+    assert store.expand_memories_via_entities([d.id]) == []
+    assert store.expand_memories_via_entities([]) == []
+    c.memory_type = SqlMemoryType.EPISODIC
+    store.update(c)
+    filtered = store.expand_memories_via_entities([a.id], hops=1, types=["factual"])
+    assert {m.id for m in filtered} == {b.id}
+    assert [m.id for m in store.get_many([c.id, b.id], types=["factual"])] == [b.id]
+    by_entity = store.search_by_entities(["Supabase", "Cats", "Nobody"])
+    assert {m.id for m in by_entity["Supabase"]} == {a.id, b.id}
+    assert [m.id for m in by_entity["Cats"]] == [d.id]
+    assert by_entity["Nobody"] == [] and store.search_by_entities([]) == {}
+    store.close()
+
+def test_sqlite_long_id_lists():
+    """Id lists bind as one variable, however many ids a query carries."""
+    from engram.hebbian import record_coactivation
+    from engram.search import SearchEngine
+    if not hasattr(sqlite3.Connection, "setlimit"):
+        return  # Python < 3.11
+    store = SQLiteStore()
+    entries = store.add_batch(
+        [{"content": f"note {i} about coffee", "entities": ["Coffee"] if i < 2 else []}
+         for i in range(40)]
+    )
+    # Hebbian links between every pair (its upserts are chunked well below
+    # the default limit, so they run first)
+    record_coactivation(store, [e.id for e in entries], times=3)
+    store._conn.setlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER, 16)
+    ids = [e.id for e in entries[1:]]
+    assert [m.id for m in store.expand_memories_via_entities(ids)] == [entries[0].id]
+    assert [m.id for m in store.get_many(ids, types=["factual"])] == ids
+    engine = SearchEngine(store, result_ttl=0.0)
+    # All 39 Hebbian neighbors of one candidate go through get_many at once
+    expanded, boosts = engine._expand_via_graph([entries[0]])
+    assert len(boosts) == 39 and {m.id for m in expanded} == {e.id for e in entries}
+    assert len(engine.search("", limit=50)) == 40
+    assert len(engine.search("zzzunmatched", limit=50)) == 40
+    store.close()
+
 def test_sqlite_update_persists():
     store = SQLiteStore()
     m = store.add("mutable memory", SqlMemoryType.FACTUAL)
@@ -180,6 +387,36 @@ def test_sqlite_stats():
     assert s["by_type"]["episodic"] == 2
     assert s["by_type"]["factual"] == 1
     assert s["total_accesses"] >= 3  # at least one per add
+    assert len(store) == 3
+    store.close()
+
+def test_sqlite_copy():
+    store = SQLiteStore()
+    m = store.add("aged python fact", SqlMemoryType.FACTUAL)
+    store.add_graph_link(m.id, "python")
+    m.layer, m.core_strength = SqlMemoryLayer.L2_CORE, 0.7
+    store.update(m)
+    clone = store.copy()
+    copied = clone.get(m.id)
+    assert copied.layer == SqlMemoryLayer.L2_CORE and copied.core_strength == 0.7
+    assert clone.search_fts("python")[0].id == m.id
+    assert clone.get_entities(m.id) == [("python", "")]
+    # Independent afterwards
+    clone.delete(m.id)
+    assert store.get(m.id) is not None
+    clone.close()
+    store.close()
+
+def test_sqlite_total_strength():
+    store = SQLiteStore()
+    assert store.total_strength() == 0
+    a = store.add("fact", SqlMemoryType.FACTUAL)
+    b = store.add("pinned", SqlMemoryType.FACTUAL)
+    a.working_strength, a.core_strength = 0.5, 0.25
+    b.working_strength, b.core_strength, b.pinned = 1.0, 1.0, True
+    store.update_many([a, b])
+    assert abs(store.total_strength() - 0.75) < 1e-9
+    assert abs(store.total_strength(exclude_pinned=False) - 2.75) < 1e-9
     store.close()
 
 def test_sqlite_export():
@@ -209,7 +446,18 @@ def test_sqlite_file_persistence():
         store2 = SQLiteStore(db_path)
         assert len(store2.all()) == 1
         assert store2.all()[0].content == "persistent memory"
+        conn = store2._conn
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 30000
+        assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2  # MEMORY
+        assert conn.execute("PRAGMA page_size").fetchone()[0] == 8192
+        indexes = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type='index'")}
+        assert "idx_access_log_mid_at" in indexes and "idx_access_log_mid" not in indexes
+        # Schema stamped on first open; later opens skip the DDL script
+        assert conn.execute("PRAGMA user_version").fetchone()[0] >= 1
         store2.close()
+        store2.close()  # idempotent
     finally:
         os.unlink(db_path)
 
@@ -262,6 +510,33 @@ def test_retrieval_activation_combines():
     base = base_level_activation(m, now)
     assert score > base, "Context + importance should boost above base"
 
+def test_retrieval_activation_batch_matches_scalar():
+    now = time.time()
+    entries = [
+        MemoryEntry(content="python tips", access_times=[now - 3600, now - 60], importance=0.8),
+        MemoryEntry(content="old note", access_times=[now - 86400 * 30], contradicted_by="x"),
+        MemoryEntry(content="fresh python", access_times=[now]),
+        MemoryEntry(content="never accessed", access_times=[]),
+    ]
+    batch = retrieval_activation_batch(entries, context_keywords=["python"], now=now)
+    for entry, got in zip(entries, batch):
+        expected = retrieval_activation(entry, context_keywords=["python"], now=now)
+        if expected == float("-inf"):
+            assert got == float("-inf")
+        else:
+            assert abs(got - expected) < 1e-9, (entry.content, got, expected)
+
+def test_activation_kernel_matches_numpy_fallback():
+    import numpy as np
+    from engram.activation_kernels import base_level_activation_csr, _base_level_csr_numpy
+    now = time.time()
+    flat = np.array([now - 60, now - 3600, now + 5, now - 86400], dtype=np.float64)
+    offsets = np.array([0, 2, 2, 4], dtype=np.int64)  # middle row empty
+    got = base_level_activation_csr(now, flat, offsets, 0.5)
+    expected = _base_level_csr_numpy(now, flat.copy(), offsets, 0.5)
+    assert got[1] == float("-inf") and expected[1] == float("-inf")
+    assert np.allclose(got[[0, 2]], expected[[0, 2]], rtol=1e-12)
+
 def test_retrieve_top_k_ordering():
     store = MemoryStore()
     now = time.time()
@@ -294,6 +569,102 @@ def test_retrieve_empty_query():
     assert len(results) >= 1  # Should still return by activation
 
 
+def test_search_engine_bm25_relevance():
+    from engram.search import SearchEngine
+    store = SQLiteStore()
+    strong = store.add("Supabase Supabase Supabase backend", SqlMemoryType.FACTUAL)
+    weak = store.add("notes about many things, one of which is Supabase and more words here", SqlMemoryType.FACTUAL)
+    results = SearchEngine(store, result_ttl=0.0).search("Supabase", graph_expand=False)
+    rel = {r.entry.id: r.relevance for r in results}
+    assert rel[strong.id] == 1.0
+    assert 0.0 < rel[weak.id] < 1.0
+    store.close()
+
+
+def test_search_engine_cache_invalidation():
+    from engram.search import SearchEngine
+    store = SQLiteStore()
+    engine = SearchEngine(store, result_ttl=60.0)
+    store.add("potato likes Supabase", SqlMemoryType.FACTUAL)
+    first = engine.search("Supabase", graph_expand=False)
+    assert len(first) == 1
+    # Repeat within TTL is served from cache
+    candidate_calls = []
+    get_candidates = engine._get_candidates
+    engine._get_candidates = lambda *a, **k: candidate_calls.append(1) or get_candidates(*a, **k)
+    again = engine.search("Supabase", graph_expand=False)
+    assert candidate_calls == []
+    assert [r.entry.id for r in again] == [r.entry.id for r in first]
+    # ...as copies: mutating a returned result leaves the cache intact
+    assert again[0] is not first[0] and again[0].entry is not first[0].entry
+    again[0].entry.content = "mutated"
+    again[0].entry.access_times.append(0.0)
+    third = engine.search("Supabase", graph_expand=False)
+    assert third[0].entry.content == "potato likes Supabase"
+    assert third[0].entry.access_times == first[0].entry.access_times
+    del engine._get_candidates
+    # Any write invalidates both caches
+    store.add("Supabase backs SaltyHall", SqlMemoryType.FACTUAL)
+    assert len(engine.search("Supabase", graph_expand=False)) == 2
+    # Candidate id cache reloads entries without touching access_log
+    engine.result_ttl = 0.0
+    accesses = store.stats()["total_accesses"]
+    assert len(engine.search("Supabase", graph_expand=False)) == 2
+    assert store.stats()["total_accesses"] == accesses
+    store.close()
+
+
+def test_search_engine_sees_other_connections():
+    from engram.search import SearchEngine
+    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as f:
+        db_path = f.name
+    try:
+        reader = SQLiteStore(db_path)
+        writer = SQLiteStore(db_path)
+        reader.add("potato drinks coffee", SqlMemoryType.FACTUAL)
+        engine = SearchEngine(reader, result_ttl=60.0)
+        assert len(engine.search("coffee", graph_expand=False)) == 1
+        # A commit on another connection invalidates both caches
+        writer.add("beta coffee is great", SqlMemoryType.FACTUAL)
+        assert len(engine.search("coffee", graph_expand=False)) == 2
+        writer.close()
+        reader.close()
+    finally:
+        os.unlink(db_path)
+
+
+def test_hybrid_search_cache():
+    from engram.hybrid_search import HybridSearchEngine
+
+    class CountingVectors:
+        calls = 0
+        def search(self, query, limit=10, min_similarity=0.0):
+            self.calls += 1
+            return []
+
+    store = SQLiteStore()
+    vectors = CountingVectors()
+    engine = HybridSearchEngine(store, vectors, result_ttl=60.0)
+    store.add("potato likes Supabase", SqlMemoryType.FACTUAL)
+    store.add("Supabase backs SaltyHall", SqlMemoryType.FACTUAL)
+    everything = engine.search("Supabase", limit=20, graph_expand=False)
+    assert len(everything) == 2
+    # Other limits and confidence floors post-filter the cached scores
+    high = engine.search("Supabase", limit=1, min_confidence=0.0, graph_expand=False)
+    assert [r.entry.id for r in high] == [everything[0].entry.id]
+    assert engine.search("Supabase", limit=20, min_confidence=1.01, graph_expand=False) == []
+    assert vectors.calls == 1
+    # Cache hits hand out copies
+    high[0].entry.content = "mutated"
+    again = engine.search("Supabase", limit=1, graph_expand=False)
+    assert again[0].entry.content != "mutated" and vectors.calls == 1
+    # Any write invalidates
+    store.add("Supabase pricing changed", SqlMemoryType.FACTUAL)
+    assert len(engine.search("Supabase", limit=20, graph_expand=False)) == 3
+    assert vectors.calls == 2
+    store.close()
+
+
 # ═══════════════════════════════════════════
 # 3. Consolidation Tests
 # ═══════════════════════════════════════════
@@ -381,6 +752,17 @@ def test_consolidation_stats():
 # 4. Forgetting Tests
 # ═══════════════════════════════════════════
 
+def test_consolidation_stats_sqlite_matches():
+    stores = (MemoryStore(), SQLiteStore())
+    for store in stores:
+        store.add("a", MemoryType.FACTUAL)
+        m = store.add("b", MemoryType.EPISODIC, importance=0.9)
+        m.pinned, m.layer, m.core_strength = True, MemoryLayer.L2_CORE, 0.4
+        if isinstance(store, SQLiteStore):
+            store.update(m)
+    assert get_consolidation_stats(stores[0]) == get_consolidation_stats(stores[1])
+    stores[1].close()
+
 def test_retrievability_fresh():
     m = MemoryEntry(content="just created")
     m.access_times = [time.time()]
@@ -442,6 +824,30 @@ def test_prune_forgotten():
     assert len(pruned) >= 1
     assert m2.layer == MemoryLayer.L4_ARCHIVE
 
+def test_prune_forgotten_sqlite():
+    store = SQLiteStore()
+    now = time.time()
+    strong = store.add("strong", SqlMemoryType.FACTUAL)
+    weak = store.add("weak", SqlMemoryType.EPISODIC)
+    pinned = store.add("pinned", SqlMemoryType.EPISODIC)
+    for entry in (weak, pinned):
+        entry.working_strength = 0.001
+        entry.pinned = entry is pinned
+        store.update(entry)
+    pruned = prune_forgotten(store, threshold=0.01, now=now)
+    assert [e.id for e in pruned] == [weak.id]
+    # Persisted, not just set on the returned copy
+    assert store.get(weak.id).layer == MemoryLayer.L4_ARCHIVE
+    assert store.get(strong.id).layer != MemoryLayer.L4_ARCHIVE
+    assert store.get(pinned.id).layer != MemoryLayer.L4_ARCHIVE
+    assert prune_forgotten(store, threshold=0.01, now=now) == []
+    # Unknown ids are a no-op that leaves caches valid
+    version = store._data_version
+    assert store.delete("no-such-id") is False
+    assert store._data_version == version
+    assert store.delete(weak.id) is True
+    store.close()
+
 def test_retrieval_induced_forgetting():
     store = MemoryStore()
     m1 = store.add("Python is great for scripting", MemoryType.FACTUAL)
@@ -502,6 +908,49 @@ def test_confidence_without_store():
     score = confidence_score(m, store=None, now=now)
     assert 0.0 <= score <= 1.0
 
+def test_confidence_batch_matches_scalar():
+    from engram.confidence import confidence_score_batch
+    now = time.time()
+    entries = []
+    for i, mtype in enumerate(MemoryType):
+        m = MemoryEntry(content=f"m{i}", memory_type=mtype, importance=i / 6)
+        m.working_strength = 0.2 * i
+        m.core_strength = 0.1 * i
+        m.consolidation_count = i
+        m.access_times = [now - 86400 * d for d in range(i)]  # first one never accessed
+        m.created_at = now - 86400 * 10
+        m.pinned = i == 3
+        m.contradicted_by = "x" if i == 2 else ""
+        entries.append(m)
+    batch = confidence_score_batch(entries, now=now)
+    for m, b in zip(entries, batch):
+        assert abs(confidence_score(m, store=None, now=now) - b) < 1e-12
+
+def test_confidence_sql_bound():
+    store = SQLiteStore()
+    now = time.time()
+    specs = [
+        ("fresh fact", SqlMemoryType.FACTUAL, 0.9, 1.0, 0.0),
+        ("weak opinion", SqlMemoryType.OPINION, 0.0, 0.05, 0.0),
+        ("pinned opinion", SqlMemoryType.OPINION, 0.2, 0.3, 0.4),
+        ("strong emotion", SqlMemoryType.EMOTIONAL, 1.0, 2.0, 1.5),
+    ]
+    for content, mtype, importance, ws, cs in specs:
+        m = store.add(content, mtype, importance=importance)
+        m.working_strength, m.core_strength = ws, cs
+        m.pinned = content.startswith("pinned")
+        if content == "weak opinion":
+            m.contradicted_by = "other"
+        store.update(m)
+    for threshold in (0.3, 0.5, 0.7, 0.9):
+        kept = {m.id for m in store.scan(min_confidence=threshold)}
+        for m in store.all():
+            if confidence_score(m, store=None, now=now) >= threshold:
+                assert m.id in kept, f"{m.content} wrongly filtered at {threshold}"
+    # The contradicted, weak opinion can never reach 0.5
+    assert "weak opinion" not in {m.content for m in store.scan(min_confidence=0.5)}
+    store.close()
+
 
 # ═══════════════════════════════════════════
 # 6. Reward Tests
@@ -612,6 +1061,23 @@ def test_downscale_stats():
     assert abs(result["avg_after"] - 1.8) < 0.01
 
 
+def test_downscale_sqlite_store():
+    store = SQLiteStore()
+    m = store.add("test", SqlMemoryType.FACTUAL)
+    p = store.add("pinned", SqlMemoryType.FACTUAL)
+    m.working_strength, m.core_strength = 1.0, 1.0
+    p.working_strength, p.core_strength, p.pinned = 1.0, 0.5, True
+    store.update_many([m, p])
+    result = synaptic_downscale(store, factor=0.9)
+    assert result["n_scaled"] == 1
+    assert abs(result["avg_before"] - 2.0) < 0.01
+    assert abs(result["avg_after"] - 1.8) < 0.01
+    scaled = store.get(m.id)
+    assert abs(scaled.working_strength - 0.9) < 1e-9 and abs(scaled.core_strength - 0.9) < 1e-9
+    assert store.get(p.id).core_strength == 0.5
+    assert synaptic_downscale(SQLiteStore(), factor=0.9)["n_scaled"] == 0
+    store.close()
+
 # ═══════════════════════════════════════════
 # 8. Anomaly Detection Tests
 # ═══════════════════════════════════════════
@@ -712,6 +1178,74 @@ def test_contradiction_lowers_confidence():
             f"Contradicted reliability {rel_after} should be much lower than {rel_before}"
         mem.close()
 
+def test_memory_add_many():
+    """add_many stores the same memories as repeated add(), in one transaction."""
+    from engram.memory import Memory
+    mem = Memory(":memory:")
+    old = mem.add("the API lives at moltbook.com", type="procedural")
+    ids = mem.add_many([
+        {"content": "supabase hosts the database", "type": "factual",
+         "entities": ["supabase"]},
+        {"content": "the API lives at www.moltbook.com", "type": "procedural",
+         "contradicts": old, "tags": ["api"]},
+    ])
+    assert len(ids) == 2
+    assert mem._store.get(ids[0]).memory_type == SqlMemoryType.FACTUAL
+    assert mem._store.get(old).contradicted_by == ids[1]
+    assert mem._store.get(ids[1]).content.endswith("[tags: api]")
+    assert [e.id for e in mem._store.search_by_entity("supabase")] == [ids[0]]
+    assert mem.add_many([]) == []
+    mem.close()
+
+def test_memory_bulk():
+    from engram.memory import Memory
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "bulk.db")
+        mem = Memory(path)
+        with mem.bulk():
+            ids = [mem.add(f"bulk memory {i}") for i in range(20)]
+            with mem.bulk():
+                mem.add("nested")
+            # Nothing is visible to other connections until the block ends
+            other = sqlite3.connect(path)
+            assert other.execute("SELECT COUNT(*) FROM memories").fetchone()[0] == 0
+        assert other.execute("SELECT COUNT(*) FROM memories").fetchone()[0] == 21
+        try:
+            with mem.bulk():
+                mem.add("rolled back")
+                raise ValueError("boom")
+        except ValueError:
+            pass
+        assert len(mem) == 21
+        assert mem._store.search_fts("rolled") == []
+        assert mem._store.get(ids[0]) is not None
+        other.close()
+        mem.close()
+
+def test_memory_consolidate_days_step():
+    from engram.memory import Memory
+    mem = Memory(":memory:")
+    mid = mem.add("low importance note", importance=0.1)
+    mem.consolidate(days=2.5, days_step=1.0)  # cycles of 1, 1 and 0.5 days
+    assert mem._store.get(mid).consolidation_count == 3
+    mem.consolidate(days=2.0)  # one closed-form cycle
+    assert mem._store.get(mid).consolidation_count == 4
+    try:
+        mem.consolidate(days=1.0, days_step=0)
+        assert False, "days_step=0 should raise"
+    except ValueError:
+        pass
+    mem.close()
+
+def test_memory_touch():
+    from engram.memory import Memory
+    mem = Memory(":memory:")
+    mid = mem.add("the API lives at www.moltbook.com", type="procedural")
+    before = len(mem._store.get_access_times(mid))
+    mem.touch(mid)
+    assert len(mem._store.get_access_times(mid)) == before + 1
+    mem.close()
+
 def test_contradiction_recall_ranking():
     """Contradicted memory should have lower confidence in recall results."""
     from engram.memory import Memory
@@ -916,16 +1450,30 @@ if __name__ == "__main__":
     sections = [
         ("SQLiteStore", [
             ("add and get", test_sqlite_add_and_get),
+            ("add_batch", test_sqlite_add_batch),
+            ("URI shared memory", test_sqlite_uri_shared_memory),
+            ("export URI stores", test_sqlite_export_uri),
+            ("update_many", test_sqlite_update_many),
             ("get nonexistent", test_sqlite_get_nonexistent),
             ("access logging", test_sqlite_access_logging),
             ("FTS finds relevant", test_sqlite_fts_finds_relevant),
             ("FTS no irrelevant", test_sqlite_fts_no_irrelevant),
+            ("FTS porter stemming", test_sqlite_fts_porter_stemming),
+            ("FTS unicode folding", test_sqlite_fts_unicode),
+            ("FTS tokenizer migration", test_sqlite_fts_tokenizer_migration),
+            ("FTS CJK token pruning", test_sqlite_fts_cjk_token_pruning),
             ("filter by type", test_sqlite_filter_by_type),
             ("filter by layer", test_sqlite_filter_by_layer),
+            ("scan filters", test_sqlite_scan_filters),
+            ("scan fields", test_sqlite_scan_fields),
+            ("expand via entities", test_sqlite_expand_via_entities),
+            ("long id lists", test_sqlite_long_id_lists),
             ("update persists", test_sqlite_update_persists),
             ("delete", test_sqlite_delete),
             ("all()", test_sqlite_all),
             ("stats", test_sqlite_stats),
+            ("total_strength", test_sqlite_total_strength),
+            ("copy", test_sqlite_copy),
             ("export", test_sqlite_export),
             ("file persistence", test_sqlite_file_persistence),
         ]),
@@ -937,9 +1485,15 @@ if __name__ == "__main__":
             ("spreading activation no match", test_spreading_activation_no_match),
             ("spreading activation empty", test_spreading_activation_empty),
             ("retrieval combines scores", test_retrieval_activation_combines),
+            ("batch activation matches scalar", test_retrieval_activation_batch_matches_scalar),
+            ("activation kernel matches fallback", test_activation_kernel_matches_numpy_fallback),
             ("retrieve_top_k ordering", test_retrieve_top_k_ordering),
             ("retrieve_top_k limit", test_retrieve_top_k_limit),
             ("empty query retrieval", test_retrieve_empty_query),
+            ("search bm25 relevance", test_search_engine_bm25_relevance),
+            ("search cache invalidation", test_search_engine_cache_invalidation),
+            ("search sees other connections", test_search_engine_sees_other_connections),
+            ("hybrid search cache", test_hybrid_search_cache),
         ]),
         ("Consolidation", [
             ("apply_decay", test_apply_decay),
@@ -950,6 +1504,7 @@ if __name__ == "__main__":
             ("layer promotion", test_layer_promotion),
             ("layer demotion", test_layer_demotion),
             ("consolidation stats", test_consolidation_stats),
+            ("consolidation stats via SQL", test_consolidation_stats_sqlite_matches),
         ]),
         ("Forgetting", [
             ("retrievability fresh", test_retrievability_fresh),
@@ -959,6 +1514,7 @@ if __name__ == "__main__":
             ("should_forget weak", test_should_forget_weak),
             ("should_forget pinned exempt", test_should_forget_pinned_exempt),
             ("prune_forgotten", test_prune_forgotten),
+            ("prune_forgotten_sqlite", test_prune_forgotten_sqlite),
             ("retrieval-induced forgetting", test_retrieval_induced_forgetting),
         ]),
         ("Confidence", [
@@ -966,6 +1522,8 @@ if __name__ == "__main__":
             ("low strength → low confidence", test_confidence_low_strength),
             ("confidence labels", test_confidence_labels),
             ("confidence without store", test_confidence_without_store),
+            ("batch confidence matches scalar", test_confidence_batch_matches_scalar),
+            ("SQL confidence bound", test_confidence_sql_bound),
         ]),
         ("Reward", [
             ("detect positive", test_detect_positive_feedback),
@@ -982,6 +1540,7 @@ if __name__ == "__main__":
             ("preserves ordering", test_downscale_preserves_ordering),
             ("empty store", test_downscale_empty_store),
             ("stats correct", test_downscale_stats),
+            ("SQLiteStore single UPDATE", test_downscale_sqlite_store),
         ]),
         ("Anomaly Detection", [
             ("tracker basic", test_anomaly_tracker_basic),
@@ -997,6 +1556,10 @@ if __name__ == "__main__":
             ("contradiction lowers confidence", test_contradiction_lowers_confidence),
             ("contradiction recall ranking", test_contradiction_recall_ranking),
             ("update_memory method", test_update_memory),
+            ("add_many", test_memory_add_many),
+            ("bulk", test_memory_bulk),
+            ("consolidate days_step", test_memory_consolidate_days_step),
+            ("touch", test_memory_touch),
         ]),
         ("Integration", [
             ("full lifecycle (MemoryStore)", test_full_lifecycle),
@@ -1009,7 +1572,8 @@ if __name__ == "__main__":
     print("=" * 60)
 
     for section_name, tests in sections:
-        print(f"\n── {section_name} ──")
+        if not QUIET:
+            print(f"\n── {section_name} ──")
         for test_name, test_fn in tests:
             run_test(test_name, test_fn)
 
@@ -14,6 +14,8 @@ from engram.hebbian import (
     record_coactivation,
     maybe_create_link,
     get_hebbian_neighbors,
+    get_hebbian_neighbors_batch,
+    hebbian_spreading,
     get_all_hebbian_links,
     decay_hebbian_links,
     strengthen_link,
@@ -87,7 +89,65 @@ class TestHebbianModule:
         
         links = get_all_hebbian_links(store)
         assert len(links) == 2  # Still just 2
-        
+
+        store.close()
+
+    def test_record_coactivation_batch_dedupes_pairs(self):
+        """Repeated IDs count once per call and never pair with themselves."""
+        store = SQLiteStore(":memory:")
+
+        m1 = store.add("Memory one")
+        m2 = store.add("Memory two")
+        m3 = store.add("Memory three")
+        ids = [m1.id, m2.id, m1.id, m3.id, m2.id]
+
+        record_coactivation(store, ids, threshold=2)
+        stats = get_coactivation_stats(store)
+        assert len(stats) == 3
+        assert all(count == 1 for count in stats.values())
+
+        # Second call forms all three links in one pass
+        new_links = record_coactivation(store, ids, threshold=2)
+        assert len(new_links) == 3
+        assert len(get_all_hebbian_links(store)) == 6
+        assert sorted(get_hebbian_neighbors(store, m1.id)) == sorted([m2.id, m3.id])
+
+        # Third call strengthens instead of re-forming
+        assert record_coactivation(store, ids, threshold=2) == []
+        assert len(get_all_hebbian_links(store)) == 6
+
+        store.close()
+
+    def test_record_coactivation_times_matches_repeated_calls(self):
+        """times=N leaves the same rows as N separate calls."""
+        def rows_after(pre, times, repeated):
+            store = SQLiteStore(":memory:")
+            m1 = store.add("Memory one")
+            m2 = store.add("Memory two")
+            names = {m1.id: "a", m2.id: "b"}
+            for _ in range(pre):
+                record_coactivation(store, [m1.id, m2.id], threshold=3)
+            if repeated:
+                formed = sum(len(record_coactivation(store, [m1.id, m2.id], threshold=3))
+                             for _ in range(times))
+            else:
+                formed = len(record_coactivation(store, [m1.id, m2.id], threshold=3, times=times))
+            rows = sorted(
+                (tuple(sorted((names[s], names[t]))), round(strength, 6), count)
+                for s, t, strength, count in store._conn.execute(
+                    "SELECT source_id, target_id, strength, coactivation_count FROM hebbian_links"))
+            store.close()
+            return rows, formed
+
+        for pre in range(5):
+            for times in range(1, 6):
+                assert rows_after(pre, times, False) == rows_after(pre, times, True)
+
+        store = SQLiteStore(":memory:")
+        m1 = store.add("Memory one")
+        m2 = store.add("Memory two")
+        with pytest.raises(ValueError):
+            record_coactivation(store, [m1.id, m2.id], times=0)
         store.close()
 
     def test_get_hebbian_neighbors(self):
@@ -109,6 +169,49 @@ class TestHebbianModule:
         
         store.close()
 
+    def test_get_hebbian_neighbors_batch(self):
+        """Batch lookup should match per-memory neighbors and carry strengths."""
+        store = SQLiteStore(":memory:")
+        
+        m1 = store.add("Memory one")
+        m2 = store.add("Memory two")
+        m3 = store.add("Memory three")
+        
+        for _ in range(3):
+            record_coactivation(store, [m1.id, m2.id], threshold=3)
+        record_coactivation(store, [m1.id, m3.id], threshold=3)  # tracked only
+        
+        batch = get_hebbian_neighbors_batch(store, [m1.id, m2.id, m3.id])
+        assert batch[m1.id] == [(m2.id, 1.0)]
+        assert batch[m2.id] == [(m1.id, 1.0)]
+        assert m3.id not in batch
+        assert get_hebbian_neighbors_batch(store, []) == {}
+        
+        store.close()
+
+    def test_hebbian_spreading_accumulates_and_invalidates(self):
+        """Spreading sums 0.5 × strength per active neighbor; link writes refresh the cache."""
+        store = SQLiteStore(":memory:")
+        
+        m1 = store.add("Memory one")
+        m2 = store.add("Memory two")
+        m3 = store.add("Memory three")
+        
+        for _ in range(3):
+            record_coactivation(store, [m1.id, m3.id], threshold=3)
+        assert hebbian_spreading(store, [m1.id, m2.id]) == {m3.id: 0.5}
+        
+        for _ in range(3):
+            record_coactivation(store, [m2.id, m3.id], threshold=3)
+        boosts = hebbian_spreading(store, [m1.id, m2.id])
+        assert boosts[m3.id] == pytest.approx(1.0)
+        
+        store.delete(m2.id)
+        assert hebbian_spreading(store, [m1.id]) == {m3.id: 0.5}
+        assert hebbian_spreading(store, []) == {}
+        
+        store.close()
+
     def test_decay_hebbian_links(self):
         """Decay should reduce link strength, prune weak links."""
         store = SQLiteStore(":memory:")
@@ -130,15 +233,36 @@ class TestHebbianModule:
         links = get_all_hebbian_links(store)
         assert links[0][2] == 0.5
         
-        # Decay until pruned (below 0.1)
-        for _ in range(5):
-            decay_hebbian_links(store, factor=0.5)
+        # Decay until pruned (below 0.1): 0.25, 0.125, then both directions go
+        assert decay_hebbian_links(store, factor=0.5) == 0
+        assert decay_hebbian_links(store, factor=0.5) == 0
+        assert decay_hebbian_links(store, factor=0.5) == 2
         
         links = get_all_hebbian_links(store)
         assert len(links) == 0  # Pruned
         
+        # Nothing left to decay: no write, cached link snapshot stays valid
+        version = store._hebbian_version
+        assert decay_hebbian_links(store, factor=0.5) == 0
+        assert store._hebbian_version == version
+        
         store.close()
 
+    def test_snapshot_sees_links_from_other_connections(self, tmp_path):
+        """Links formed through another connection reach spreading activation."""
+        db_path = str(tmp_path / "links.db")
+        reader = SQLiteStore(db_path)
+        writer = SQLiteStore(db_path)
+        m1 = reader.add("Memory one")
+        m2 = reader.add("Memory two")
+        assert hebbian_spreading(reader, [m1.id]) == {}
+        
+        record_coactivation(writer, [m1.id, m2.id], times=3)
+        assert hebbian_spreading(reader, [m1.id]) == {m2.id: pytest.approx(0.5)}
+        
+        writer.close()
+        reader.close()
+
     def test_strengthen_link(self):
         """Strengthening should increase link strength up to cap."""
         store = SQLiteStore(":memory:")
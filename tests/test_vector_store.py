@@ -0,0 +1,413 @@
+"""
+Tests for VectorStore — embedding storage and cosine retrieval
+"""
+
+import json
+import sqlite3
+
+import numpy as np
+import pytest
+
+import engram.vector_store as vector_store_module
+from engram import Memory
+from engram.embeddings.base import BaseEmbeddingAdapter
+from engram.vector_store import (
+    VectorStore,
+    cosine_similarity,
+    decode_embedding,
+    encode_embedding,
+)
+
+
+class FakeAdapter(BaseEmbeddingAdapter):
+    """Deterministic adapter: fixed vectors per text, no model needed."""
+
+    VECTORS = {
+        "cats": [1.0, 0.0, 0.0],
+        "kittens": [0.9, 0.1, 0.0],
+        "dogs": [0.0, 1.0, 0.0],
+        "stocks": [0.0, 0.0, 1.0],
+    }
+
+    def __init__(self):
+        self._dimension = 3
+
+    def embed(self, texts: list[str]) -> list[list[float]]:
+        return [self.VECTORS[t] for t in texts]
+
+
+@pytest.fixture
+def conn():
+    c = sqlite3.connect(":memory:")
+    c.execute("CREATE TABLE memories (id TEXT PRIMARY KEY)")
+    for mid in ("m1", "m2", "m3", "m4"):
+        c.execute("INSERT INTO memories (id) VALUES (?)", (mid,))
+    yield c
+    c.close()
+
+
+class TestVectorStore:
+    """Test storage format and similarity search."""
+
+    def test_embeddings_stored_as_float32_blob(self, conn):
+        """Vectors are persisted as raw float32 bytes, not JSON."""
+        vs = VectorStore(conn, FakeAdapter())
+        vs.add("m1", "cats")
+
+        kind, value = conn.execute(
+            "SELECT typeof(embedding), embedding FROM memory_embeddings"
+        ).fetchone()
+        assert kind == "blob"
+        assert len(value) == 3 * 4
+        assert decode_embedding(value).tolist() == [1.0, 0.0, 0.0]
+
+    def test_search_ranks_by_cosine(self, conn):
+        """Search matches the scalar cosine_similarity ordering and values."""
+        vs = VectorStore(conn, FakeAdapter())
+        vs.add_batch([("m1", "cats"), ("m2", "kittens"), ("m3", "dogs"), ("m4", "stocks")])
+
+        results = vs.search("cats", limit=2, min_similarity=0.1)
+        assert [mid for mid, _ in results] == ["m1", "m2"]
+        expected = cosine_similarity([1.0, 0.0, 0.0], [0.9, 0.1, 0.0])
+        assert results[1][1] == pytest.approx(expected, rel=1e-6)
+
+    def test_embeddings_normalized_on_insert(self, conn):
+        """Stored vectors are unit length; unnormalized legacy rows still score correctly."""
+        vs = VectorStore(conn, FakeAdapter())
+        vs.add("m2", "kittens")
+        stored = conn.execute("SELECT embedding FROM memory_embeddings").fetchone()[0]
+        assert np.linalg.norm(decode_embedding(stored)) == pytest.approx(1.0, rel=1e-6)
+
+        conn.execute(
+            "INSERT INTO memory_embeddings (memory_id, embedding) VALUES (?, ?)",
+            ("m3", encode_embedding([0.0, 5.0, 0.0])),
+        )
+        conn.commit()
+        vs.invalidate()
+        mid, sim = vs.search("dogs", limit=1)[0]
+        assert mid == "m3"
+        assert sim == pytest.approx(1.0, rel=1e-6)
+
+    def test_dimension_mismatch_rejected(self, conn):
+        """Inserting a vector of the wrong dimension raises ValueError."""
+        adapter = FakeAdapter()
+        adapter.VECTORS = {**FakeAdapter.VECTORS, "short": [1.0, 0.0]}
+        vs = VectorStore(conn, adapter)
+        with pytest.raises(ValueError):
+            vs.add("m1", "short")
+        assert vs.count() == 0
+
+    def test_migrate_json_embeddings(self, conn):
+        """Legacy JSON rows remain searchable and convert to BLOBs."""
+        vs = VectorStore(conn, FakeAdapter())
+        conn.execute(
+            "INSERT INTO memory_embeddings (memory_id, embedding) VALUES (?, ?)",
+            ("m3", json.dumps([0.0, 1.0, 0.0])),
+        )
+        conn.commit()
+
+        assert vs.search("dogs", limit=1)[0][0] == "m3"
+        assert vs.migrate_json_embeddings() == 1
+        assert vs.migrate_json_embeddings() == 0
+        kind = conn.execute("SELECT typeof(embedding) FROM memory_embeddings").fetchone()[0]
+        assert kind == "blob"
+        assert vs.search("dogs", limit=1)[0][0] == "m3"
+
+    def test_cached_matrix_tracks_writes(self, conn):
+        """The cached matrix is rebuilt after add and delete."""
+        vs = VectorStore(conn, FakeAdapter())
+        vs.add("m1", "cats")
+        assert [mid for mid, _ in vs.search("dogs", limit=5)] == ["m1"]
+
+        vs.add("m3", "dogs")
+        assert vs.search("dogs", limit=1)[0][0] == "m3"
+
+        vs.delete("m3")
+        assert [mid for mid, _ in vs.search("dogs", limit=5)] == ["m1"]
+
+    def test_empty_store_grows_on_first_add(self, conn):
+        """A matrix loaded from an empty table takes its first row."""
+        vs = VectorStore(conn, FakeAdapter())
+        vs._use_vec = False
+        assert vs.search("cats", limit=5) == []
+        assert vs._matrix.shape == (0, 3)
+
+        vs.add("m1", "cats")
+        results = vs.search("cats", limit=5)
+        assert [mid for mid, _ in results] == ["m1"]
+        assert results[0][1] == pytest.approx(1.0)
+        assert vs._matrix.shape == (1, 3)
+
+    def test_borrowed_connection_settings_untouched(self, tmp_path):
+        """VectorStore leaves the PRAGMAs of the connection it is given alone."""
+        c = sqlite3.connect(str(tmp_path / "vectors.db"))
+        c.execute("CREATE TABLE memories (id TEXT PRIMARY KEY)")
+        c.execute("INSERT INTO memories (id) VALUES ('m1')")
+        c.execute("PRAGMA cache_size=-2000")
+        mmap = c.execute("PRAGMA mmap_size").fetchone()[0]
+        try:
+            vs = VectorStore(c, FakeAdapter())
+            vs.add("m1", "cats")
+            assert c.execute("PRAGMA mmap_size").fetchone()[0] == mmap
+            assert c.execute("PRAGMA cache_size").fetchone()[0] == -2000
+        finally:
+            c.close()
+
+    def test_sees_writes_from_other_connections(self, tmp_path):
+        """The cached matrix reloads after another connection commits."""
+        from engram.store import SQLiteStore
+        db_path = str(tmp_path / "vectors.db")
+        first, second = SQLiteStore(db_path), SQLiteStore(db_path)
+        try:
+            cats, dogs = first.add("cats"), first.add("dogs")
+            writer = VectorStore(first._conn, FakeAdapter())
+            reader = VectorStore(second._conn, FakeAdapter())
+            reader._use_vec = False
+            writer.add(cats.id, "cats")
+            assert reader.search("cats", limit=1)[0][0] == cats.id
+            
+            writer.add(dogs.id, "dogs")
+            writer.delete(cats.id)
+            assert [mid for mid, _ in reader.search("cats", limit=5)] == [dogs.id]
+        finally:
+            first.close()
+            second.close()
+
+    def test_top_k_partial_selection(self, conn):
+        """Limits below N return exactly the best `limit` rows, in order."""
+        vs = VectorStore(conn, FakeAdapter())
+        vs.add_batch([("m1", "cats"), ("m2", "kittens"), ("m3", "dogs"), ("m4", "stocks")])
+
+        full = vs.search("kittens", limit=10)
+        for k in range(1, 5):
+            assert vs.search("kittens", limit=k) == full[:k]
+
+    def test_forget_removes_embedding(self):
+        """Memory.forget(id) deletes the embedding row with the memory."""
+        mem = Memory(":memory:", embedding=FakeAdapter())
+        mid = mem.add("cats")
+        mem.add("dogs")
+        assert mem._vector_store.search("cats", limit=1)[0][0] == mid
+
+        mem.forget(mid)
+        assert not mem._vector_store.has_embedding(mid)
+        assert mid not in [m for m, _ in mem._vector_store.search("cats", limit=5)]
+
+    def test_sqlite_vec_matches_numpy(self, conn):
+        """With sqlite-vec loaded, vec0 KNN returns the NumPy ranking."""
+        pytest.importorskip("sqlite_vec")
+        vs = VectorStore(conn, FakeAdapter(), brute_force_threshold=0)
+        if not vs._use_vec:
+            pytest.skip("sqlite-vec could not be loaded on this connection")
+        vs.add_batch([("m1", "cats"), ("m2", "kittens"), ("m3", "dogs"), ("m4", "stocks")])
+
+        via_vec = vs.search("kittens", limit=3)
+        vs._use_vec = False
+        via_numpy = vs.search("kittens", limit=3)
+        assert [m for m, _ in via_vec] == [m for m, _ in via_numpy]
+        for (_, a), (_, b) in zip(via_vec, via_numpy):
+            assert a == pytest.approx(b, abs=1e-5)
+
+    def test_simsimd_kernel_matches_numpy(self, conn, monkeypatch):
+        """SimSIMD cosine distances agree with the NumPy dot-product path."""
+        pytest.importorskip("simsimd")
+        vs = VectorStore(conn, FakeAdapter())
+        vs._use_vec = False
+        vs.add_batch([("m1", "cats"), ("m2", "kittens"), ("m3", "dogs"), ("m4", "stocks")])
+
+        monkeypatch.setattr(vector_store_module, "_simsimd_available", True)
+        via_simsimd = vs.search("kittens", limit=4)
+        monkeypatch.setattr(vector_store_module, "_simsimd_available", False)
+        via_numpy = vs.search("kittens", limit=4)
+        assert [m for m, _ in via_simsimd] == [m for m, _ in via_numpy]
+        for (_, a), (_, b) in zip(via_simsimd, via_numpy):
+            assert a == pytest.approx(b, abs=1e-5)
+
+    @pytest.mark.parametrize("quantize,itemsize", [("f16", 2), ("i8", 1)])
+    @pytest.mark.parametrize("use_simsimd", [False, True])
+    def test_quantized_storage(self, conn, monkeypatch, quantize, itemsize, use_simsimd):
+        """Quantized rows are smaller on disk and rank like float32."""
+        if use_simsimd:
+            pytest.importorskip("simsimd")
+        monkeypatch.setattr(vector_store_module, "_simsimd_available", use_simsimd)
+        vs = VectorStore(conn, FakeAdapter(), quantize=quantize)
+        vs.add_batch([("m1", "cats"), ("m2", "kittens"), ("m3", "dogs"), ("m4", "stocks")])
+
+        size, dtype = conn.execute(
+            "SELECT length(embedding), dtype FROM memory_embeddings WHERE memory_id = 'm2'"
+        ).fetchone()
+        assert (size, dtype) == (3 * itemsize, quantize)
+
+        results = vs.search("kittens", limit=4)
+        assert [m for m, _ in results][:2] == ["m2", "m1"]
+        expected = cosine_similarity([0.9, 0.1, 0.0], [1.0, 0.0, 0.0])
+        assert results[1][1] == pytest.approx(expected, abs=0.02)
+
+    def test_invalid_quantize_rejected(self, conn):
+        with pytest.raises(ValueError):
+            VectorStore(conn, FakeAdapter(), quantize="i4")
+
+    def test_legacy_table_gains_quantization_columns(self, conn):
+        """Tables from the JSON-only schema are upgraded in place."""
+        conn.execute("""
+            CREATE TABLE memory_embeddings (
+                memory_id TEXT PRIMARY KEY,
+                embedding TEXT NOT NULL
+            )
+        """)
+        conn.execute(
+            "INSERT INTO memory_embeddings VALUES (?, ?)", ("m3", json.dumps([0.0, 2.0, 0.0]))
+        )
+        vs = VectorStore(conn, FakeAdapter(), quantize="i8")
+        assert vs.search("dogs", limit=1)[0][0] == "m3"
+        assert vs.migrate_json_embeddings() == 1
+        row = conn.execute("SELECT dtype, length(embedding) FROM memory_embeddings").fetchone()
+        assert row == ("i8", 3)
+
+    def test_cosine_kernel_matches_python(self):
+        """Compiled (or fallback) cosine agrees with the pure-Python loop."""
+        from engram.vector_kernels import _cosine_python
+        a, b = [0.3, -1.2, 2.5, 0.0], [1.0, 0.5, -0.25, 4.0]
+        assert cosine_similarity(a, b) == pytest.approx(_cosine_python(a, b), rel=1e-9)
+        assert cosine_similarity(np.array(a, dtype=np.float32), b) == pytest.approx(
+            _cosine_python(a, b), rel=1e-6)
+        assert cosine_similarity(a, [0.0] * 4) == 0.0
+        assert cosine_similarity(a, b[:3]) == 0.0
+
+    @pytest.mark.parametrize("quantize", ["f32", "i8"])
+    def test_incremental_cache_matches_reload(self, conn, quantize):
+        """Appends, replacements and deletes on the loaded matrix match a fresh load."""
+        vs = VectorStore(conn, FakeAdapter(), quantize=quantize)
+        vs._use_vec = False
+        vs.add("m1", "cats")
+        vs.search("cats")  # load the matrix
+        for i in range(20):  # grow past the initial capacity
+            conn.execute("INSERT OR IGNORE INTO memories (id) VALUES (?)", (f"x{i}",))
+            vs.add(f"x{i}", "stocks")
+        vs.add_batch([("m2", "kittens"), ("m3", "dogs")])
+        vs.add("m1", "dogs")  # replace in place
+        vs.delete("x3")
+        vs.delete("m2")
+        assert not vs._dirty
+
+        incremental = vs.search("dogs", limit=50)
+        vs.invalidate()
+        reloaded = vs.search("dogs", limit=50)
+        incremental, reloaded = dict(incremental), dict(reloaded)
+        assert incremental.keys() == reloaded.keys()
+        for memory_id, similarity in reloaded.items():
+            assert incremental[memory_id] == pytest.approx(similarity, abs=1e-6)
+        assert len(incremental) == 21  # m1, m3 and x0..x19 except x3
+
+    def test_streamed_load_across_chunks(self, conn, monkeypatch):
+        """Matrix loading via fetchmany spans chunk boundaries correctly."""
+        monkeypatch.setattr(vector_store_module, "_LOAD_CHUNK_ROWS", 3)
+        vs = VectorStore(conn, FakeAdapter())
+        vs._use_vec = False
+        vs.add_batch([("m1", "cats"), ("m2", "kittens"), ("m3", "dogs"), ("m4", "stocks")])
+        vs.invalidate()
+
+        results = dict(vs.search("dogs", limit=10))
+        assert set(results) == {"m1", "m2", "m3", "m4"}
+        assert results["m3"] == pytest.approx(1.0)
+        assert vs._matrix.shape == (4, 3)
+
+    def test_add_batch_parallel_lists(self, conn):
+        """add_batch(ids, texts) stores the same rows as the tuple form."""
+        vs = VectorStore(conn, FakeAdapter(), quantize="i8")
+        vs.add_batch(["m1", "m2"], ["cats", "kittens"])
+        by_lists = conn.execute(
+            "SELECT memory_id, embedding, scale FROM memory_embeddings ORDER BY memory_id"
+        ).fetchall()
+
+        conn.execute("DELETE FROM memory_embeddings")
+        vs.add_batch([("m1", "cats"), ("m2", "kittens")])
+        by_tuples = conn.execute(
+            "SELECT memory_id, embedding, scale FROM memory_embeddings ORDER BY memory_id"
+        ).fetchall()
+        assert by_lists == by_tuples
+
+        with pytest.raises(ValueError):
+            vs.add_batch(["m1"], ["cats", "dogs"])
+
+    def test_add_batch_without_commit(self, conn):
+        """commit=False leaves the batch in the open transaction."""
+        vs = VectorStore(conn, FakeAdapter())
+        vs.add_batch(["m1", "m2"], ["cats", "kittens"], commit=False)
+        assert conn.in_transaction
+        assert vs.search("cats", limit=1)[0][0] == "m1"
+        conn.rollback()
+        assert vs.count() == 0
+
+    def test_add_embeddings_precomputed(self, conn):
+        """add_embeddings stores vectors computed elsewhere like add_batch does."""
+        vs = VectorStore(conn, FakeAdapter())
+        adapter = FakeAdapter()
+        vs.add_embeddings(["m1", "m3"], adapter.embed(["cats", "dogs"]))
+        assert vs.search("dogs", limit=1)[0][0] == "m3"
+        assert vs.embedded_ids() == {"m1", "m3"}
+        with pytest.raises(ValueError):
+            vs.add_embeddings(["m1"], [])
+
+    def test_small_stores_use_exact_scan(self, conn, monkeypatch):
+        """Below brute_force_threshold, search never routes to sqlite-vec."""
+        vs = VectorStore(conn, FakeAdapter(), brute_force_threshold=3)
+        vs._use_vec = True  # pretend the extension is loaded
+        routed = []
+        monkeypatch.setattr(vs, "_vec_upsert", lambda rows: None)
+        monkeypatch.setattr(vs, "_search_vec", lambda *args: routed.append(args) or [])
+
+        vs.add_batch(["m1", "m2"], ["cats", "kittens"])
+        assert vs.search("cats", limit=1)[0][0] == "m1"
+        assert not routed
+
+        vs.add("m3", "dogs")
+        assert vs.search("cats", limit=1) == []
+        assert len(routed) == 1
+
+    def test_parallel_segments_match_single_pass(self, conn, monkeypatch):
+        """Segmented scoring returns the same ranking as one pass."""
+        vs = VectorStore(conn, FakeAdapter())
+        vs._use_vec = False
+        vs.add_batch(["m1", "m2", "m3", "m4"], ["cats", "kittens", "dogs", "stocks"])
+        single = vs.search("kittens", limit=4)
+
+        monkeypatch.setattr(vector_store_module, "PARALLEL_MIN_ROWS", 1)
+        monkeypatch.setattr(vector_store_module, "_SEGMENT_WORKERS", 3)
+        assert vs.search("kittens", limit=4) == single
+
+    def test_device_scan_matches_cpu(self, conn):
+        """The PyTorch path (on the CPU device) returns the NumPy ranking."""
+        pytest.importorskip("torch")
+        vs = VectorStore(conn, FakeAdapter(), device="cpu")
+        vs._use_vec = False
+        vs.add_batch(["m1", "m2", "m3", "m4"], ["cats", "kittens", "dogs", "stocks"])
+        on_device = vs.search("kittens", limit=3)
+        vs.device = None
+        assert [m for m, _ in on_device] == [m for m, _ in vs.search("kittens", limit=3)]
+
+    def test_device_requires_torch(self, conn, monkeypatch):
+        monkeypatch.setattr(vector_store_module, "_torch_available", False)
+        with pytest.raises(ImportError):
+            VectorStore(conn, FakeAdapter(), device="cuda")
+
+    def test_fixed_dimension_kernel(self):
+        """Embedding-sized vectors use the length-specialized kernel, same result."""
+        from engram.vector_kernels import _cosine_python, cosine_kernel
+        rng = np.random.default_rng(7)
+        a, b = rng.standard_normal(384).tolist(), rng.standard_normal(384).tolist()
+        assert cosine_similarity(a, b) == pytest.approx(_cosine_python(a, b), rel=1e-9)
+        kernel = cosine_kernel(384)
+        if kernel is not None:
+            assert kernel is cosine_kernel(384)  # compiled once per dimension
+            assert kernel(np.array(a), np.array(b)) == pytest.approx(_cosine_python(a, b), rel=1e-9)
+
+    def test_min_similarity_applied_before_top_k(self, conn):
+        """Rows under min_similarity never displace or pad the top-k."""
+        vs = VectorStore(conn, FakeAdapter())
+        vs._use_vec = False
+        vs.add_batch(["m1", "m2", "m3", "m4"], ["cats", "kittens", "dogs", "stocks"])
+        results = vs.search("cats", limit=3, min_similarity=0.5)
+        assert [m for m, _ in results] == ["m1", "m2"]
+        assert all(isinstance(sim, float) for _, sim in results)
+        assert vs.search("cats", limit=3, min_similarity=1.5) == []